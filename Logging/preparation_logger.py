@@ -1,11 +1,115 @@
+import bpy
+
+import functools
 import json
+import queue
+import sys
+import threading
 from pathlib import Path
-from logging import getLogger, config
+from logging import getLogger, Formatter, LogRecord, StreamHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+path_log_config = Path(__file__).parent.joinpath(r"log_config.json")
+
+# アドオンのパッケージ名 (フォルダ名やエクステンションのパスによって変わる)
+ADDON_LOGGER_NAME = __package__.rpartition(".")[0]
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+DEFAULT_LOG_LEVEL = "WARNING"
+
+# ログの出力処理はQueueListenerのスレッドで行い､メインスレッドではキューに積むだけにする
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+class LazyQueueHandler(QueueHandler):
+    # 最初のレコードが出力されるまで設定ファイルの読み込みやリスナーの起動を行わない
+    def enqueue(self, record: LogRecord):
+        if _listener is None:
+            start_log_listener()
+        super().enqueue(record)
+
+
+@functools.cache
+def load_log_config() -> dict:
+    with open(path_log_config, "r") as f:
+        return json.load(f)
+
+
+@functools.cache
+def get_log_file_path() -> Path:
+    log_conf = load_log_config()
+    log_directory = bpy.utils.user_resource(
+        "DATAFILES", path=log_conf["file"]["directory"], create=True
+    )
+    return Path(log_directory, log_conf["file"]["file_name"])
+
+
+def start_log_listener():
+    """
+    ローテーションするログファイルとコンソール (WARNING以上) に書き出すリスナーを開始する｡
+    """
+
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        log_conf = load_log_config()
+        file_conf = log_conf["file"]
+        handlers = []
+        try:
+            file_handler = RotatingFileHandler(
+                get_log_file_path(),
+                maxBytes=file_conf["max_bytes"],
+                backupCount=file_conf["backup_count"],
+                encoding="utf-8",
+                delay=True,
+            )
+            file_handler.setFormatter(Formatter(file_conf["format"]))
+            handlers.append(file_handler)
+        except (OSError, ValueError) as e:
+            print(f"DD Import : Failed to open log file : {e}", file=sys.stderr)
+
+        console_conf = log_conf["console"]
+        console_handler = StreamHandler(sys.stderr)
+        console_handler.setLevel(console_conf["level"])
+        console_handler.setFormatter(Formatter(console_conf["format"]))
+        handlers.append(console_handler)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def stop_log_listener():
+    # キューに残っているレコードを書き出してからファイルを閉じる
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def set_log_level(level: str):
+    getLogger(ADDON_LOGGER_NAME).setLevel(level)
+
+
+def _setup_addon_logger():
+    addon_logger = getLogger(ADDON_LOGGER_NAME)
+    # アドオンのリロード時にキューハンドラーが重複しないようにする
+    for handler in addon_logger.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            addon_logger.removeHandler(handler)
+    addon_logger.addHandler(LazyQueueHandler(log_queue))
+    addon_logger.setLevel(DEFAULT_LOG_LEVEL)
+    addon_logger.propagate = False
+
+
+_setup_addon_logger()
 
-path_log_config = Path(__file__).parent.joinpath(r'log_config.json')
-with open(path_log_config, 'r') as f:
-    log_conf = json.load(f)
-config.dictConfig(log_conf)
 
 def preparating_logger(name: str):
-    return getLogger(name)
\ No newline at end of file
+    return getLogger(name)
@@ -18,7 +18,30 @@ if "bpy" in locals():
 
     reloadable_modules = [
         "preparation_logger",
-        "debug",
+        "addon_registry",
+        "source_scanner",
+        "import_queue",
+        "blend_library",
+        "background_workers",
+        "import_cache",
+        "batch_staging",
+        "fbx_direct_load",
+        "tracing",
+        "fbx_metadata",
+        "system_memory",
+        "memory_governor",
+        "hot_folder",
+        "datablock_hash",
+        "reimport",
+        "mesh_dedup",
+        "material_dedup",
+        "texture_index",
+        "texture_preload",
+        "texture_proxy",
+        "file_namespace",
+        "instancing",
+        "asset_library",
+        "checkpoint",
     ]
 
     for module in reloadable_modules:
@@ -27,18 +50,149 @@ if "bpy" in locals():
 
 else:
     from .Logging import preparation_logger
-    from . import debug
+    from . import addon_registry
+    from . import source_scanner
+    from . import import_queue
+    from . import blend_library
+    from . import background_workers
+    from . import import_cache
+    from . import batch_staging
+    from . import fbx_direct_load
+    from . import tracing
+    from . import fbx_metadata
+    from . import system_memory
+    from . import memory_governor
+    from . import hot_folder
+    from . import datablock_hash
+    from . import reimport
+    from . import mesh_dedup
+    from . import material_dedup
+    from . import texture_index
+    from . import texture_preload
+    from . import texture_proxy
+    from . import file_namespace
+    from . import instancing
+    from . import asset_library
+    from . import checkpoint
 
 import bpy
-from bpy_extras.io_utils import orientation_helper
-from addon_utils import paths, check
-from bpy.path import module_names
+from bpy_extras.io_utils import orientation_helper, ExportHelper
+
+import contextlib
+import time
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-from .debug import (
-    launch_debug_server,
+from .addon_registry import (
+    enabled_addon_registry,
+    install_addon_hooks,
+    remove_addon_hooks,
+)
+from .import_queue import (
+    IMPORTER_BUILT_IN,
+    IMPORTER_BETTER_FBX,
+    IMPORTER_VRM,
+    VRM_KEYWORDS,
+    ImportJob,
+    execute_import_job,
+    get_file_size,
+    import_job_queue,
+)
+from .source_scanner import (
+    SourceScanner,
+    archive_reader,
+    classify_dropped_files,
+    is_scan_source,
+    resolve_import_path,
+)
+from .blend_library import (
+    DatablockSnapshot,
+    append_objects_from_blend,
+)
+from .background_workers import (
+    WorkerPool,
+    WorkerResult,
+    get_default_worker_count,
+)
+from .import_cache import (
+    import_cache,
+)
+from .batch_staging import (
+    BatchStaging,
+)
+from .fbx_direct_load import (
+    direct_fbx_loader,
+)
+from .tracing import (
+    DEFAULT_BUFFER_SIZE,
+    tracer,
+)
+from .system_memory import (
+    get_current_rss,
+)
+from .fbx_metadata import (
+    FbxMetadata,
+    read_fbx_metadata_batch,
+)
+from .hot_folder import (
+    get_active_watcher,
+    start_hot_folder,
+    stop_hot_folder,
+)
+from .reimport import (
+    InPlaceReimport,
+    find_tracked_objects,
+    get_source_signature,
+    get_tracked_sources,
+    is_source_changed,
+    record_provenance,
+)
+from .texture_index import (
+    TextureIndex,
+    resolve_missing_images,
+    texture_search_index,
+)
+from .texture_proxy import (
+    apply_texture_proxies,
+    cancel_proxy_builds,
+    get_building_image_uids,
+    switch_texture_proxies,
+    texture_proxy_cache,
+)
+from .texture_preload import (
+    get_default_preload_threads,
+    prefetch_images,
+)
+from .material_dedup import (
+    consolidate_materials,
+)
+from .mesh_dedup import (
+    deduplicate_meshes,
+)
+from .checkpoint import (
+    get_checkpoint_path,
+    remove_checkpoint,
+    save_checkpoint,
+)
+from .asset_library import (
+    asset_library,
+    get_asset_collection_name,
+    link_asset,
+)
+from .instancing import (
+    instance_identical_objects,
+)
+from .file_namespace import (
+    FileNamespace,
+    get_namespace_prefix,
+)
+from .memory_governor import (
+    MemoryPlan,
+    MemoryWatchdog,
+    estimate_import_memory,
+    plan_import_batch,
+    purge_orphans,
 )
 
 """---------------------------------------------------------
@@ -46,7 +200,14 @@ from .debug import (
     Logger
 ------------------------------------------------------------
 ---------------------------------------------------------"""
-from .Logging.preparation_logger import preparating_logger
+from .Logging.preparation_logger import (
+    DEFAULT_LOG_LEVEL,
+    LOG_LEVELS,
+    get_log_file_path,
+    preparating_logger,
+    set_log_level,
+    stop_log_listener,
+)
 
 logger = preparating_logger(__name__)
 
@@ -59,6 +220,21 @@ logger = preparating_logger(__name__)
 presets_directory: Path = Path(bpy.utils.resource_path("USER")).joinpath(
     "scripts", "presets", "DDImport"
 )
+default_import_cache_directory: Path = Path(bpy.utils.resource_path("USER")).joinpath(
+    "datafiles", "DDImport", "ImportCache"
+)
+default_asset_library_directory: Path = Path(bpy.utils.resource_path("USER")).joinpath(
+    "datafiles", "DDImport", "Library"
+)
+default_checkpoint_path: Path = Path(bpy.utils.resource_path("USER")).joinpath(
+    "datafiles", "DDImport", "Checkpoints", "checkpoint.blend"
+)
+default_texture_proxy_directory: Path = Path(bpy.utils.resource_path("USER")).joinpath(
+    "datafiles", "DDImport", "TextureProxies"
+)
+texture_index_path: Path = Path(bpy.utils.resource_path("USER")).joinpath(
+    "datafiles", "DDImport", "TextureIndex", "texture_index.json"
+)
 
 
 """---------------------------------------------------------
@@ -68,14 +244,9 @@ presets_directory: Path = Path(bpy.utils.resource_path("USER")).joinpath(
 ---------------------------------------------------------"""
 
 
-def get_enabled_addon_list():
-    enabled_addon_list = []
-    for path in paths():
-        for mod_name, mod_path in module_names(path):
-            is_enabled, is_loaded = check(mod_name)
-            if is_enabled:
-                enabled_addon_list.append(mod_name)
-    return enabled_addon_list
+def get_enabled_addon_list() -> list[str]:
+    # アドオンパスを毎回走査せず､メモリ上のレジストリから取得する
+    return enabled_addon_registry.get_enabled_addon_list()
 
 
 def get_preset_directory() -> Path:
@@ -563,11 +734,13 @@ class DDIMPORT_BetterFBXPropertyGroup(PropertyGroupBase):
 ---------------------------------------------------------"""
 
 
-class DDIMPORT_WM_built_in_pref_parameters(DDIMPORT_BuiltInPropertyGroup):
+# プリファレンスの自動インポート設定､ポップアップUIの値､リセット用のデフォルト値は
+# 同じスキーマから作られた1つのプロパティグループを共有し､登録するRNAの型を減らす
+class DDIMPORT_WM_built_in_options(DDIMPORT_BuiltInPropertyGroup):
     pass
 
 
-class DDIMPORT_WM_better_fbx_pref_parameters(DDIMPORT_BetterFBXPropertyGroup):
+class DDIMPORT_WM_better_fbx_options(DDIMPORT_BetterFBXPropertyGroup):
     pass
 
 
@@ -578,7 +751,7 @@ class DDIMPORT_PREF_addon_preference(
 
     def get_item_list(scene, context) -> list[tuple[str]]:
         items = [("0", "Built-In", "")]
-        if "better_fbx" in get_enabled_addon_list():
+        if enabled_addon_registry.is_better_fbx_available():
             items.append(("1", "Better FBX", ""))
         return items
 
@@ -595,30 +768,677 @@ class DDIMPORT_PREF_addon_preference(
         default=True,
     )
 
+    execution_mode: bpy.props.EnumProperty(
+        name="Execution Mode",
+        description="How dropped files are imported",
+        items=(
+            (
+                "SESSION",
+                "Current Session",
+                "Import files one by one in the current Blender session",
+            ),
+            (
+                "WORKERS",
+                "Background Workers",
+                "Convert files to .blend in parallel background Blender processes "
+                "and append the results",
+            ),
+        ),
+        default="SESSION",
+    )
+
+    worker_count: bpy.props.IntProperty(
+        name="Worker Count",
+        description="Number of background Blender processes running at the same time",
+        default=get_default_worker_count(),
+        min=1,
+        max=256,
+    )
+
+    worker_memory_limit: bpy.props.IntProperty(
+        name="Worker Memory Limit (MB)",
+        description="Maximum memory of each background Blender process. "
+        "0 means unlimited (only supported on Linux and macOS)",
+        default=0,
+        min=0,
+    )
+
+    use_direct_fbx_load: bpy.props.BoolProperty(
+        name="Direct FBX Load",
+        description="Call the load function of the Built-In FBX importer directly "
+        "instead of running the import operator for each file. "
+        "Falls back to the operator when the function is not available",
+        default=False,
+    )
+
+    use_fbx_inspection: bpy.props.BoolProperty(
+        name="Inspect FBX Before Import",
+        description="Read the node tree of dropped binary FBX files before import "
+        "and report object, vertex, bone and key counts",
+        default=False,
+    )
+
+    use_batch_staging: bpy.props.BoolProperty(
+        name="Stage Batch Imports",
+        description="Import into a collection disabled in viewports and link everything "
+        "into the scene at the end of the batch, so the scene is evaluated only once",
+        default=False,
+    )
+
+    use_file_namespace: bpy.props.BoolProperty(
+        name="Prefix Names by File",
+        description="In batches of several files, prefix the names of the objects, "
+        "data, materials and actions created by each file with its file name, "
+        "so names of different files never collide",
+        default=False,
+    )
+
+    use_mesh_deduplication: bpy.props.BoolProperty(
+        name="Deduplicate Meshes",
+        description="After a batch, make imported objects with identical mesh data "
+        "and materials share one mesh and remove the copies",
+        default=False,
+    )
+
+    use_material_deduplication: bpy.props.BoolProperty(
+        name="Deduplicate Materials",
+        description="After a batch, merge imported images that load the same file or "
+        "pixels and imported materials with identical node trees",
+        default=False,
+    )
+
+    use_instancing: bpy.props.BoolProperty(
+        name="Instance Identical Objects",
+        description="After a batch, turn imported objects with identical mesh, "
+        "materials and modifiers into instances of one source object",
+        default=False,
+    )
+
+    instance_type: bpy.props.EnumProperty(
+        name="Instance Type",
+        items=(
+            (
+                "COLLECTION",
+                "Collection Instances",
+                "Replace the objects with empties instancing a collection "
+                "that holds the source object",
+            ),
+            (
+                "LINKED",
+                "Linked Duplicates",
+                "Keep the objects and make them share the mesh of the source object",
+            ),
+        ),
+        default="COLLECTION",
+    )
+
+    undo_file_count_limit: bpy.props.IntProperty(
+        name="No Undo Above File Count",
+        description="Do not push an undo step when a batch has more files than this. "
+        "0 means no limit",
+        default=0,
+        min=0,
+    )
+
+    undo_size_limit: bpy.props.IntProperty(
+        name="No Undo Above Size (MB)",
+        description="Do not push an undo step when the total file size of a batch "
+        "exceeds this. 0 means no limit",
+        default=0,
+        min=0,
+    )
+
+    use_memory_governor: bpy.props.BoolProperty(
+        name="Memory Preflight",
+        description="Estimate the memory a drop needs before import and split it into "
+        "chunks, purging unused data between them, when it does not fit. "
+        "Purging also removes unused data that existed before the import",
+        default=False,
+    )
+
+    memory_budget_ratio: bpy.props.FloatProperty(
+        name="Memory Budget",
+        description="Share of the available system memory an import batch may use",
+        default=0.8,
+        min=0.1,
+        max=1.0,
+        subtype="FACTOR",
+    )
+
+    refuse_over_budget: bpy.props.BoolProperty(
+        name="Refuse Over Budget",
+        description="Do not import a drop whose estimate exceeds the memory budget",
+        default=False,
+    )
+
+    memory_ceiling: bpy.props.IntProperty(
+        name="Pause Above RSS (MB)",
+        description="Pause the import queue while the memory used by Blender is above "
+        "this. 0 means no limit",
+        default=0,
+        min=0,
+    )
+
+    chunk_file_count: bpy.props.IntProperty(
+        name="Purge Every N Files",
+        description="Purge unused data after every N imported files of a batch, "
+        "so temporary data does not pile up until the file is saved. "
+        "Purging also removes unused data that existed before the import. "
+        "0 means no chunks",
+        default=0,
+        min=0,
+    )
+
+    use_checkpoint: bpy.props.BoolProperty(
+        name="Save Checkpoints",
+        description="Save a copy of the session after each chunk, with a list of "
+        "the files imported so far next to it. Only the latest checkpoint is kept",
+        default=False,
+    )
+
+    checkpoint_path: bpy.props.StringProperty(
+        name="Checkpoint Path",
+        description="Path of the checkpoint .blend. The chunk number is added to "
+        "the file name. Leave empty to use the user datafiles directory",
+        subtype="FILE_PATH",
+        default="",
+    )
+
+    use_reimport: bpy.props.BoolProperty(
+        name="Re-import in Place",
+        description="Record the source file of imported objects. When a changed file "
+        "is imported again, replace the mesh data, materials and actions of the existing "
+        "objects instead of adding copies. Unchanged files are skipped",
+        default=False,
+    )
+
+    def update_hot_folder(self, context):
+        apply_hot_folder_preferences(self)
+
+    use_hot_folder: bpy.props.BoolProperty(
+        name="Watch Hot Folder",
+        description="Poll the hot folder and import new or changed FBX/VRM files "
+        "with the auto import parameters",
+        default=False,
+        update=update_hot_folder,
+    )
+
+    hot_folder_directory: bpy.props.StringProperty(
+        name="Hot Folder",
+        description="Directory watched for new and changed files",
+        subtype="DIR_PATH",
+        update=update_hot_folder,
+    )
+
+    hot_folder_recursive: bpy.props.BoolProperty(
+        name="Include Subfolders",
+        description="Also watch the subfolders of the hot folder",
+        default=True,
+        update=update_hot_folder,
+    )
+
+    def update_log_level(self, context):
+        set_log_level(self.log_level)
+
+    log_level: bpy.props.EnumProperty(
+        name="Log Level",
+        description="Minimum level of messages written to the log file",
+        items=[(level, level.capitalize(), "") for level in LOG_LEVELS],
+        default=DEFAULT_LOG_LEVEL,
+        update=update_log_level,
+    )
+
+    def update_tracing(self, context):
+        tracer.enabled = self.use_tracing
+        tracer.set_buffer_size(self.trace_buffer_size)
+
+    use_tracing: bpy.props.BoolProperty(
+        name="Tracing",
+        description="Record the time of each import stage. "
+        "Records can be exported as Chrome trace JSON",
+        default=False,
+        update=update_tracing,
+    )
+
+    trace_buffer_size: bpy.props.IntProperty(
+        name="Trace Buffer Size",
+        description="Maximum number of trace records kept in memory",
+        default=DEFAULT_BUFFER_SIZE,
+        min=100,
+        update=update_tracing,
+    )
+
+    use_import_cache: bpy.props.BoolProperty(
+        name="Use Import Cache",
+        description="Store the result of each import as .blend and append it "
+        "instead of importing again when the same file is dropped with the same options",
+        default=False,
+    )
+
+    import_cache_directory: bpy.props.StringProperty(
+        name="Import Cache Directory",
+        description="Directory to store the import cache. "
+        "Leave empty to use the user datafiles directory",
+        subtype="DIR_PATH",
+        default="",
+    )
+
+    import_cache_size_limit: bpy.props.IntProperty(
+        name="Import Cache Size Limit (MB)",
+        description="Least recently used entries are removed when the cache exceeds this size",
+        default=4096,
+        min=1,
+    )
+
+    use_library_link: bpy.props.BoolProperty(
+        name="Link from Library",
+        description="Convert each dropped file once into its own .blend in the library "
+        "directory with background workers, and link it instead of appending. "
+        "Files already converted with the same options are linked without importing",
+        default=False,
+    )
+
+    library_directory: bpy.props.StringProperty(
+        name="Library Directory",
+        description="Directory to store the converted .blend files. "
+        "Leave empty to use the user datafiles directory",
+        subtype="DIR_PATH",
+        default="",
+    )
+
+    use_library_override: bpy.props.BoolProperty(
+        name="Library Overrides",
+        description="Create library overrides for the linked files and make "
+        "their top-level objects editable, instead of collection instances",
+        default=False,
+    )
+
+    use_texture_index: bpy.props.BoolProperty(
+        name="Indexed Texture Search",
+        description="Import with the image search of the Built-In importer disabled "
+        "and resolve missing textures from an index of the texture folders instead",
+        default=False,
+    )
+
+    texture_search_roots: bpy.props.StringProperty(
+        name="Texture Folders",
+        description="Folders indexed for the texture search. "
+        "Separate multiple folders with ;",
+        default="",
+    )
+
+    use_texture_preload: bpy.props.BoolProperty(
+        name="Prefetch Textures",
+        description="After a batch, read the imported texture files in parallel and "
+        "decode them on the main thread, so the first viewport draw does not read "
+        "them one by one",
+        default=False,
+    )
+
+    texture_preload_threads: bpy.props.IntProperty(
+        name="Prefetch Threads",
+        description="Number of texture files read at the same time",
+        default=get_default_preload_threads(),
+        min=1,
+        max=64,
+    )
+
+    use_texture_proxy: bpy.props.BoolProperty(
+        name="Texture Proxies",
+        description="After a batch, point the imported images at downscaled copies "
+        "built in background Blender processes and kept in a disk cache",
+        default=False,
+    )
+
+    texture_proxy_size: bpy.props.EnumProperty(
+        name="Proxy Size",
+        description="Longest side of the downscaled textures",
+        items=(
+            ("512", "512", ""),
+            ("1024", "1K", ""),
+            ("2048", "2K", ""),
+        ),
+        default="1024",
+    )
+
+    texture_proxy_directory: bpy.props.StringProperty(
+        name="Proxy Cache Directory",
+        description="Directory to store the texture proxies. "
+        "Leave empty to use the user datafiles directory",
+        subtype="DIR_PATH",
+        default="",
+    )
+
+    texture_proxy_size_limit: bpy.props.IntProperty(
+        name="Proxy Cache Size Limit (MB)",
+        description="Least recently used proxies are removed when the cache exceeds this size",
+        default=4096,
+        min=1,
+    )
+
     built_in: bpy.props.PointerProperty(
         name="Built-In Options",
         description="",
-        type=DDIMPORT_WM_built_in_pref_parameters,
+        type=DDIMPORT_WM_built_in_options,
     )
 
-    better_fbx: bpy.props.PointerProperty(
-        name="Better FBX Options",
-        description="",
-        type=DDIMPORT_WM_better_fbx_pref_parameters,
-    )
+    better_fbx: bpy.props.PointerProperty(
+        name="Better FBX Options",
+        description="",
+        type=DDIMPORT_WM_better_fbx_options,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        split_factor = 0.5
+
+        header, panel = layout.panel("DDFBX_Pref_Importer", default_closed=False)
+        header.label(text="Importer")
+        if panel:
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Importer")
+            sp.prop(self, "importer", text="")
+
+        header, panel = layout.panel("DDFBX_Pref_Performance", default_closed=False)
+        header.label(text="Performance")
+        if panel:
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Execution Mode")
+            sp.prop(self, "execution_mode", text="")
+
+            col = panel.column()
+            col.enabled = self.execution_mode == "WORKERS"
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Worker Count")
+            sp.prop(self, "worker_count", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Worker Memory Limit (MB)")
+            sp.prop(self, "worker_memory_limit", text="")
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Direct FBX Load")
+            sp.prop(self, "use_direct_fbx_load", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Inspect FBX Before Import")
+            sp.prop(self, "use_fbx_inspection", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Stage Batch Imports")
+            sp.prop(self, "use_batch_staging", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Prefix Names by File")
+            sp.prop(self, "use_file_namespace", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Deduplicate Meshes")
+            sp.prop(self, "use_mesh_deduplication", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Deduplicate Materials")
+            sp.prop(self, "use_material_deduplication", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Instance Identical Objects")
+            sp.prop(self, "use_instancing", text="")
+            col = panel.column()
+            col.enabled = self.use_instancing
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Instance Type")
+            sp.prop(self, "instance_type", text="")
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Memory Preflight")
+            sp.prop(self, "use_memory_governor", text="")
+            col = panel.column()
+            col.enabled = self.use_memory_governor
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Memory Budget")
+            sp.prop(self, "memory_budget_ratio", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Refuse Over Budget")
+            sp.prop(self, "refuse_over_budget", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Pause Above RSS (MB)")
+            sp.prop(self, "memory_ceiling", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Purge Every N Files")
+            sp.prop(self, "chunk_file_count", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Save Checkpoints")
+            sp.prop(self, "use_checkpoint", text="")
+            col = panel.column()
+            col.enabled = self.use_checkpoint
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Checkpoint Path")
+            sp.prop(self, "checkpoint_path", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="No Undo Above File Count")
+            sp.prop(self, "undo_file_count_limit", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="No Undo Above Size (MB)")
+            sp.prop(self, "undo_size_limit", text="")
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Import Cache")
+            sp.prop(self, "use_import_cache", text="")
+            col = panel.column()
+            col.enabled = self.use_import_cache
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Cache Directory")
+            sp.prop(self, "import_cache_directory", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Cache Size Limit (MB)")
+            sp.prop(self, "import_cache_size_limit", text="")
+            if self.use_import_cache:
+                cache = get_import_cache()
+                row = col.row(align=True)
+                row.separator(factor=5.0)
+                sp = row.split(align=True, factor=split_factor)
+                sp.label(
+                    text=f"Hits: {cache.hits}  Misses: {cache.misses}  "
+                    f"Entries: {cache.entry_count}  "
+                    f"Size: {cache.total_size / 1024 ** 2:.1f} MB"
+                )
+                sp.operator(DDIMPORT_OT_clear_import_cache.bl_idname)
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Link from Library")
+            sp.prop(self, "use_library_link", text="")
+            col = panel.column()
+            col.enabled = self.use_library_link
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Library Directory")
+            sp.prop(self, "library_directory", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Library Overrides")
+            sp.prop(self, "use_library_override", text="")
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Indexed Texture Search")
+            sp.prop(self, "use_texture_index", text="")
+            col = panel.column()
+            col.enabled = self.use_texture_index
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Texture Folders")
+            sp.prop(self, "texture_search_roots", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text=f"Indexed Textures: {texture_search_index.file_count}")
+            sp.operator(DDIMPORT_OT_rebuild_texture_index.bl_idname)
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Texture Proxies")
+            sp.prop(self, "use_texture_proxy", text="")
+            col = panel.column()
+            col.enabled = self.use_texture_proxy
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Proxy Size")
+            sp.prop(self, "texture_proxy_size", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Proxy Cache Directory")
+            sp.prop(self, "texture_proxy_directory", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Proxy Cache Size Limit (MB)")
+            sp.prop(self, "texture_proxy_size_limit", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Switch Textures")
+            sub = sp.row(align=True)
+            op = sub.operator(
+                DDIMPORT_OT_switch_texture_proxies.bl_idname, text="Full Resolution"
+            )
+            op.use_proxies = False
+            op = sub.operator(
+                DDIMPORT_OT_switch_texture_proxies.bl_idname, text="Proxies"
+            )
+            op.use_proxies = True
+            sub.operator(DDIMPORT_OT_clear_texture_proxy_cache.bl_idname)
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Prefetch Textures")
+            sp.prop(self, "use_texture_preload", text="")
+            col = panel.column()
+            col.enabled = self.use_texture_preload
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Prefetch Threads")
+            sp.prop(self, "texture_preload_threads", text="")
+
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Tracing")
+            sp.prop(self, "use_tracing", text="")
+            col = panel.column()
+            col.enabled = self.use_tracing
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Trace Buffer Size")
+            sp.prop(self, "trace_buffer_size", text="")
+            row = col.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text=f"Records: {len(tracer.records)}")
+            sub = sp.row(align=True)
+            sub.operator(DDIMPORT_OT_export_trace.bl_idname)
+            sub.operator(DDIMPORT_OT_clear_trace.bl_idname)
 
-    def draw(self, context):
-        layout = self.layout
-        split_factor = 0.5
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Log Level")
+            sp.prop(self, "log_level", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Log File")
+            sp.label(text=str(get_log_file_path()))
 
-        header, panel = layout.panel("DDFBX_Pref_Importer", default_closed=False)
-        header.label(text="Importer")
+        header, panel = layout.panel("DDFBX_Pref_Reimport", default_closed=True)
+        header.label(text="Re-import")
         if panel:
             row = panel.row(align=True)
             row.separator(factor=5.0)
             sp = row.split(align=True, factor=split_factor)
-            sp.label(text="Importer")
-            sp.prop(self, "importer", text="")
+            sp.label(text="Re-import in Place")
+            sp.prop(self, "use_reimport", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text=f"Tracked Files: {len(get_tracked_sources())}")
+            sp.operator(DDIMPORT_OT_reimport_changed.bl_idname)
+
+        header, panel = layout.panel("DDFBX_Pref_HotFolder", default_closed=True)
+        header.label(text="Hot Folder")
+        if panel:
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Watch Hot Folder")
+            sp.prop(self, "use_hot_folder", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Hot Folder")
+            sp.prop(self, "hot_folder_directory", text="")
+            row = panel.row(align=True)
+            row.separator(factor=5.0)
+            sp = row.split(align=True, factor=split_factor)
+            sp.label(text="Include Subfolders")
+            sp.prop(self, "hot_folder_recursive", text="")
+            watcher = get_active_watcher()
+            if watcher is not None:
+                row = panel.row(align=True)
+                row.separator(factor=5.0)
+                row.label(text=f"Watching {watcher.directory}", icon="VIEWZOOM")
 
         header, panel = layout.panel("DDFBX_Pref_Behavior", default_closed=False)
         header.label(text="Behavior")
@@ -735,7 +1555,7 @@ class DDIMPORT_PREF_addon_preference(
             # ----------------------------------------------------------
             #    Better FBX Importerのデフォルトオプション
             # ----------------------------------------------------------
-            if "better_fbx" in get_enabled_addon_list():
+            if enabled_addon_registry.is_better_fbx_available():
                 better_fbx_props: DDIMPORT_BetterFBXPropertyGroup = self.better_fbx
                 row = layout.row()
                 header, panel_root = row.panel(
@@ -887,6 +1707,51 @@ def get_addon_preferences() -> DDIMPORT_PREF_addon_preference:
     return addon_preferences
 
 
+def get_import_cache():
+    # プリファレンスで設定されたディレクトリとサイズ上限をキャッシュに反映する
+    addon_pref = get_addon_preferences()
+    if addon_pref.import_cache_directory:
+        cache_directory = Path(bpy.path.abspath(addon_pref.import_cache_directory))
+    else:
+        cache_directory = default_import_cache_directory
+    import_cache.set_directory(cache_directory)
+    import_cache.size_limit = addon_pref.import_cache_size_limit * 1024**2
+    return import_cache
+
+
+def get_asset_library():
+    addon_pref = get_addon_preferences()
+    if addon_pref.library_directory:
+        library_directory = Path(bpy.path.abspath(addon_pref.library_directory))
+    else:
+        library_directory = default_asset_library_directory
+    asset_library.set_directory(library_directory)
+    return asset_library
+
+
+def get_texture_proxy_cache():
+    addon_pref = get_addon_preferences()
+    if addon_pref.texture_proxy_directory:
+        cache_directory = Path(bpy.path.abspath(addon_pref.texture_proxy_directory))
+    else:
+        cache_directory = default_texture_proxy_directory
+    texture_proxy_cache.set_directory(cache_directory)
+    texture_proxy_cache.size_limit = addon_pref.texture_proxy_size_limit * 1024**2
+    return texture_proxy_cache
+
+
+def get_texture_index() -> TextureIndex:
+    # プリファレンスで設定されたフォルダを索引に反映する
+    addon_pref = get_addon_preferences()
+    roots = [
+        bpy.path.abspath(root.strip())
+        for root in addon_pref.texture_search_roots.split(";")
+        if root.strip()
+    ]
+    texture_search_index.set_roots(roots, texture_index_path)
+    return texture_search_index
+
+
 def get_auto_import_parameters() -> dict[str, Any]:
     addon_pref = get_addon_preferences()
     match int(addon_pref.importer):
@@ -902,6 +1767,10 @@ def get_auto_import_parameters() -> dict[str, Any]:
     return dic_parameters
 
 
+def get_session_uids(datablocks: Iterable[bpy.types.ID]) -> set[int]:
+    return {datablock.session_uid for datablock in datablocks}
+
+
 """---------------------------------------------------------
 ------------------------------------------------------------
     Property Group
@@ -909,37 +1778,29 @@ def get_auto_import_parameters() -> dict[str, Any]:
 ---------------------------------------------------------"""
 
 
-class DDIMPORT_WM_built_in_import_options(DDIMPORT_BuiltInPropertyGroup):
-    pass
-
-
-class DDIMPORT_WM_better_fbx_import_options(DDIMPORT_BetterFBXPropertyGroup):
-    pass
-
-
 class DDIMPORT_WM_import_options_root(bpy.types.PropertyGroup):
     built_in: bpy.props.PointerProperty(
         name="Built-In Importer",
         description="",
-        type=DDIMPORT_WM_built_in_import_options,
+        type=DDIMPORT_WM_built_in_options,
     )
 
     better_fbx: bpy.props.PointerProperty(
         name="Better FBX",
         description="",
-        type=DDIMPORT_WM_better_fbx_import_options,
+        type=DDIMPORT_WM_better_fbx_options,
     )
 
     built_in_default: bpy.props.PointerProperty(
         name="Pref Built-In Default Values",
         description="",
-        type=DDIMPORT_WM_built_in_pref_parameters,
+        type=DDIMPORT_WM_built_in_options,
     )
 
     better_fbx_default: bpy.props.PointerProperty(
         name="Pref Better Fbx Default Values",
         description="",
-        type=DDIMPORT_WM_better_fbx_pref_parameters,
+        type=DDIMPORT_WM_better_fbx_options,
     )
 
 
@@ -950,16 +1811,101 @@ def get_wm_root_property_group() -> DDIMPORT_WM_import_options_root:
     return root_property
 
 
-def get_wm_built_in_property_group() -> DDIMPORT_WM_built_in_import_options:
+def get_wm_built_in_property_group() -> DDIMPORT_WM_built_in_options:
     importer_prop = get_wm_root_property_group().built_in
     return importer_prop
 
 
-def get_wm_better_fbx_property_group() -> DDIMPORT_WM_better_fbx_import_options:
+def get_wm_better_fbx_property_group() -> DDIMPORT_WM_better_fbx_options:
     importer_prop = get_wm_root_property_group().better_fbx
     return importer_prop
 
 
+def start_import_queue():
+    if import_job_queue.is_running:
+        return
+    # バックグラウンドモードではモーダルで処理できないため同期的に処理する
+    if bpy.app.background:
+        bpy.ops.ddimport.run_import_queue("EXEC_DEFAULT")
+        return
+    # タイマーから呼ばれた場合はウィンドウが無いため､最初のウィンドウでモーダルを開始する
+    window = bpy.context.window or bpy.context.window_manager.windows[0]
+    with bpy.context.temp_override(window=window):
+        bpy.ops.ddimport.run_import_queue("INVOKE_DEFAULT")
+
+
+def preflight_import_jobs(jobs: list[ImportJob]) -> MemoryPlan:
+    """
+    ジョブのインポートに必要なメモリを見積もり､空きメモリと比較する｡
+    FBXはヘッダーの内容から､それ以外はファイルサイズからメモリを見積もる｡
+    拒否されなかった場合は各ジョブに見積もりを記録し､キューのチャンクの大きさを制限する｡
+    """
+
+    addon_pref = get_addon_preferences()
+    with tracer.span("memory_preflight", file_count=len(jobs)):
+        fbx_paths = [j.filepath for j in jobs if j.importer != IMPORTER_VRM]
+        metadata = {
+            m.filepath: m
+            for m in read_fbx_metadata_batch(fbx_paths, count_polygons=False)
+        }
+        estimates = [
+            estimate_import_memory(
+                j.filepath,
+                j.file_size or get_file_size(j.filepath),
+                metadata.get(j.filepath),
+            )
+            for j in jobs
+        ]
+        plan = plan_import_batch(
+            estimates,
+            addon_pref.memory_budget_ratio,
+            addon_pref.refuse_over_budget,
+        )
+    logger.info("Memory preflight : %s", plan.describe())
+    if not plan.is_refused:
+        for job, estimate in zip(jobs, estimates):
+            job.transient_memory = estimate.transient
+        import_job_queue.limit_chunk_transient(plan.chunk_transient)
+    return plan
+
+
+def enqueue_auto_import_files(filepaths: list[str], reimport: bool = False):
+    # ホットフォルダや再インポートのファイルは自動インポートのパラメーターでインポートする
+    addon_pref = get_addon_preferences()
+    if addon_pref.importer == "1" and enabled_addon_registry.is_better_fbx_available():
+        fbx_importer = IMPORTER_BETTER_FBX
+    else:
+        fbx_importer = IMPORTER_BUILT_IN
+    fbx_keywords = get_auto_import_parameters()
+    jobs = []
+    for filepath in filepaths:
+        if not filepath.lower().endswith(".vrm"):
+            jobs.append(
+                ImportJob(fbx_importer, filepath, fbx_keywords, reimport=reimport)
+            )
+        elif enabled_addon_registry.is_vrm_available():
+            jobs.append(
+                ImportJob(IMPORTER_VRM, filepath, VRM_KEYWORDS, reimport=reimport)
+            )
+    if not jobs:
+        return
+    if addon_pref.use_memory_governor and preflight_import_jobs(jobs).is_refused:
+        return
+    logger.info("Auto import : %d files", len(jobs))
+    import_job_queue.add_jobs(jobs)
+    start_import_queue()
+
+
+def apply_hot_folder_preferences(addon_pref: DDIMPORT_PREF_addon_preference):
+    directory = bpy.path.abspath(addon_pref.hot_folder_directory)
+    if addon_pref.use_hot_folder and directory and Path(directory).is_dir():
+        start_hot_folder(
+            directory, enqueue_auto_import_files, addon_pref.hot_folder_recursive
+        )
+    else:
+        stop_hot_folder()
+
+
 """---------------------------------------------------------
 ------------------------------------------------------------
     File Handler
@@ -971,7 +1917,9 @@ class DDIMPORT_FH_import(bpy.types.FileHandler):
     bl_idname = "DDIMPORT_FH_custom_fbx_import"
     bl_label = "File Handler for Custom FBX Import"
     bl_import_operator = "dd_import.import"
-    bl_file_extensions = ".fbx;.vrm"
+    # アーカイブは拡張子で受け付けて中身を走査する｡
+    # フォルダは拡張子が無くFile Handlerに渡されないため､DDIMPORT_OT_import_folderでインポートする
+    bl_file_extensions = ".fbx;.vrm;.zip"
 
     @classmethod
     def poll_drop(cls, context):
@@ -1018,12 +1966,158 @@ class DDIMPORT_OT_reset_auto_import_parameters(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class DDIMPORT_OT_clear_import_cache(bpy.types.Operator):
+    bl_idname = "ddimport.clear_import_cache"
+    bl_label = "Clear Cache"
+    bl_description = "Remove all entries of the import cache"
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        get_import_cache().clear()
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_rebuild_texture_index(bpy.types.Operator):
+    bl_idname = "ddimport.rebuild_texture_index"
+    bl_label = "Rebuild Index"
+    bl_description = "Scan all texture folders again"
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        index = get_texture_index()
+        index.clear()
+        index.refresh()
+        self.report({"INFO"}, f"Indexed {index.file_count} textures")
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_switch_texture_proxies(bpy.types.Operator):
+    bl_idname = "ddimport.switch_texture_proxies"
+    bl_label = "Switch Texture Proxies"
+    bl_description = (
+        "Switch images that use texture proxies between full resolution and proxies"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    use_proxies: bpy.props.BoolProperty(
+        name="Use Proxies",
+        description="Use the downscaled textures instead of full resolution",
+        default=False,
+    )
+
+    def execute(self, context):
+        switched = switch_texture_proxies(self.use_proxies)
+        resolution = "proxies" if self.use_proxies else "full resolution"
+        self.report({"INFO"}, f"Switched {switched} textures to {resolution}")
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_clear_texture_proxy_cache(bpy.types.Operator):
+    bl_idname = "ddimport.clear_texture_proxy_cache"
+    bl_label = "Clear Cache"
+    bl_description = (
+        "Remove all texture proxies from the cache. "
+        "Images using them are switched back to full resolution"
+    )
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        cancel_proxy_builds()
+        switch_texture_proxies(False)
+        get_texture_proxy_cache().clear()
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_export_trace(bpy.types.Operator, ExportHelper):
+    bl_idname = "ddimport.export_trace"
+    bl_label = "Export Trace"
+    bl_description = "Export trace records as Chrome trace JSON"
+    bl_options = {"INTERNAL"}
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context):
+        tracer.export_chrome_trace(self.filepath)
+        self.report({"INFO"}, f"Export {len(tracer.records)} trace records")
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_clear_trace(bpy.types.Operator):
+    bl_idname = "ddimport.clear_trace"
+    bl_label = "Clear"
+    bl_description = "Remove all trace records"
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        tracer.clear()
+        return {"FINISHED"}
+
+
+class DDIMPORT_OT_import_folder(bpy.types.Operator):
+    bl_idname = "ddimport.import_folder"
+    bl_label = "Folder (D&D Import)"
+    bl_description = "Scan a folder for FBX/VRM files and import them with D&D Import"
+    bl_options = {"REGISTER"}
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH", options={"SKIP_SAVE"})
+    filter_folder: bpy.props.BoolProperty(default=True, options={"HIDDEN"})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        if not is_scan_source(self.directory):
+            self.report({"WARNING"}, f"Folder not found : {self.directory}")
+            return {"CANCELLED"}
+
+        # D&D Importのオペレーターは3Dビューポートでのみ実行できるため､メニューからはエリアを指定する
+        area = next(
+            (a for a in context.window.screen.areas if a.type == "VIEW_3D"), None
+        )
+        if area is None:
+            self.report({"WARNING"}, "3D Viewport not found")
+            return {"CANCELLED"}
+        region = next(r for r in area.regions if r.type == "WINDOW")
+        with context.temp_override(area=area, region=region):
+            # ファイル名を空にするとフォルダ自体を走査する
+            getattr(bpy.ops.dd_import, "import")(directory=self.directory, files=[])
+        return {"FINISHED"}
+
+
+def menu_func_import_folder(self, context):
+    self.layout.operator(DDIMPORT_OT_import_folder.bl_idname)
+
+
+class DDIMPORT_OT_reimport_changed(bpy.types.Operator):
+    bl_idname = "ddimport.reimport_changed"
+    bl_label = "Re-import Changed Files"
+    bl_description = (
+        "Re-import the source files of imported objects that changed on disk "
+        "and replace their data in place"
+    )
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        changed = [
+            source_path
+            for source_path, signature in get_tracked_sources().items()
+            if (current := get_source_signature(source_path)) and current != signature
+        ]
+        if not changed:
+            self.report({"INFO"}, "No changed files")
+            return {"CANCELLED"}
+        enqueue_auto_import_files(changed, reimport=True)
+        return {"FINISHED"}
+
+
 class DDIMPORT_ImportOperatorBase(bpy.types.Operator):
 
     # File Handlerから受け取ったファイル名の文字列からファイルパスを生成する
     def gen_source_file_list(self, source_file_names: [str]) -> list[str]:
         file_list = [i.strip() for i in source_file_names[1:-1].split(",")]
-        return file_list
+        return [i for i in file_list if i]
 
     # インポート対象のファイルのパスを生成する
     def gen_source_file_path(self, source_dir: str, source_file_name: str) -> str:
@@ -1032,6 +2126,51 @@ class DDIMPORT_ImportOperatorBase(bpy.types.Operator):
         file_path = str(file_path)
         return file_path
 
+    # インポート対象のファイルをキューに追加し､キューが停止していれば処理を開始する
+    def enqueue_import_jobs(
+        self,
+        importer: str,
+        keywords: dict[str, Any],
+        extensions: tuple[str, ...] = (".fbx",),
+    ):
+        file_list = self.gen_source_file_list(self.files)
+        jobs = [
+            ImportJob(importer, self.gen_source_file_path(self.directory, i), keywords)
+            for i in file_list
+        ]
+        if jobs and get_addon_preferences().use_memory_governor:
+            plan = preflight_import_jobs(jobs)
+            if plan.is_refused:
+                self.report({"ERROR"}, plan.describe())
+                return
+            if plan.chunk_transient:
+                self.report({"WARNING"}, plan.describe())
+        import_job_queue.add_jobs(jobs)
+
+        # フォルダとアーカイブは別スレッドで走査し､見つかったファイルから順にキューへ流す｡
+        # 走査は1度だけ行い､FBXと一緒に見つかったVRMは拡張子でVRMのインポーターに振り分ける
+        sources = self.sources.splitlines()
+        if sources:
+            scan_importers = {
+                extension: (importer, keywords) for extension in extensions
+            }
+            if importer != IMPORTER_VRM and enabled_addon_registry.is_vrm_available():
+                scan_importers[".vrm"] = (IMPORTER_VRM, VRM_KEYWORDS)
+
+            def make_scanned_job(filepath: str, file_size: int) -> ImportJob:
+                job_importer, job_keywords = scan_importers[
+                    Path(filepath).suffix.lower()
+                ]
+                return ImportJob(
+                    job_importer, filepath, job_keywords, file_size=file_size
+                )
+
+            scanner = SourceScanner(sources, tuple(scan_importers), make_scanned_job)
+            import_job_queue.add_scanner(scanner)
+
+        if jobs or sources:
+            start_import_queue()
+
 
 class DDIMPORT_OT_built_in_import(
     DDIMPORT_ImportOperatorBase, DDIMPORT_BuiltInPropertyGroup
@@ -1039,13 +2178,15 @@ class DDIMPORT_OT_built_in_import(
     bl_idname = "ddimport.built_in_import"
     bl_label = "Built-In Import"
     bl_description = ""
-    bl_options = {"UNDO", "INTERNAL", "PRESET"}
+    bl_options = {"INTERNAL", "PRESET"}
 
     # ----------------------------------------------------------
     #    for File Handler
     # ----------------------------------------------------------
     directory: bpy.props.StringProperty(subtype="FILE_PATH", options={"SKIP_SAVE"})
     files: bpy.props.StringProperty(options={"SKIP_SAVE"})
+    # 走査するフォルダとアーカイブのパス (改行区切り)
+    sources: bpy.props.StringProperty(options={"SKIP_SAVE"})
 
     # ----------------------------------------------------------
     #    for UI
@@ -1082,7 +2223,8 @@ class DDIMPORT_OT_built_in_import(
     def invoke(self, context, event):
         logger.debug("Invoke")
         # オペレーターに対応するプロパティグループの値を取得する
-        parameters_dict = self.get_parameters_as_dict()
+        with tracer.span("collect_parameters", source="popup"):
+            parameters_dict = self.get_parameters_as_dict()
         # 取得した値をオペレーターのプロパティに値を瀬とする
         self.set_parameters(self, parameters_dict)
         return context.window_manager.invoke_props_dialog(self, width=360)
@@ -1251,36 +2393,32 @@ class DDIMPORT_OT_built_in_import(
 
     def execute(self, context):
         # ポップアップUIを表示しない場合はPreferenceからパラメーターを取得する
-        if get_addon_preferences().show_popup:
-            ignore_props = (
-                "filter_glob",
-                "directory",
-                "ui_tab",
-                "filepath",
-                "files",
-                "expand_include",
-                "expand_transform",
-                "expand_orientation",
-                "expand_animation",
-                "expand_armature",
-            )
-            # オペレーターのプロパティの値をWindowManagerのプロパティグループに保存する
-            operator_parameters = self.as_keywords(ignore=ignore_props)
-            built_in_property_group = get_wm_built_in_property_group()
-            for k, v in operator_parameters.items():
-                setattr(built_in_property_group, k, v)
-            keywords = operator_parameters
-        else:
-            keywords = get_auto_import_parameters()
-
-        # File Handlerから受け取ったファイル名の文字列からファイルパスを生成する
-        file_list = self.gen_source_file_list(self.files)
-        for i in file_list:
-            file_path = self.gen_source_file_path(self.directory, i)
-
-            # オペレーターのプロパティグループを引数としてインポートオペレーターを呼び出す
-            bpy.ops.import_scene.fbx(filepath=file_path, **keywords)
-            logger.debug(f'Load Complete\n{"":#<70}')
+        with tracer.span("collect_parameters", importer=IMPORTER_BUILT_IN):
+            if get_addon_preferences().show_popup:
+                ignore_props = (
+                    "filter_glob",
+                    "directory",
+                    "ui_tab",
+                    "filepath",
+                    "files",
+                    "sources",
+                    "expand_include",
+                    "expand_transform",
+                    "expand_orientation",
+                    "expand_animation",
+                    "expand_armature",
+                )
+                # オペレーターのプロパティの値をWindowManagerのプロパティグループに保存する
+                operator_parameters = self.as_keywords(ignore=ignore_props)
+                built_in_property_group = get_wm_built_in_property_group()
+                for k, v in operator_parameters.items():
+                    setattr(built_in_property_group, k, v)
+                keywords = operator_parameters
+            else:
+                keywords = get_auto_import_parameters()
+
+        # File Handlerから受け取ったファイルをインポートキューに追加する
+        self.enqueue_import_jobs(IMPORTER_BUILT_IN, keywords)
 
         return {"FINISHED"}
 
@@ -1291,13 +2429,15 @@ class DDIMPORT_OT_better_fbx_import(
     bl_idname = "ddimport.better_fbx_import"
     bl_label = "Better FBX Import"
     bl_description = ""
-    bl_options = {"UNDO", "INTERNAL", "PRESET"}
+    bl_options = {"INTERNAL", "PRESET"}
 
     # ----------------------------------------------------------
     #    for File Handler
     # ----------------------------------------------------------
     directory: bpy.props.StringProperty(subtype="FILE_PATH", options={"SKIP_SAVE"})
     files: bpy.props.StringProperty(options={"SKIP_SAVE"})
+    # 走査するフォルダとアーカイブのパス (改行区切り)
+    sources: bpy.props.StringProperty(options={"SKIP_SAVE"})
 
     # ----------------------------------------------------------
     #    Operator Method
@@ -1305,7 +2445,8 @@ class DDIMPORT_OT_better_fbx_import(
     def invoke(self, context, event):
         logger.debug("Invoke")
         # オペレーターに対応するプロパティグループの値を取得する
-        parameters_dict = self.get_parameters_as_dict()
+        with tracer.span("collect_parameters", source="popup"):
+            parameters_dict = self.get_parameters_as_dict()
         # 取得した値をオペレーターのプロパティに値を瀬とする
         self.set_parameters(self, parameters_dict)
         return context.window_manager.invoke_props_dialog(self, width=360)
@@ -1381,28 +2522,24 @@ class DDIMPORT_OT_better_fbx_import(
         box.prop(self, "my_edge_crease_scale")
 
     def execute(self, context):
-        if get_addon_preferences().show_popup:
-            ignore_props = (
-                "directory",
-                "files",
-            )
-            # オペレーターのプロパティの値をWindowManagerのプロパティグループに保存する
-            operator_parameters = self.as_keywords(ignore=ignore_props)
-            better_fbx_property_group = get_wm_better_fbx_property_group()
-            for k, v in operator_parameters.items():
-                setattr(better_fbx_property_group, k, v)
-            keywords = self.as_keywords(ignore=ignore_props)
-        else:
-            keywords = get_auto_import_parameters()
-
-        # File Handlerから受け取ったファイル名の文字列からファイルパスを生成する
-        file_list = self.gen_source_file_list(self.files)
-        for i in file_list:
-            file_path = self.gen_source_file_path(self.directory, i)
-
-            # オペレーターのプロパティグループを引数としてインポートオペレーターを呼び出す
-            bpy.ops.better_import.fbx(filepath=file_path, **keywords)
-            logger.debug(f'Load Complete\n{"":#<70}')
+        with tracer.span("collect_parameters", importer=IMPORTER_BETTER_FBX):
+            if get_addon_preferences().show_popup:
+                ignore_props = (
+                    "directory",
+                    "files",
+                    "sources",
+                )
+                # オペレーターのプロパティの値をWindowManagerのプロパティグループに保存する
+                operator_parameters = self.as_keywords(ignore=ignore_props)
+                better_fbx_property_group = get_wm_better_fbx_property_group()
+                for k, v in operator_parameters.items():
+                    setattr(better_fbx_property_group, k, v)
+                keywords = self.as_keywords(ignore=ignore_props)
+            else:
+                keywords = get_auto_import_parameters()
+
+        # File Handlerから受け取ったファイルをインポートキューに追加する
+        self.enqueue_import_jobs(IMPORTER_BETTER_FBX, keywords)
 
         return {"FINISHED"}
 
@@ -1411,26 +2548,797 @@ class DDIMPORT_OT_vrm_import(DDIMPORT_ImportOperatorBase):
     bl_idname = "ddimport.vrm"
     bl_label = "VRM Import"
     bl_description = ""
-    bl_options = {"UNDO", "INTERNAL", "PRESET"}
+    bl_options = {"INTERNAL", "PRESET"}
 
     # ----------------------------------------------------------
     #    for File Handler
     # ----------------------------------------------------------
     directory: bpy.props.StringProperty(subtype="FILE_PATH", options={"SKIP_SAVE"})
     files: bpy.props.StringProperty(options={"SKIP_SAVE"})
+    # 走査するフォルダとアーカイブのパス (改行区切り)
+    sources: bpy.props.StringProperty(options={"SKIP_SAVE"})
 
     # ----------------------------------------------------------
     #    Operator Method
     # ----------------------------------------------------------
 
     def execute(self, context):
-        # File Handlerから受け取ったファイル名の文字列からファイルパスを生成する
-        file_list = self.gen_source_file_list(self.files)
-        for i in file_list:
-            file_path = self.gen_source_file_path(self.directory, i)
-            bpy.ops.import_scene.vrm(filepath=file_path, use_addon_preferences=True)
-            logger.debug(f'Load Complete\n{"":#<70}')
+        # File Handlerから受け取ったファイルをインポートキューに追加する
+        self.enqueue_import_jobs(IMPORTER_VRM, VRM_KEYWORDS, (".vrm",))
+
+        return {"FINISHED"}
+
+
+def draw_import_queue_status(header, context):
+    layout = header.layout
+    layout.label(text="", icon="IMPORT")
+    layout.progress(
+        factor=import_job_queue.progress,
+        type="BAR",
+        text=f"D&D Import  {import_job_queue.done} / {import_job_queue.total}",
+    )
+    if import_job_queue.is_scanning:
+        layout.separator(factor=2.0)
+        layout.label(text="Scanning", icon="VIEWZOOM")
+    if import_job_queue.is_paused:
+        layout.separator(factor=2.0)
+        layout.label(text=import_job_queue.paused_reason, icon="PAUSE")
+    layout.separator(factor=2.0)
+    layout.label(text="Cancel", icon="EVENT_ESC")
+
+
+class DDIMPORT_OT_run_import_queue(bpy.types.Operator):
+    bl_idname = "ddimport.run_import_queue"
+    bl_label = "Run Import Queue"
+    bl_description = ""
+    # バッチ全体で1つのアンドゥステップにするため､終了時に手動でアンドゥをプッシュする
+    bl_options = {"INTERNAL"}
+
+    _timer = None
+    _worker_pool: WorkerPool | None = None
+    _import_cache = None
+    _asset_library = None
+    _use_library_override: bool = False
+    _use_undo: bool = True
+    _staging: BatchStaging | None = None
+    _use_direct_fbx_load: bool = False
+    _memory_watchdog: MemoryWatchdog | None = None
+    _use_memory_governor: bool = False
+    _use_reimport: bool = False
+    _use_file_namespace: bool = False
+    # インスタンス化の際にインポート元を参照するため､インポート元を記録する
+    _record_provenance: bool = False
+    _instance_type: str = ""
+    # バッチの開始前から存在していたデータブロック {bpy.dataの属性名: session_uid}｡
+    # パージで解放されたデータブロックを参照し続けないよう､IDではなく番号を保持する
+    _existing_ids: dict[str, set[int]] = {}
+    _texture_index: TextureIndex | None = None
+    _texture_preload_threads: int = 0
+    _texture_proxy_size: int = 0
+    # チャンクのファイル数 (0はチャンクに分けない) と現在のチャンクで完了したファイル数
+    _chunk_file_count: int = 0
+    _chunk_done: int = 0
+    # 現在のチャンクで完了したジョブの一時的なメモリの見積もりの合計
+    _chunk_transient: int = 0
+    _chunk_index: int = 0
+    _checkpoint_template: Path | None = None
+    _last_checkpoint: Path | None = None
+    _imported_files: list[str] = []
+
+    # ----------------------------------------------------------
+    #    Operator Method
+    # ----------------------------------------------------------
+    def invoke(self, context, event):
+        # 既にキューが処理中であれば追加されたジョブはそちらで処理される
+        if import_job_queue.is_running:
+            return {"CANCELLED"}
+
+        self.begin_batch(context)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        self.update_progress(context)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        # バックグラウンドモードなどモーダルで処理できない場合はキューを同期的に全て処理する
+        if import_job_queue.is_running:
+            return {"CANCELLED"}
+
+        self.begin_batch(context)
+        while not self.process_step_safely(context):
+            # 一時停止しても再開を待つ手段が無いため残りのジョブを中止する
+            if import_job_queue.is_paused:
+                discarded = self.discard_pending_jobs()
+                self.report(
+                    {"ERROR"},
+                    f"{import_job_queue.paused_reason} : {discarded} files skipped",
+                )
+                break
+            if self._worker_pool is not None:
+                time.sleep(0.05)
+            elif import_job_queue.is_scanning and not len(import_job_queue):
+                time.sleep(0.01)
+        return self.finish(context)
+
+    def modal(self, context, event):
+        # ファイル単位でのみキャンセルを受け付ける
+        if event.type == "ESC" and event.value == "PRESS":
+            discarded = self.discard_pending_jobs()
+            self.report({"WARNING"}, f"Import Cancelled : {discarded} files skipped")
+            return self.finish(context)
+
+        # タイマーイベント以外はUIが応答できるようにそのまま通す
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        if self.process_step_safely(context):
+            return self.finish(context)
+
+        self.update_progress(context)
+        return {"RUNNING_MODAL"}
+
+    def discard_pending_jobs(self) -> int:
+        # 未処理のジョブと実行中のワーカーを破棄し､破棄した件数を返す
+        discarded = import_job_queue.clear()
+        if self._worker_pool is not None:
+            cancelled = self._worker_pool.cancel()
+            import_job_queue.discard(cancelled)
+            discarded += cancelled
+        return discarded
+
+    def process_step_safely(self, context) -> bool:
+        # ジョブ以外の処理で例外が起きた場合は残りを破棄してバッチを終了させる
+        try:
+            return self.process_step(context)
+        except Exception:
+            logger.exception("Import queue stopped by an unexpected error")
+            discarded = self.discard_pending_jobs()
+            self.report(
+                {"ERROR"},
+                f"Import queue stopped by an error : {discarded} files skipped",
+            )
+            return True
+
+    def begin_batch(self, context):
+        import_job_queue.begin()
+        addon_pref = get_addon_preferences()
+        self._timer = None
+        self._use_undo = True
+        # ライブラリからリンクする場合は変換をワーカーで行い､.blendはライブラリに保存する
+        if addon_pref.execution_mode == "WORKERS" or addon_pref.use_library_link:
+            self._worker_pool = WorkerPool(
+                bpy.app.binary_path,
+                addon_pref.worker_count,
+                addon_pref.worker_memory_limit,
+            )
+        else:
+            self._worker_pool = None
+        if addon_pref.use_library_link:
+            self._asset_library = get_asset_library()
+            self._use_library_override = addon_pref.use_library_override
+        else:
+            self._asset_library = None
+        if addon_pref.use_import_cache and not addon_pref.use_library_link:
+            self._import_cache = get_import_cache()
+        else:
+            self._import_cache = None
+        self._use_direct_fbx_load = (
+            addon_pref.use_direct_fbx_load and direct_fbx_loader.is_available()
+        )
+        if addon_pref.use_batch_staging:
+            self._staging = BatchStaging(context)
+        else:
+            self._staging = None
+        if addon_pref.memory_ceiling:
+            self._memory_watchdog = MemoryWatchdog(addon_pref.memory_ceiling * 1024**2)
+        else:
+            self._memory_watchdog = None
+        self._use_memory_governor = addon_pref.use_memory_governor
+        self._use_reimport = addon_pref.use_reimport
+        self._chunk_file_count = addon_pref.chunk_file_count
+        self._chunk_done = 0
+        self._chunk_transient = 0
+        self._chunk_index = 0
+        self._last_checkpoint = None
+        self._imported_files = []
+        if addon_pref.use_checkpoint and addon_pref.checkpoint_path:
+            self._checkpoint_template = Path(
+                bpy.path.abspath(addon_pref.checkpoint_path)
+            )
+        elif addon_pref.use_checkpoint:
+            self._checkpoint_template = default_checkpoint_path
+        else:
+            self._checkpoint_template = None
+        self._use_file_namespace = addon_pref.use_file_namespace
+        self._record_provenance = addon_pref.use_reimport or addon_pref.use_instancing
+        self._existing_ids = {}
+        if addon_pref.use_material_deduplication:
+            self._existing_ids["materials"] = get_session_uids(bpy.data.materials)
+            self._existing_ids["images"] = get_session_uids(bpy.data.images)
+        if addon_pref.use_mesh_deduplication:
+            self._existing_ids["meshes"] = get_session_uids(bpy.data.meshes)
+        if addon_pref.use_instancing:
+            self._instance_type = addon_pref.instance_type
+            self._existing_ids["objects"] = get_session_uids(bpy.data.objects)
+        else:
+            self._instance_type = ""
+        if addon_pref.use_texture_index:
+            # 索引は更新日時が変わったフォルダだけを走査し直す
+            with tracer.span("refresh_texture_index"):
+                self._texture_index = get_texture_index()
+                self._texture_index.refresh()
+            self._existing_ids["images"] = get_session_uids(bpy.data.images)
+        else:
+            self._texture_index = None
+        if addon_pref.use_texture_proxy:
+            self._texture_proxy_size = int(addon_pref.texture_proxy_size)
+            self._existing_ids.setdefault("images", get_session_uids(bpy.data.images))
+        else:
+            self._texture_proxy_size = 0
+        if addon_pref.use_texture_preload:
+            self._texture_preload_threads = addon_pref.texture_preload_threads
+            self._existing_ids.setdefault("images", get_session_uids(bpy.data.images))
+        else:
+            self._texture_preload_threads = 0
+
+    def process_step(self, context) -> bool:
+        # 1ステップ分の処理を行い､全てのジョブが完了した場合はTrueを返す
+        self.check_undo_threshold()
+        if self.check_memory_ceiling():
+            return False
+        if self._use_memory_governor:
+            import_job_queue.collect_scanned_jobs(self.preflight_scanned_jobs)
+        else:
+            import_job_queue.collect_scanned_jobs()
+
+        # バッチ中にアクティブなコレクションが変更されてもステージングへインポートする
+        if self._staging is not None:
+            self._staging.activate()
+
+        if self._worker_pool is not None:
+            return self.process_worker_pool(context)
+
+        job = import_job_queue.pop_job()
+        if job is None:
+            # 走査中であれば次のファイルが見つかるまで待つ
+            return not import_job_queue.is_scanning
+
+        # 1ステップにつき1ファイルだけインポートする
+        start_time = time.perf_counter()
+        try:
+            with tracer.span(
+                "import_file",
+                track_datablocks=True,
+                file=job.file_name,
+                importer=job.importer,
+            ) as span:
+                if span:
+                    span.set(file_size=job.file_size or get_file_size(job.filepath))
+                self.import_job_in_session(context, job)
+            is_succeeded = True
+        except Exception:
+            logger.exception("Failed to import %s", job.filepath)
+            self.report({"ERROR"}, f"Failed to import {job.file_name}")
+            is_succeeded = False
+        elapsed = time.perf_counter() - start_time
+        self.complete_job(job, is_succeeded, elapsed)
+        logger.debug(
+            "Load Complete : %s (%.3f sec, %d objects in scene)",
+            job.file_name,
+            elapsed,
+            len(context.scene.objects),
+        )
+        return False
+
+    def lookup_import_cache(self, context, job: ImportJob) -> bool:
+        # キャッシュにヒットした場合はインポートせずに.blendからアペンドする
+        if self._import_cache is None:
+            return False
+        job.cache_key = self._import_cache.make_key(
+            job.filepath, job.importer, job.keywords
+        )
+        cached_path = self._import_cache.lookup(job.cache_key)
+        if cached_path is None:
+            return False
+        logger.debug("Import cache hit : %s", job.file_name)
+        appended_objects = append_objects_from_blend(cached_path, context.collection)
+        if self._record_provenance:
+            record_provenance(appended_objects, job.source_path)
+        return True
+
+    def lookup_asset_library(self, context, job: ImportJob) -> bool:
+        # 変換済みのファイルはワーカーを起動せずにリンクする
+        job.cache_key = self._asset_library.make_asset_key(
+            job.filepath, job.source_path, job.importer, job.keywords
+        )
+        job.asset_collection = get_asset_collection_name(job.source_path)
+        asset_path = self._asset_library.lookup(job.cache_key)
+        if asset_path is None:
+            return False
+        logger.debug("Asset library hit : %s", job.file_name)
+        self.link_library_asset(context, job, asset_path)
+        return True
+
+    def link_library_asset(self, context, job: ImportJob, asset_path: str):
+        with tracer.span(
+            "link_asset",
+            track_datablocks=True,
+            file=job.file_name,
+            override=self._use_library_override,
+        ):
+            linked = link_asset(
+                context,
+                asset_path,
+                job.asset_collection,
+                context.collection,
+                self._use_library_override,
+            )
+        if linked is None:
+            raise RuntimeError(f"Failed to link {asset_path}")
+
+    def execute_job(self, context, job: ImportJob):
+        prepared_keywords = None
+        if self._use_direct_fbx_load and job.importer == IMPORTER_BUILT_IN:
+            prepared_keywords = direct_fbx_loader.prepare_keywords(job.keywords)
+            # シグネチャが一致しない場合は以降のジョブもオペレーターでインポートする
+            self._use_direct_fbx_load = prepared_keywords is not None
+        if prepared_keywords is None:
+            execute_import_job(job)
+            return
+
+        # Built-In Importerはオペレーターを経由せずにload関数を直接呼び出す｡
+        # ファイル毎のエラーはジョブの失敗として呼び出し元へ送出する
+        direct_fbx_loader.load(self, context, job.filepath, prepared_keywords)
+
+    def prepare_job(self, job: ImportJob):
+        # アーカイブ内のファイルはインポートの直前に展開する
+        job.filepath = resolve_import_path(job.filepath)
+        # 見つからないテクスチャはバッチの終了時に索引から探すため､インポーターには探させない
+        if (
+            self._texture_index is not None
+            and job.importer == IMPORTER_BUILT_IN
+            and job.keywords.get("use_image_search")
+        ):
+            job.keywords = {**job.keywords, "use_image_search": False}
+
+    def import_job_in_session(self, context, job: ImportJob):
+        self.prepare_job(job)
+        if not (self._use_reimport or job.reimport):
+            self.load_new_job(context, job, self._record_provenance)
+            return
+
+        tracked_objects = find_tracked_objects(job.source_path)
+        if not tracked_objects:
+            self.load_new_job(context, job, True)
+            return
+
+        if not is_source_changed(tracked_objects, job.source_path):
+            logger.info("Skip unchanged file : %s", job.source_path)
+            return
+        with tracer.span("reimport", file=job.file_name) as span:
+            reimport = InPlaceReimport(context, job.source_path, tracked_objects)
+            result = reimport.run(lambda: self.load_job(context, job))
+            if span:
+                span.set(
+                    replaced_meshes=result.replaced_meshes,
+                    skipped_meshes=result.skipped_meshes,
+                )
+        self.report({"INFO"}, f"Re-import {job.file_name} : {result.describe()}")
+
+    def load_new_job(self, context, job: ImportJob, record: bool):
+        with self.file_namespace(context, job.source_path):
+            if not record:
+                self.load_job(context, job)
+                return
+            # 再インポートで照合できるように接頭辞を付ける前の名前を記録する
+            snapshot = DatablockSnapshot()
+            self.load_job(context, job)
+            record_provenance(snapshot.get_new_objects(), job.source_path)
+
+    def file_namespace(self, context, source_path: str):
+        # 1ファイルだけのバッチでは他のファイルと名前が衝突しないため名前を変更しない
+        if not self._use_file_namespace or (
+            import_job_queue.total <= 1 and not import_job_queue.is_scanning
+        ):
+            return contextlib.nullcontext()
+        return FileNamespace(context, get_namespace_prefix(source_path))
+
+    def load_job(self, context, job: ImportJob):
+        if self.lookup_import_cache(context, job):
+            return
+
+        if self._import_cache is None:
+            self.execute_job(context, job)
+            return
+
+        snapshot = DatablockSnapshot()
+        self.execute_job(context, job)
+        self._import_cache.store_datablocks(
+            job.cache_key, snapshot.get_new_datablocks(), job.filepath
+        )
+
+    def process_worker_pool(self, context):
+        # キューに積まれたジョブは全てワーカープールへ渡し､プール側で大きいファイルから処理する
+        while (job := import_job_queue.pop_job()) is not None:
+            # 再インポートは既存のオブジェクトと照合するためメインのセッションで処理する
+            if (self._use_reimport or job.reimport) and find_tracked_objects(
+                job.source_path
+            ):
+                start_time = time.perf_counter()
+                try:
+                    self.import_job_in_session(context, job)
+                    is_succeeded = True
+                except Exception:
+                    logger.exception("Failed to import %s", job.filepath)
+                    self.report({"ERROR"}, f"Failed to import {job.file_name}")
+                    is_succeeded = False
+                self.complete_job(job, is_succeeded, time.perf_counter() - start_time)
+                continue
+            try:
+                self.prepare_job(job)
+                if self._asset_library is not None:
+                    is_cache_hit = self.lookup_asset_library(context, job)
+                else:
+                    is_cache_hit = self.lookup_import_cache(context, job)
+            except Exception:
+                logger.exception("Failed to read %s", job.filepath)
+                self.report({"ERROR"}, f"Failed to import {job.file_name}")
+                self.complete_job(job, False)
+                continue
+            if is_cache_hit:
+                self.complete_job(job)
+                continue
+            self._worker_pool.submit(job)
+
+        # 変換が完了したファイルをメインのセッションにアペンドする
+        for result in self._worker_pool.poll():
+            if result.is_succeeded:
+                try:
+                    self.load_worker_result(context, result)
+                    is_succeeded = True
+                except Exception:
+                    logger.exception("Failed to load %s", result.output_path)
+                    self.report({"ERROR"}, f"Failed to import {result.job.file_name}")
+                    is_succeeded = False
+            else:
+                logger.error(
+                    "Failed to import %s (exit code %s)\n%s",
+                    result.job.filepath,
+                    result.returncode,
+                    result.read_log_tail(),
+                )
+                self.report({"ERROR"}, f"Failed to import {result.job.file_name}")
+                is_succeeded = False
+            self.complete_job(result.job, is_succeeded, result.elapsed)
+            logger.debug(
+                "Load Complete : %s (%.3f sec in worker)",
+                result.job.file_name,
+                result.elapsed,
+            )
+
+        return self._worker_pool.is_idle and not import_job_queue.is_scanning
+
+    def load_worker_result(self, context, result: WorkerResult):
+        if self._asset_library is not None:
+            asset_path = self._asset_library.store_file(
+                result.job.cache_key, result.output_path, result.job.source_path
+            )
+            self.link_library_asset(context, result.job, asset_path)
+            return
+
+        blend_path = result.output_path
+        if self._import_cache is not None:
+            blend_path = self._import_cache.store_file(
+                result.job.cache_key, blend_path, result.job.filepath
+            )
+        with (
+            tracer.span(
+                "append_worker_result",
+                track_datablocks=True,
+                file=result.job.file_name,
+                importer=result.job.importer,
+                worker_time=result.elapsed,
+            ),
+            self.file_namespace(context, result.job.source_path),
+        ):
+            appended_objects = append_objects_from_blend(blend_path, context.collection)
+            if self._record_provenance:
+                record_provenance(appended_objects, result.job.source_path)
+
+    def check_undo_threshold(self):
+        # バッチのファイル数またはサイズが閾値を超えた場合はアンドゥのプッシュを行わない
+        if not self._use_undo:
+            return
+        addon_pref = get_addon_preferences()
+        file_count_limit = addon_pref.undo_file_count_limit
+        size_limit = addon_pref.undo_size_limit * 1024**2
+        if (file_count_limit and import_job_queue.total > file_count_limit) or (
+            size_limit and import_job_queue.total_bytes > size_limit
+        ):
+            self._use_undo = False
+            self.report(
+                {"WARNING"},
+                "Undo is disabled for this large import batch. It can not be undone",
+            )
+
+    def preflight_scanned_jobs(self, jobs: list[ImportJob]) -> bool:
+        # 走査で見つかったジョブもキューに追加する前に見積もる
+        plan = preflight_import_jobs(jobs)
+        if plan.is_refused:
+            self.report({"ERROR"}, f"{plan.describe()} : {len(jobs)} files skipped")
+            return False
+        return True
+
+    def check_memory_ceiling(self) -> bool:
+        # RSSが上限を超えている間はキューを一時停止し､停止中であればTrueを返す
+        if self._memory_watchdog is None:
+            return False
+        was_paused = import_job_queue.is_paused
+        is_tripped = self._memory_watchdog.check()
+        if self._memory_watchdog.is_expired:
+            # 待っても下がらない場合は残りのジョブを中止し､インポート済みのデータでバッチを終える
+            self._memory_watchdog = None
+            import_job_queue.paused_reason = ""
+            discarded = self.discard_pending_jobs()
+            self.report(
+                {"ERROR"},
+                f"Import aborted: memory stayed above "
+                f"{get_addon_preferences().memory_ceiling} MB : {discarded} files skipped",
+            )
+            return False
+        if is_tripped:
+            import_job_queue.paused_reason = (
+                f"Paused: memory above {get_addon_preferences().memory_ceiling} MB"
+            )
+            if not was_paused:
+                self.report({"WARNING"}, import_job_queue.paused_reason)
+        else:
+            import_job_queue.paused_reason = ""
+        return import_job_queue.is_paused
+
+    def complete_job(
+        self, job: ImportJob, is_succeeded: bool = True, elapsed: float = 0.0
+    ):
+        import_job_queue.complete_job(job, is_succeeded, elapsed)
+        if is_succeeded:
+            self._imported_files.append(job.source_path)
+        self._chunk_done += 1
+        self._chunk_transient += job.transient_memory
+        # メモリの見積もりで決めた量か､設定したファイル数に達した時点でチャンクを区切る
+        chunk_transient = import_job_queue.chunk_transient
+        if (chunk_transient and self._chunk_transient >= chunk_transient) or (
+            self._chunk_file_count and self._chunk_done >= self._chunk_file_count
+        ):
+            self.end_chunk()
+
+    def end_chunk(self):
+        # チャンクの間で孤立データを削除し､次のチャンクのためにメモリを空ける
+        self._chunk_done = 0
+        self._chunk_transient = 0
+        self._chunk_index += 1
+        with tracer.span("purge_orphans"):
+            purge_orphans()
+        # 残りのファイルがある場合のみチェックポイントを保存する
+        if self._checkpoint_template is None or not (
+            import_job_queue.done < import_job_queue.total
+            or import_job_queue.is_scanning
+        ):
+            return
+        checkpoint_path = get_checkpoint_path(
+            self._checkpoint_template, self._chunk_index
+        )
+        with tracer.span("save_checkpoint", chunk=self._chunk_index):
+            is_saved = save_checkpoint(checkpoint_path, self._imported_files)
+        if not is_saved:
+            self.report({"WARNING"}, f"Failed to save checkpoint {checkpoint_path}")
+            return
+        # クラッシュ時に失うのは最後のチェックポイント以降のチャンクだけのため､古いものは削除する
+        if self._last_checkpoint is not None:
+            remove_checkpoint(self._last_checkpoint)
+        self._last_checkpoint = checkpoint_path
+
+    def resolve_imported_textures(self):
+        imported_images = self.get_imported_datablocks("images")
+        with tracer.span("resolve_textures", images=len(imported_images)) as span:
+            resolved, missing = resolve_missing_images(
+                imported_images, self._texture_index
+            )
+            if span:
+                span.set(resolved=resolved, missing=missing)
+        self._texture_index = None
+        if missing:
+            self.report({"WARNING"}, f"{missing} textures not found")
+
+    def get_imported_datablocks(self, data_name: str) -> list[bpy.types.ID]:
+        existing = self._existing_ids[data_name]
+        return [
+            d for d in getattr(bpy.data, data_name) if d.session_uid not in existing
+        ]
+
+    def deduplicate_imported_datablocks(self):
+        # マテリアルをまとめてからメッシュを比較すると､マテリアルの複製を持つメッシュもまとめられる
+        if "materials" in self._existing_ids:
+            imported_materials = self.get_imported_datablocks("materials")
+            with tracer.span(
+                "consolidate_materials", materials=len(imported_materials)
+            ) as span:
+                result = consolidate_materials(
+                    imported_materials, self.get_imported_datablocks("images")
+                )
+                if span:
+                    span.set(
+                        merged_images=result.merged_images,
+                        merged_materials=result.merged_materials,
+                    )
+            if result.merged_images or result.merged_materials:
+                self.report({"INFO"}, result.describe())
+
+        if "meshes" in self._existing_ids:
+            imported_meshes = self.get_imported_datablocks("meshes")
+            with tracer.span("deduplicate_meshes", meshes=len(imported_meshes)) as span:
+                result = deduplicate_meshes(imported_meshes)
+                if span:
+                    span.set(
+                        merged=result.merged,
+                        reclaimed_bytes=result.reclaimed_bytes,
+                        vertices=result.hashed_vertices,
+                    )
+            if result.merged:
+                self.report({"INFO"}, result.describe())
+
+    def instance_imported_objects(self, context):
+        imported_objects = self.get_imported_datablocks("objects")
+        with tracer.span("instance_objects", objects=len(imported_objects)) as span:
+            result = instance_identical_objects(
+                context, imported_objects, self._instance_type
+            )
+            if span:
+                span.set(
+                    instances=result.instances,
+                    removed_objects=result.removed_objects,
+                    reclaimed_bytes=result.reclaimed_bytes,
+                )
+        if result.instances:
+            self.report({"INFO"}, result.describe())
+
+    def apply_imported_texture_proxies(self):
+        imported_images = self.get_imported_datablocks("images")
+        with tracer.span("texture_proxies", images=len(imported_images)) as span:
+            result = apply_texture_proxies(
+                imported_images,
+                get_texture_proxy_cache(),
+                self._texture_proxy_size,
+                bpy.app.binary_path,
+                get_addon_preferences().worker_count,
+            )
+            if span:
+                span.set(
+                    reused=result.reused, built=result.built, building=result.building
+                )
+        if result.images:
+            self.report({"INFO"}, result.describe())
+        if result.failed:
+            self.report({"WARNING"}, f"Failed to build {result.failed} texture proxies")
+
+    def prefetch_imported_textures(self):
+        # 重複をまとめた後に残った画像だけを読み込み､作成中のプロキシに差し替わる画像は読まない
+        building_uids = get_building_image_uids()
+        imported_images = [
+            image
+            for image in self.get_imported_datablocks("images")
+            if image.session_uid not in building_uids
+        ]
+        with tracer.span("prefetch_textures", images=len(imported_images)) as span:
+            result = prefetch_images(
+                imported_images,
+                self._texture_preload_threads,
+                upload_to_gpu=not bpy.app.background,
+            )
+            if span:
+                span.set(
+                    total_bytes=result.total_bytes,
+                    read_throughput=result.read_throughput,
+                    decode_time=result.decode_time,
+                    decode_throughput=result.decode_throughput,
+                    decode_pixel_rate=result.decode_pixel_rate,
+                )
+        if result.images:
+            self.report({"INFO"}, result.describe())
+
+    def update_progress(self, context):
+        # ステージング中はジョブ毎に再描画せず､一定の間隔でまとめて表示を更新する
+        if self._staging is not None and not self._staging.should_redraw():
+            return
+        context.window_manager.progress_update(import_job_queue.progress * 100)
+        context.workspace.status_text_set(draw_import_queue_status)
+
+    def release_batch_resources(self):
+        # 途中で例外が起きても2度解放しないように､解放する前に参照を外す
+        worker_pool, self._worker_pool = self._worker_pool, None
+        if worker_pool is not None:
+            worker_pool.cleanup()
+        import_cache, self._import_cache = self._import_cache, None
+        if import_cache is not None:
+            import_cache.save_index()
+        library, self._asset_library = self._asset_library, None
+        if library is not None:
+            library.save_index()
+        archive_reader.close()
+        staging, self._staging = self._staging, None
+        if staging is not None:
+            start_time = time.perf_counter()
+            staged = staging.commit()
+            logger.debug(
+                "Commit Staging : %d objects (%.3f sec)",
+                staged,
+                time.perf_counter() - start_time,
+            )
 
+    def run_post_stages(self, context):
+        # パスを解決してから画像をまとめると､同じファイルを指すようになった画像もまとめられる
+        stages = []
+        if self._texture_index is not None:
+            stages.append(self.resolve_imported_textures)
+        if self._existing_ids:
+            stages.append(self.deduplicate_imported_datablocks)
+        # マテリアルとメッシュをまとめた後の方が同じオブジェクトとして見つかりやすい
+        if self._instance_type:
+            stages.append(lambda: self.instance_imported_objects(context))
+        if self._texture_proxy_size:
+            stages.append(self.apply_imported_texture_proxies)
+        if self._texture_preload_threads:
+            stages.append(self.prefetch_imported_textures)
+        # 1つの処理が失敗しても残りの処理とアンドゥのプッシュは行う
+        for stage in stages:
+            try:
+                stage()
+            except Exception:
+                logger.exception("Post import stage failed")
+                self.report({"ERROR"}, "A post import stage failed. See the log")
+
+    def end_progress(self, context):
+        if self._timer is None:
+            return
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self._timer = None
+
+    def finish(self, context):
+        imported = import_job_queue.done - import_job_queue.failed
+        # 例外が起きてもキューを必ず停止状態に戻し､次のドロップで再び処理できるようにする
+        try:
+            with tracer.span("post_import", files=import_job_queue.done):
+                self.release_batch_resources()
+                self.run_post_stages(context)
+            # 正常に終了したバッチはクラッシュからの再開に使わないため､チェックポイントを消す
+            if self._last_checkpoint is not None:
+                remove_checkpoint(self._last_checkpoint)
+                self._last_checkpoint = None
+        except Exception:
+            logger.exception("Failed to finish the import batch")
+            self.report({"ERROR"}, "Failed to finish the import batch. See the log")
+        finally:
+            self._existing_ids = {}
+            self._texture_index = None
+            self.end_progress(context)
+            import_job_queue.finish()
+
+        # 1ファイルもインポートしていなければアンドゥステップを積まない
+        if imported == 0:
+            return {"CANCELLED"}
+        if self._use_undo:
+            with tracer.span("undo_push") as span:
+                rss_before = get_current_rss() if span else None
+                bpy.ops.ed.undo_push(message="D&D Import")
+                # アンドゥステップのメモリはAPIから取得できないため､プッシュ前後のRSSの差で代用する
+                rss_after = get_current_rss() if span else None
+                if rss_before is not None and rss_after is not None:
+                    span.set(rss_delta=rss_after - rss_before)
+        self.report({"INFO"}, f"Imported {imported} files")
         return {"FINISHED"}
 
 
@@ -1447,34 +3355,35 @@ class DDIMPORT_OT_import(bpy.types.Operator):
 
     fbx_files: list[str] = []
     vrm_files: list[str] = []
+    sources: list[str] = []
 
     @classmethod
     def poll(cls, context):
+        # バックグラウンドモード (ベンチマークなど) ではエリアが存在しない
+        if bpy.app.background:
+            return True
         return context.area and context.area.type == "VIEW_3D"
 
     def execute(self, context):
-        print("")
-        self.fbx_files = []
-        self.fbx_files = []
+        with tracer.span("dispatch", file_count=len(self.files)):
+            return self.dispatch(context)
 
-        logger.debug(self.directory)
-        logger.debug(self.files)
-        for i in self.files.keys():
-            i: str
-            logger.debug(i)
-            extension = i.rsplit(sep=".", maxsplit=1)[1].lower()
-            logger.debug(extension)
-            match extension:
-                case "fbx":
-                    self.fbx_files.append(i)
-                case "vrm":
-                    self.vrm_files.append(i)
+    def dispatch(self, context):
+        self.fbx_files = []
+        self.vrm_files = []
+        self.sources = []
 
         if not self.directory:
             return {"CANCELLED"}
 
+        logger.debug("Dropped %d files : %s", len(self.files), self.directory)
+        self.sources, self.fbx_files, self.vrm_files = classify_dropped_files(
+            self.directory, self.files.keys()
+        )
+        sources = "\n".join(self.sources)
+
         # Better FBXがインストールされていない場合はEnumアイテムを0に設定
-        if not "better_fbx" in get_enabled_addon_list():
+        if not enabled_addon_registry.is_better_fbx_available():
             get_addon_preferences().importer = "0"
 
         # Show Popupの値に応じてExecution Contextを定義する
@@ -1486,28 +3395,84 @@ class DDIMPORT_OT_import(bpy.types.Operator):
             exec_context = "EXEC_DEFAULT"
 
         # Preferenceで選択されたインポーターに応じたオペレーターを実行する｡
-        if self.fbx_files:
-            print(f"\n{'':#>10}\nFBX Import\n{'':#>10}")
+        # フォルダとアーカイブはFBXのオペレーターで1度だけ走査し､VRMも一緒にキューへ追加する
+        if self.fbx_files or self.sources:
+            logger.debug(
+                "FBX Import : %d files, %d sources",
+                len(self.fbx_files),
+                len(self.sources),
+            )
+            if self.fbx_files and addon_pref.use_fbx_inspection:
+                self.inspect_fbx_files()
             match int(selected_importer):
                 case 0:  # Built-In
                     bpy.ops.ddimport.built_in_import(
                         exec_context,
                         directory=self.directory,
                         files=str(self.fbx_files),
+                        sources=sources,
                     )
                 case 1:  # Better FBX
                     bpy.ops.ddimport.better_fbx_import(
                         exec_context,
                         directory=self.directory,
                         files=str(self.fbx_files),
+                        sources=sources,
                     )
 
+        if self.vrm_files and not enabled_addon_registry.is_vrm_available():
+            self.report({"WARNING"}, "VRM Importer is not enabled")
+            self.vrm_files = []
+
         if self.vrm_files:
-            logger.debug(f"\n{'':#>10}\n\VRM Import\n{'':#>10}")
+            logger.debug("VRM Import : %d files", len(self.vrm_files))
             bpy.ops.ddimport.vrm(directory=self.directory, files=str(self.vrm_files))
 
         return {"FINISHED"}
 
+    def inspect_fbx_files(self) -> list[FbxMetadata]:
+        # インポートの前にドロップされた全てのFBXの内容をスレッドプールで集計する
+        filepaths = [str(Path(self.directory, f)) for f in self.fbx_files]
+        with tracer.span("inspect_fbx", file_count=len(filepaths)):
+            metadata_list = read_fbx_metadata_batch(filepaths)
+
+        for metadata in metadata_list:
+            if metadata.error:
+                logger.info(
+                    "Skip inspection %s : %s", metadata.file_name, metadata.error
+                )
+                continue
+            logger.info(
+                "Inspect %s : %d objects, %d meshes, %d vertices, %d polygons, "
+                "%d bones, %d stacks, %d keys, %d bytes media, "
+                "unit scale %s, axis %s (%.2f ms)",
+                metadata.file_name,
+                metadata.objects,
+                metadata.meshes,
+                metadata.vertices,
+                metadata.polygons,
+                metadata.bones,
+                metadata.animation_stacks,
+                metadata.keys,
+                metadata.embedded_media_size,
+                metadata.unit_scale,
+                metadata.axis,
+                metadata.read_time_ms,
+            )
+
+        inspected = [m for m in metadata_list if not m.error]
+        if inspected:
+            self.report(
+                {"INFO"},
+                f"{len(inspected)} FBX : "
+                f"{sum(m.objects for m in inspected)} objects, "
+                f"{sum(m.vertices for m in inspected)} vertices, "
+                f"{sum(m.polygons for m in inspected)} polygons, "
+                f"{sum(m.bones for m in inspected)} bones, "
+                f"{sum(m.keys for m in inspected)} keys",
+            )
+        return metadata_list
+
 
 """---------------------------------------------------------
 ------------------------------------------------------------
@@ -1515,41 +3480,69 @@ class DDIMPORT_OT_import(bpy.types.Operator):
 ------------------------------------------------------------
 ---------------------------------------------------------"""
 CLASSES = (
-    DDIMPORT_WM_built_in_pref_parameters,
-    DDIMPORT_WM_better_fbx_pref_parameters,
-    DDIMPORT_WM_built_in_import_options,
-    DDIMPORT_WM_better_fbx_import_options,
+    DDIMPORT_WM_built_in_options,
+    DDIMPORT_WM_better_fbx_options,
     DDIMPORT_WM_import_options_root,
     DDIMPORT_PREF_addon_preference,
     DDIMPORT_OT_reset_auto_import_parameters,
+    DDIMPORT_OT_clear_import_cache,
+    DDIMPORT_OT_rebuild_texture_index,
+    DDIMPORT_OT_switch_texture_proxies,
+    DDIMPORT_OT_clear_texture_proxy_cache,
+    DDIMPORT_OT_export_trace,
+    DDIMPORT_OT_clear_trace,
+    DDIMPORT_OT_import_folder,
+    DDIMPORT_OT_reimport_changed,
     DDIMPORT_OT_built_in_import,
     DDIMPORT_OT_better_fbx_import,
     DDIMPORT_OT_vrm_import,
+    DDIMPORT_OT_run_import_queue,
     DDIMPORT_OT_import,
     DDIMPORT_FH_import,
 )
 
 
 def register():
+    # ログのリスナーは最初のメッセージが出力された時に起動する
     for cls in CLASSES:
         try:
             bpy.utils.register_class(cls)
         except:
-            logger.debug(f"{cls.__name__} : already registred")
+            logger.debug("%s : already registred", cls.__name__)
+
+    install_addon_hooks()
+    bpy.types.TOPBAR_MT_file_import.append(menu_func_import_folder)
 
     ## Property Group の登録
     bpy.types.WindowManager.ddfbx_importer = bpy.props.PointerProperty(
         type=DDIMPORT_WM_import_options_root
     )
 
-    # デバッグ用
+    # プリファレンスに保存されたトレースとログの設定を反映する
+    try:
+        addon_pref = get_addon_preferences()
+        set_log_level(addon_pref.log_level)
+        tracer.enabled = addon_pref.use_tracing
+        tracer.set_buffer_size(addon_pref.trace_buffer_size)
+        apply_hot_folder_preferences(addon_pref)
+    except KeyError:
+        pass
+
+    # デバッグ用 (debugモジュールは必要な時だけインポートする)
+    # from .debug import launch_debug_server
     # launch_debug_server()
 
 
 def unregister():
+    stop_hot_folder()
+    cancel_proxy_builds()
+    remove_addon_hooks()
+    bpy.types.TOPBAR_MT_file_import.remove(menu_func_import_folder)
     # Property Group の削除
     del bpy.types.WindowManager.ddfbx_importer
     for cls in CLASSES:
         if hasattr(bpy.types, cls.__name__):
             bpy.utils.unregister_class(cls)
-            logger.debug(f"{cls.__name__} unregistred")
+            logger.debug("%s unregistred", cls.__name__)
+
+    stop_log_listener()
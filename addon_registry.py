@@ -0,0 +1,146 @@
+import addon_utils
+import bpy
+
+import functools
+
+from typing import Callable
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+BETTER_FBX_ADDON_NAME = "better_fbx"
+# VRM Add-on for Blenderはインストール方法によってモジュール名が変わる
+VRM_ADDON_NAMES = ("vrm", "io_scene_vrm")
+VRM_ADDON_PREFIX = "vrm_addon_for_blender"
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Registry
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class EnabledAddonRegistry:
+    """
+    有効なアドオンのモジュール名をメモリ上に保持するレジストリ｡
+    アドオンパスの走査は行わず､アドオンの有効化と無効化 (addon_utils.enable/disable) の
+    フックで無効にされた時だけ内容を作り直すため､問い合わせはO(1)で済む｡
+    """
+
+    def __init__(self):
+        # 短縮名 (bl_ext.xxx.better_fbx -> better_fbx) とモジュール名の対応
+        self._enabled_addons: dict[str, str] = {}
+        self._signature: frozenset[str] | None = None
+        self._is_vrm_available: bool = False
+        # 作り直しが行われた回数 (Pythonコンソールからの確認用)
+        self.refresh_count: int = 0
+
+    def _is_stale(self) -> bool:
+        # フックを経由せずに変更された場合に備え､件数の比較も行う (集合は作り直さない)
+        return self._signature is None or len(bpy.context.preferences.addons) != len(
+            self._signature
+        )
+
+    def refresh(self):
+        addons = bpy.context.preferences.addons
+        self._enabled_addons = {
+            module_name.rsplit(".", 1)[-1]: module_name for module_name in addons.keys()
+        }
+        self._signature = frozenset(self._enabled_addons.values())
+        self._is_vrm_available = any(
+            name in VRM_ADDON_NAMES or name.lower().startswith(VRM_ADDON_PREFIX)
+            for name in self._enabled_addons
+        )
+        self.refresh_count += 1
+        logger.debug(
+            "Refresh Enabled Addon Registry : %d addons (refresh count %d)",
+            len(self._signature),
+            self.refresh_count,
+        )
+
+    def invalidate(self):
+        self._signature = None
+
+    def ensure_updated(self):
+        if self._is_stale():
+            self.refresh()
+
+    def is_enabled(self, addon_name: str) -> bool:
+        self.ensure_updated()
+        return addon_name in self._enabled_addons
+
+    def get_module_name(self, addon_name: str) -> str | None:
+        self.ensure_updated()
+        return self._enabled_addons.get(addon_name)
+
+    def get_vrm_module_name(self) -> str | None:
+        self.ensure_updated()
+        for name, module_name in self._enabled_addons.items():
+            if name in VRM_ADDON_NAMES or name.lower().startswith(VRM_ADDON_PREFIX):
+                return module_name
+        return None
+
+    def is_better_fbx_available(self) -> bool:
+        return self.is_enabled(BETTER_FBX_ADDON_NAME)
+
+    def is_vrm_available(self) -> bool:
+        self.ensure_updated()
+        return self._is_vrm_available
+
+    def get_enabled_addon_list(self) -> list[str]:
+        self.ensure_updated()
+        return [*self._enabled_addons]
+
+
+enabled_addon_registry = EnabledAddonRegistry()
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Hooks
+------------------------------------------------------------
+---------------------------------------------------------"""
+# フックを設定する前の addon_utils の関数 {関数名: 関数}
+_original_functions: dict[str, Callable] = {}
+
+
+def _wrap_addon_function(function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            enabled_addon_registry.invalidate()
+
+    return wrapper
+
+
+def install_addon_hooks():
+    # プリファレンスやエクステンションからの有効化と無効化はaddon_utilsを経由する
+    enabled_addon_registry.invalidate()
+    for name in ("enable", "disable"):
+        if name in _original_functions:
+            continue
+        function = getattr(addon_utils, name)
+        _original_functions[name] = function
+        setattr(addon_utils, name, _wrap_addon_function(function))
+
+
+def remove_addon_hooks():
+    for name, function in _original_functions.items():
+        setattr(addon_utils, name, function)
+    _original_functions.clear()
+    enabled_addon_registry.invalidate()
@@ -0,0 +1,133 @@
+import bpy
+
+from pathlib import Path
+from typing import Any
+
+from .import_cache import ImportCache
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# ファイル名に含めるキーのハッシュの長さ
+ASSET_KEY_HASH_LENGTH = 16
+
+
+def get_asset_collection_name(source_path: str) -> str:
+    return bpy.path.clean_name(Path(source_path).stem)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Asset Library
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class AssetLibrary(ImportCache):
+    """
+    ドロップされたファイル毎に変換した.blendを保存する管理されたアセットディレクトリ｡
+    キーはインポートキャッシュと同じくファイルの内容､インポーター､パラメーターから作られ､
+    ファイル名にはインポート元の名前を付けて分かるようにする｡
+    .blendはシーンからリンクされるため､サイズ上限による削除は行わない｡
+    """
+
+    def make_asset_key(
+        self,
+        filepath: str,
+        source_path: str,
+        importer: str,
+        keywords: dict[str, Any],
+    ) -> str:
+        digest = self.make_key(filepath, importer, keywords)[:ASSET_KEY_HASH_LENGTH]
+        return f"{get_asset_collection_name(source_path)}_{digest}"
+
+    def evict(self, reserve: int = 0):
+        return
+
+
+asset_library = AssetLibrary()
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def link_asset(
+    context: bpy.types.Context,
+    filepath: str,
+    collection_name: str,
+    target_collection: bpy.types.Collection,
+    use_override: bool,
+) -> bpy.types.ID | None:
+    """
+    アセットの.blendからコレクションをリンクしてシーンに配置する｡
+    ライブラリオーバーライドを使わない場合はコレクションインスタンスのエンプティで配置し､
+    使う場合は階層ごとオーバーライドを作成して最上位のオブジェクトを編集可能にする｡
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        配置するシーンとビューレイヤーのコンテキスト
+    filepath : str
+        アセットの.blendのパス
+    collection_name : str
+        .blendに含まれるコレクションの名前
+    target_collection : bpy.types.Collection
+        配置先のコレクション
+    use_override : bool
+        ライブラリオーバーライドを作成する
+
+    Returns
+    -------
+    bpy.types.ID | None
+        配置したエンプティまたはオーバーライドのコレクション｡
+        コレクションが見つからない場合はNone
+    """
+
+    with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+        if collection_name in data_from.collections:
+            data_to.collections = [collection_name]
+    linked_collections = [c for c in data_to.collections if c is not None]
+    if not linked_collections:
+        logger.warning("Collection %s not found in %s", collection_name, filepath)
+        return None
+    linked_collection = linked_collections[0]
+
+    if not use_override:
+        instance = bpy.data.objects.new(collection_name, None)
+        instance.instance_type = "COLLECTION"
+        instance.instance_collection = linked_collection
+        target_collection.objects.link(instance)
+        logger.debug("Link %s from %s", collection_name, filepath)
+        return instance
+
+    override = linked_collection.override_hierarchy_create(
+        context.scene, context.view_layer
+    )
+    # オーバーライドはシーンのコレクションに配置されるため､インポート先へ移す
+    scene_collection = context.scene.collection
+    if target_collection != scene_collection:
+        if override.name not in target_collection.children:
+            target_collection.children.link(override)
+        if override.name in scene_collection.children:
+            scene_collection.children.unlink(override)
+    for obj in override.all_objects:
+        if obj.parent is None and obj.override_library is not None:
+            obj.override_library.is_system_override = False
+    logger.debug("Link %s from %s with overrides", collection_name, filepath)
+    return override
@@ -0,0 +1,221 @@
+import addon_utils
+
+import heapq
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from .addon_registry import enabled_addon_registry
+from .import_queue import (
+    ImportJob,
+    get_file_size,
+    get_importer_operator_idname,
+)
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+WORKER_SCRIPT_PATH = str(Path(__file__).with_name("worker_import_script.py"))
+
+
+def get_default_worker_count() -> int:
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def get_addon_module_name(importer: str) -> str | None:
+    match importer:
+        case "BUILT_IN":
+            return "io_scene_fbx"
+        case "BETTER_FBX":
+            return enabled_addon_registry.get_module_name("better_fbx")
+        case "VRM":
+            return enabled_addon_registry.get_vrm_module_name()
+    return None
+
+
+def get_importer_version(importer: str) -> str:
+    # インポーターのアドオンのバージョン｡読み込まれていない場合は空文字を返す
+    module_name = get_addon_module_name(importer)
+    module = sys.modules.get(module_name) if module_name else None
+    if module is None:
+        return ""
+    version = addon_utils.module_bl_info(module).get("version", ())
+    return ".".join(str(v) for v in version)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Worker Pool
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class WorkerResult:
+    job: ImportJob
+    output_path: str
+    log_path: str
+    returncode: int
+    elapsed: float
+
+    @property
+    def is_succeeded(self) -> bool:
+        return self.returncode == 0 and os.path.exists(self.output_path)
+
+    def read_log_tail(self, line_count: int = 10) -> str:
+        try:
+            with open(self.log_path, "r", encoding="utf-8", errors="replace") as f:
+                return "".join(f.readlines()[-line_count:])
+        except OSError:
+            return ""
+
+
+@dataclass
+class RunningWorker:
+    process: subprocess.Popen
+    job: ImportJob
+    output_path: Path
+    log_path: Path
+    start_time: float
+
+
+class WorkerPool:
+    """
+    バックグラウンドのBlender (blender -b) でファイルを.blendに変換するプロセスプール｡
+    ファイルサイズの大きいジョブから順に開始し､最大で max_workers 個のプロセスを同時に実行する｡
+    """
+
+    def __init__(self, blender_path: str, max_workers: int, memory_limit_mb: int = 0):
+        self.blender_path = blender_path
+        self.max_workers = max(1, max_workers)
+        self.memory_limit_mb = memory_limit_mb
+        self.temp_directory = Path(tempfile.mkdtemp(prefix="ddimport_workers_"))
+        self._pending: list[tuple[int, int, ImportJob]] = []
+        self._running: list[RunningWorker] = []
+        self._counter = itertools.count()
+
+        if memory_limit_mb > 0 and os.name != "posix":
+            logger.warning("Worker memory limit is not supported on this platform")
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._running)
+
+    @property
+    def is_idle(self) -> bool:
+        return not self._pending and not self._running
+
+    def submit(self, job: ImportJob):
+        # heapqは最小値から取り出されるためサイズを負の値にして大きいファイルを優先する
+        heapq.heappush(
+            self._pending, (-get_file_size(job.filepath), next(self._counter), job)
+        )
+
+    def poll(self) -> list[WorkerResult]:
+        results = []
+        still_running = []
+        for worker in self._running:
+            returncode = worker.process.poll()
+            if returncode is None:
+                still_running.append(worker)
+                continue
+            results.append(
+                WorkerResult(
+                    worker.job,
+                    str(worker.output_path),
+                    str(worker.log_path),
+                    returncode,
+                    time.perf_counter() - worker.start_time,
+                )
+            )
+        self._running = still_running
+
+        while self._pending and len(self._running) < self.max_workers:
+            _, index, job = heapq.heappop(self._pending)
+            self._running.append(self._start_worker(index, job))
+
+        return results
+
+    def cancel(self) -> int:
+        # 実行中のプロセスを停止し､停止または破棄したジョブの件数を返す
+        cancelled = len(self)
+        for worker in self._running:
+            worker.process.terminate()
+        for worker in self._running:
+            try:
+                worker.process.wait(timeout=5.0)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+        self._running = []
+        self._pending = []
+        return cancelled
+
+    def cleanup(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+    def _start_worker(self, index: int, job: ImportJob) -> RunningWorker:
+        job_path = self.temp_directory.joinpath(f"job_{index:05d}.json")
+        output_path = self.temp_directory.joinpath(f"result_{index:05d}.blend")
+        log_path = self.temp_directory.joinpath(f"job_{index:05d}.log")
+
+        job_spec = {
+            "operator": get_importer_operator_idname(job.importer),
+            "addon_module": get_addon_module_name(job.importer),
+            "filepath": job.filepath,
+            "keywords": job.keywords,
+            "output": str(output_path),
+            "collection": job.asset_collection,
+        }
+        with open(job_path, "w", encoding="utf-8") as f:
+            json.dump(job_spec, f)
+
+        command = [
+            self.blender_path,
+            "--background",
+            "--python-exit-code",
+            "1",
+            "--python",
+            WORKER_SCRIPT_PATH,
+            "--",
+            str(job_path),
+        ]
+        logger.debug("Start Worker : %s", job.file_name)
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            process = subprocess.Popen(
+                command,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                preexec_fn=self._get_preexec_fn(),
+            )
+        return RunningWorker(process, job, output_path, log_path, time.perf_counter())
+
+    def _get_preexec_fn(self):
+        if self.memory_limit_mb <= 0 or os.name != "posix":
+            return None
+        limit = self.memory_limit_mb * 1024 * 1024
+
+        def limit_memory():
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+        return limit_memory
@@ -0,0 +1,103 @@
+import bpy
+
+import time
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+STAGING_COLLECTION_NAME = "DDImport_Staging"
+# バッチ中に進捗とステータスバーを再描画する間隔 (秒)
+STAGING_REDRAW_INTERVAL = 0.5
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def find_layer_collection(
+    layer_collection: bpy.types.LayerCollection, collection: bpy.types.Collection
+) -> bpy.types.LayerCollection | None:
+    if layer_collection.collection == collection:
+        return layer_collection
+    for child in layer_collection.children:
+        found = find_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Batch Staging
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class BatchStaging:
+    """
+    バッチの間インポートされたデータを受け取るステージング用コレクション｡
+    インポーターがオブジェクトを選択できるようにビューレイヤーからは除外せず､
+    ビューポートで無効化することでバッチ中の依存グラフの評価と描画の対象から外す｡
+    バッチの終了時にインポート先のコレクションへ移動して1度だけ評価する｡
+    進捗の表示による再描画もSTAGING_REDRAW_INTERVAL毎に間引く｡
+    """
+
+    def __init__(self, context: bpy.types.Context):
+        self.view_layer = context.view_layer
+        self.target_collection = context.collection
+        self.collection = bpy.data.collections.new(STAGING_COLLECTION_NAME)
+        self.collection.hide_viewport = True
+        self.collection.hide_render = True
+        context.scene.collection.children.link(self.collection)
+        self.layer_collection = find_layer_collection(
+            self.view_layer.layer_collection, self.collection
+        )
+        self._last_redraw = 0.0
+        self.activate()
+
+    def activate(self):
+        # インポーターはアクティブなコレクションにオブジェクトをリンクする
+        if self.view_layer.active_layer_collection != self.layer_collection:
+            self.view_layer.active_layer_collection = self.layer_collection
+
+    def should_redraw(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_redraw < STAGING_REDRAW_INTERVAL:
+            return False
+        self._last_redraw = now
+        return True
+
+    def commit(self) -> int:
+        objects = [*self.collection.objects]
+        for obj in objects:
+            self.target_collection.objects.link(obj)
+        # インポーターが作成したコレクションもインポート先に移動する
+        for child in [*self.collection.children]:
+            self.target_collection.children.link(child)
+
+        target_layer_collection = find_layer_collection(
+            self.view_layer.layer_collection, self.target_collection
+        )
+        bpy.data.collections.remove(self.collection)
+        if target_layer_collection is not None:
+            self.view_layer.active_layer_collection = target_layer_collection
+
+        # バッチ全体で1度だけビューレイヤーを更新する
+        self.view_layer.update()
+        logger.debug("Commit %d staged objects", len(objects))
+        return len(objects)
@@ -0,0 +1,458 @@
+"""
+バックグラウンドのBlenderで実行されるベンチマーク用スクリプト｡
+run_benchmark.py から --python で渡されて実行される｡
+
+コーパスの生成
+    blender -b --factory-startup --python blender_benchmark.py -- generate
+        --output-dir DIR --name NAME --files N --objects N --vertices N --bones N --keys N
+        [--textures N]
+
+インポートの計測
+    blender -b --factory-startup --python blender_benchmark.py -- run
+        --addon-path DD_IMPORT_DIR --importer BUILT_IN --directory DIR --result RESULT.json
+        [--file-namespace] [--texture-prefetch]
+
+    -b を付けずにウィンドウを開いて実行した場合は､モーダルのキューで処理し
+    アンドゥのプッシュの時間とメモリも計測して終了する (バックグラウンドモードではアンドゥが無効)
+
+起動時間の計測 (モジュールのインポートとregister()/unregister())
+    blender -b --factory-startup --python blender_benchmark.py -- startup
+        --addon-path DD_IMPORT_DIR --repeat N --result RESULT.json
+"""
+
+import bpy
+import addon_utils
+
+import argparse
+import functools
+import importlib
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import traceback
+
+from pathlib import Path
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+TEXTURE_SIZE = 1024
+# ウィンドウを開いて実行した場合にキューの終了を確認する間隔
+QUEUE_POLL_INTERVAL = 0.05
+UNDO_UNAVAILABLE_REASON = "Undo is disabled in background mode. Run with --interactive"
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Corpus
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def create_grid_mesh(name: str, vertex_count: int) -> bpy.types.Mesh:
+    side = max(2, math.ceil(math.sqrt(vertex_count)))
+    vertices = [(x / side, y / side, 0.0) for y in range(side) for x in range(side)]
+    faces = [
+        (y * side + x, y * side + x + 1, (y + 1) * side + x + 1, (y + 1) * side + x)
+        for y in range(side - 1)
+        for x in range(side - 1)
+    ]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], faces)
+    mesh.update()
+    return mesh
+
+
+def create_armature(name: str, bone_count: int, key_count: int) -> bpy.types.Object:
+    armature = bpy.data.armatures.new(name)
+    armature_object = bpy.data.objects.new(name, armature)
+    bpy.context.scene.collection.objects.link(armature_object)
+    bpy.context.view_layer.objects.active = armature_object
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    parent = None
+    for i in range(bone_count):
+        bone = armature.edit_bones.new(f"Bone_{i:03d}")
+        bone.head = (0.0, 0.0, i * 0.1)
+        bone.tail = (0.0, 0.0, (i + 1) * 0.1)
+        bone.parent = parent
+        parent = bone
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    for frame in range(key_count):
+        for pose_bone in armature_object.pose.bones:
+            pose_bone.rotation_quaternion = (1.0, 0.01 * frame, 0.0, 0.0)
+            pose_bone.keyframe_insert("rotation_quaternion", frame=frame + 1)
+    return armature_object
+
+
+def create_textured_materials(
+    texture_dir: Path, prefix: str, texture_count: int
+) -> list[bpy.types.Material]:
+    # ファイル毎に別の画像ファイルを書き出し､それぞれをベースカラーに使うマテリアルを作る
+    texture_dir.mkdir(parents=True, exist_ok=True)
+    materials = []
+    for i in range(texture_count):
+        image = bpy.data.images.new(
+            f"{prefix}_Texture_{i:02d}", TEXTURE_SIZE, TEXTURE_SIZE
+        )
+        image.generated_type = "COLOR_GRID"
+        image.filepath_raw = str(texture_dir.joinpath(f"{image.name}.png"))
+        image.file_format = "PNG"
+        image.save()
+
+        material = bpy.data.materials.new(f"{prefix}_Material_{i:02d}")
+        material.use_nodes = True
+        nodes = material.node_tree.nodes
+        texture_node = nodes.new("ShaderNodeTexImage")
+        texture_node.image = image
+        material.node_tree.links.new(
+            texture_node.outputs["Color"],
+            nodes["Principled BSDF"].inputs["Base Color"],
+        )
+        materials.append(material)
+    return materials
+
+
+def generate_fbx_file(
+    filepath: Path,
+    object_count: int,
+    vertex_count: int,
+    bone_count: int,
+    key_count: int,
+    texture_count: int = 0,
+):
+    reset_scene()
+    scene_collection = bpy.context.scene.collection
+    materials = create_textured_materials(
+        filepath.parent.joinpath("textures"), filepath.stem, texture_count
+    )
+    for i in range(object_count):
+        mesh = create_grid_mesh(f"Mesh_{i:04d}", vertex_count)
+        if materials:
+            mesh.materials.append(materials[i % len(materials)])
+        obj = bpy.data.objects.new(f"Object_{i:04d}", mesh)
+        obj.location = (i % 10 * 2.0, i // 10 * 2.0, 0.0)
+        scene_collection.objects.link(obj)
+        # ボーンが無い場合はオブジェクト自体にキーを打つ
+        if bone_count == 0:
+            for frame in range(key_count):
+                obj.location.z = frame * 0.01
+                obj.keyframe_insert("location", frame=frame + 1)
+
+    if bone_count > 0:
+        create_armature("Armature", bone_count, key_count)
+
+    bpy.ops.export_scene.fbx(filepath=str(filepath), bake_anim=key_count > 0)
+
+
+def generate_corpus(args: argparse.Namespace):
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(args.files):
+        generate_fbx_file(
+            output_dir.joinpath(f"{args.name}_{index:03d}.fbx"),
+            args.objects,
+            args.vertices,
+            args.bones,
+            args.keys,
+            args.textures,
+        )
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Benchmark
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def enable_dd_import(addon_path: Path) -> str:
+    # リポジトリの親ディレクトリをパスに追加してアドオンとして有効化する
+    sys.path.insert(0, str(addon_path.parent))
+    package_name = addon_path.name
+    if addon_utils.enable(package_name, default_set=True) is None:
+        raise RuntimeError(f"Failed to enable {package_name}")
+    return package_name
+
+
+def to_megabytes(value: int | None) -> float | None:
+    if value is None:
+        return None
+    return value / 1024**2
+
+
+def get_view3d_override() -> dict:
+    # D&D Importのオペレーターは3Dビューポートでのみ実行できる
+    window = bpy.context.window_manager.windows[0]
+    area = next(a for a in window.screen.areas if a.type == "VIEW_3D")
+    region = next(r for r in area.regions if r.type == "WINDOW")
+    return {"window": window, "area": area, "region": region}
+
+
+def run_benchmark(args: argparse.Namespace):
+    package_name = enable_dd_import(Path(args.addon_path))
+    system_memory = importlib.import_module(f"{package_name}.system_memory")
+    import_queue = importlib.import_module(f"{package_name}.import_queue")
+    tracing = importlib.import_module(f"{package_name}.tracing")
+
+    result = {
+        "importer": args.importer,
+        "execution_mode": args.execution_mode,
+        "file_namespace": args.file_namespace,
+        "texture_prefetch": args.texture_prefetch,
+        "directory": args.directory,
+        "interactive": not bpy.app.background,
+    }
+
+    # Better FBXはインストールされている場合のみ計測する
+    if args.importer == "BETTER_FBX":
+        if addon_utils.enable("better_fbx", default_set=True) is None:
+            result["skipped"] = "Better FBX is not installed"
+            finish_benchmark(args, result)
+            return
+
+    addon_pref = bpy.context.preferences.addons[package_name].preferences
+    addon_pref.show_popup = False
+    addon_pref.importer = "1" if args.importer == "BETTER_FBX" else "0"
+    addon_pref.execution_mode = args.execution_mode
+    addon_pref.use_file_namespace = args.file_namespace
+    addon_pref.use_texture_preload = args.texture_prefetch
+
+    directory = Path(args.directory)
+    file_names = sorted(
+        p.name for p in directory.iterdir() if p.suffix.lower() in (".fbx", ".vrm")
+    )
+    result["file_count"] = len(file_names)
+    result["total_bytes"] = sum(
+        directory.joinpath(n).stat().st_size for n in file_names
+    )
+
+    # --factory-startupのシーンに含まれるオブジェクトは計測から除く
+    objects_before = len(bpy.context.scene.objects)
+
+    # アンドゥのプッシュはトレースのスパンから時間とRSSの差を取得する
+    tracing.tracer.enabled = True
+    tracing.tracer.clear()
+
+    # File Handlerと同じ引数でD&D Importのオペレーターを呼び出す
+    rss_before = system_memory.get_current_rss()
+    start_time = time.perf_counter()
+    # "import" はPythonの予約語のため属性としてアクセスできない
+    dd_import_operator = getattr(bpy.ops.dd_import, "import")
+    files = [{"name": n} for n in file_names]
+    if bpy.app.background:
+        dd_import_operator(directory=str(directory), files=files)
+        collect_results(args, result, start_time, rss_before, objects_before)
+        return
+
+    # ウィンドウがある場合はキューがモーダルで処理されるため､終了をタイマーで待つ
+    with bpy.context.temp_override(**get_view3d_override()):
+        dd_import_operator(directory=str(directory), files=files)
+    bpy.app.timers.register(
+        functools.partial(
+            wait_for_queue, args, result, start_time, rss_before, objects_before
+        ),
+        first_interval=QUEUE_POLL_INTERVAL,
+    )
+
+
+def wait_for_queue(
+    args: argparse.Namespace,
+    result: dict,
+    start_time: float,
+    rss_before: int | None,
+    objects_before: int,
+) -> float | None:
+    import_queue = sys.modules[f"{Path(args.addon_path).name}.import_queue"]
+    if import_queue.import_job_queue.is_running:
+        return QUEUE_POLL_INTERVAL
+    try:
+        collect_results(args, result, start_time, rss_before, objects_before)
+    except Exception:
+        # タイマーの例外では終了コードが設定されないため､ここで終了させる
+        traceback.print_exc()
+        sys.stderr.flush()
+        os._exit(1)
+    bpy.ops.wm.quit_blender()
+    return None
+
+
+def get_trace_record(tracer, name: str) -> dict | None:
+    for record in reversed(tracer.records):
+        if record["name"] == name:
+            return record
+    return None
+
+
+def collect_results(
+    args: argparse.Namespace,
+    result: dict,
+    start_time: float,
+    rss_before: int | None,
+    objects_before: int,
+):
+    package_name = Path(args.addon_path).name
+    system_memory = sys.modules[f"{package_name}.system_memory"]
+    import_queue = sys.modules[f"{package_name}.import_queue"]
+    tracing = sys.modules[f"{package_name}.tracing"]
+
+    result["wall_time"] = time.perf_counter() - start_time
+    rss_after = system_memory.get_current_rss()
+
+    # バックグラウンドモードではアンドゥスタックが無効なため､計測できない理由を記録する
+    undo_record = get_trace_record(tracing.tracer, "undo_push")
+    if bpy.app.background:
+        result["undo_push_time"] = None
+        result["undo_push_rss_delta_mb"] = None
+        result["undo_unavailable"] = UNDO_UNAVAILABLE_REASON
+    elif undo_record is None:
+        result["undo_push_time"] = None
+        result["undo_push_rss_delta_mb"] = None
+        result["undo_unavailable"] = "Undo was not pushed (see the undo limits)"
+    else:
+        result["undo_push_time"] = undo_record["duration_ns"] / 1e9
+        result["undo_push_rss_delta_mb"] = to_megabytes(
+            undo_record["args"].get("rss_delta")
+        )
+
+    result["rss_before_mb"] = to_megabytes(rss_before)
+    result["rss_after_mb"] = to_megabytes(rss_after)
+    result["peak_rss_mb"] = to_megabytes(system_memory.get_peak_rss())
+    result["scene_objects"] = len(bpy.context.scene.objects) - objects_before
+
+    # 最初の描画で行われる画像のデコードを再現し､プリフェッチで短くなるかを比較する
+    images = [i for i in bpy.data.images if i.source == "FILE"]
+    pending_bytes = sum(
+        os.path.getsize(bpy.path.abspath(i.filepath))
+        for i in images
+        if not i.has_data and os.path.isfile(bpy.path.abspath(i.filepath))
+    )
+    start_time = time.perf_counter()
+    for image in images:
+        _ = image.size[0]
+    result["textures"] = len(images)
+    result["first_draw_decode_time"] = time.perf_counter() - start_time
+    result["first_draw_decode_mb"] = to_megabytes(pending_bytes)
+    # プリフェッチのデコードはメインスレッドで行われ､その速度をトレースから取得する
+    prefetch_record = get_trace_record(tracing.tracer, "prefetch_textures")
+    if prefetch_record is not None:
+        result["prefetch_decode_time"] = prefetch_record["args"].get("decode_time")
+        result["prefetch_decode_mb_per_sec"] = prefetch_record["args"].get(
+            "decode_throughput"
+        )
+    result["per_file"] = [
+        {"file": Path(filepath).name, "time": elapsed}
+        for filepath, elapsed in import_queue.import_job_queue.last_batch_timings
+    ]
+    # コーパスの各ファイルのオブジェクト数は同じため､ファイル毎の時間から1オブジェクトあたりの時間を求める
+    if result["file_count"] and result["scene_objects"]:
+        objects_per_file = result["scene_objects"] / result["file_count"]
+        result["objects_per_file"] = objects_per_file
+        result["per_object_ms"] = [
+            to_milliseconds(timing["time"] / objects_per_file)
+            for timing in result["per_file"]
+        ]
+    finish_benchmark(args, result)
+
+
+def finish_benchmark(args: argparse.Namespace, result: dict):
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+
+def to_milliseconds(seconds: float) -> float:
+    return seconds * 1000
+
+
+def run_startup_benchmark(args: argparse.Namespace) -> dict:
+    addon_path = Path(args.addon_path)
+    sys.path.insert(0, str(addon_path.parent))
+    package_name = addon_path.name
+
+    # 初回のインポートはアドオンの全モジュールの読み込みを含む
+    start_time = time.perf_counter()
+    module = importlib.import_module(package_name)
+    import_time = time.perf_counter() - start_time
+    loaded_modules = sorted(m for m in sys.modules if m.startswith(package_name))
+
+    register_times = []
+    unregister_times = []
+    for _ in range(args.repeat):
+        start_time = time.perf_counter()
+        module.register()
+        register_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        module.unregister()
+        unregister_times.append(time.perf_counter() - start_time)
+
+    return {
+        "import_ms": to_milliseconds(import_time),
+        "register_ms": to_milliseconds(register_times[0]),
+        "register_median_ms": to_milliseconds(statistics.median(register_times)),
+        "unregister_median_ms": to_milliseconds(statistics.median(unregister_times)),
+        "repeat": args.repeat,
+        "loaded_modules": loaded_modules,
+    }
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Main
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender_benchmark.py")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate")
+    generate.add_argument("--output-dir", required=True)
+    generate.add_argument("--name", default="corpus")
+    generate.add_argument("--files", type=int, default=10)
+    generate.add_argument("--objects", type=int, default=10)
+    generate.add_argument("--vertices", type=int, default=1000)
+    generate.add_argument("--bones", type=int, default=0)
+    generate.add_argument("--keys", type=int, default=0)
+    generate.add_argument("--textures", type=int, default=0)
+
+    run = subparsers.add_parser("run")
+    run.add_argument("--addon-path", required=True)
+    run.add_argument("--importer", choices=("BUILT_IN", "BETTER_FBX"), required=True)
+    run.add_argument("--execution-mode", default="SESSION")
+    run.add_argument("--directory", required=True)
+    run.add_argument("--result", required=True)
+    run.add_argument("--file-namespace", action="store_true")
+    run.add_argument("--texture-prefetch", action="store_true")
+
+    startup = subparsers.add_parser("startup")
+    startup.add_argument("--addon-path", required=True)
+    startup.add_argument("--repeat", type=int, default=10)
+    startup.add_argument("--result", required=True)
+
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    match args.command:
+        case "generate":
+            generate_corpus(args)
+        case "run":
+            run_benchmark(args)
+        case "startup":
+            finish_benchmark(args, run_startup_benchmark(args))
+
+
+main()
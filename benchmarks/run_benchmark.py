@@ -0,0 +1,343 @@
+"""
+DD Importのドラッグ&ドロップインポートを計測するベンチマーク｡
+Blenderをバックグラウンドモードで起動し､コーパスの生成とインポートの計測を行って結果をJSONに書き出す｡
+
+python benchmarks/run_benchmark.py --blender /path/to/blender --output result.json
+python benchmarks/run_benchmark.py --blender blender --corpus-dir ./corpus --cases small
+python benchmarks/run_benchmark.py --blender blender --startup-only
+python benchmarks/run_benchmark.py --blender blender --cases many_objects --file-namespace
+python benchmarks/run_benchmark.py --blender blender --cases textured --texture-prefetch
+
+many_objects は50,000個のオブジェクトを同じ名前で作成し､バッチの後半でも
+1オブジェクトあたりのインポート時間が一定であるか (名前の衝突で遅くならないか) を確認する｡
+textured は画像を参照するコーパスで､--texture-prefetch の有無でバッチの時間と
+その後のデコードの時間 (最初の描画で行われる処理) を比較する｡
+OSのファイルキャッシュは消去しないため､コーパスを生成した直後の計測はキャッシュに載った状態になる｡
+
+--corpus-dir を指定した場合はその中のサブディレクトリ (FBX/VRMを含むもの) をケースとして使う｡
+指定しない場合は CORPUS_CASES の設定からFBXのコーパスを一時ディレクトリに生成する｡
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+BENCHMARK_DIRECTORY = Path(__file__).parent
+ADDON_DIRECTORY = BENCHMARK_DIRECTORY.parent
+BLENDER_SCRIPT_PATH = BENCHMARK_DIRECTORY.joinpath("blender_benchmark.py")
+
+# 1ファイルあたりのオブジェクト数､頂点数､ボーン数､アニメーションのキー数､画像数
+# filesを指定したケースは --files に関わらずその数のファイルを生成する
+CORPUS_CASES = {
+    "small": {"objects": 10, "vertices": 1_000, "bones": 0, "keys": 0},
+    "medium": {"objects": 50, "vertices": 10_000, "bones": 20, "keys": 50},
+    "large": {"objects": 200, "vertices": 50_000, "bones": 60, "keys": 250},
+    "many_objects": {
+        "files": 500,
+        "objects": 100,
+        "vertices": 16,
+        "bones": 0,
+        "keys": 0,
+    },
+    "textured": {
+        "objects": 10,
+        "vertices": 1_000,
+        "bones": 0,
+        "keys": 0,
+        "textures": 8,
+    },
+}
+# --cases を指定しない場合に計測するケース
+DEFAULT_CASES = ("small", "medium", "large")
+# バッチの前半と後半で比較する1オブジェクトあたりの時間のファイル数の割合
+PER_OBJECT_SAMPLE_RATIO = 0.1
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def run_blender(blender: str, arguments: list[str], interactive: bool = False):
+    # アンドゥはバックグラウンドモードでは無効なため､計測する場合はウィンドウを開く
+    command = [
+        blender,
+        *(() if interactive else ("--background",)),
+        "--factory-startup",
+        "--python-exit-code",
+        "1",
+        "--python",
+        str(BLENDER_SCRIPT_PATH),
+        "--",
+        *arguments,
+    ]
+    subprocess.run(command, check=True)
+
+
+def get_blender_version(blender: str) -> str:
+    completed = subprocess.run(
+        [blender, "--version"], capture_output=True, text=True, check=True
+    )
+    return completed.stdout.splitlines()[0].strip()
+
+
+def generate_corpus(
+    blender: str, corpus_dir: Path, case_names: list[str], file_count: int
+) -> dict[str, Path]:
+    cases = {}
+    for name in case_names:
+        case_dir = corpus_dir.joinpath(name)
+        settings = CORPUS_CASES[name]
+        case_file_count = settings.get("files", file_count)
+        print(f"Generate corpus : {name} ({case_file_count} files, {settings})")
+        run_blender(
+            blender,
+            [
+                "generate",
+                "--output-dir",
+                str(case_dir),
+                "--name",
+                name,
+                "--files",
+                str(case_file_count),
+                "--objects",
+                str(settings["objects"]),
+                "--vertices",
+                str(settings["vertices"]),
+                "--bones",
+                str(settings["bones"]),
+                "--keys",
+                str(settings["keys"]),
+                "--textures",
+                str(settings.get("textures", 0)),
+            ],
+        )
+        cases[name] = case_dir
+    return cases
+
+
+def find_corpus_cases(
+    corpus_dir: Path, case_names: list[str] | None
+) -> dict[str, Path]:
+    extensions = (".fbx", ".vrm")
+    cases = {
+        d.name: d
+        for d in sorted(corpus_dir.iterdir())
+        if d.is_dir() and any(p.suffix.lower() in extensions for p in d.iterdir())
+    }
+    # サブディレクトリが無い場合はディレクトリ自体を1つのケースとして扱う
+    if not cases:
+        cases = {corpus_dir.name: corpus_dir}
+    if case_names:
+        cases = {k: v for k, v in cases.items() if k in case_names}
+    return cases
+
+
+def run_case(
+    blender: str,
+    case_name: str,
+    case_dir: Path,
+    importer: str,
+    execution_mode: str,
+    file_namespace: bool,
+    texture_prefetch: bool,
+    interactive: bool,
+    temp_dir: Path,
+) -> dict:
+    result_path = temp_dir.joinpath(f"{case_name}_{importer}_{execution_mode}.json")
+    print(f"Run benchmark : {case_name} / {importer} / {execution_mode}")
+    arguments = [
+        "run",
+        "--addon-path",
+        str(ADDON_DIRECTORY),
+        "--importer",
+        importer,
+        "--execution-mode",
+        execution_mode,
+        "--directory",
+        str(case_dir),
+        "--result",
+        str(result_path),
+    ]
+    if file_namespace:
+        arguments.append("--file-namespace")
+    if texture_prefetch:
+        arguments.append("--texture-prefetch")
+    run_blender(blender, arguments, interactive)
+    with open(result_path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    result["case"] = case_name
+    print_per_object_time(result)
+    print_texture_decode_time(result)
+    print_undo_push(result)
+    return result
+
+
+def print_per_object_time(result: dict):
+    # バッチの最初と最後のファイルで1オブジェクトあたりの時間を比較する
+    per_object_ms = result.get("per_object_ms")
+    if not per_object_ms:
+        return
+    sample = max(1, int(len(per_object_ms) * PER_OBJECT_SAMPLE_RATIO))
+    first = sum(per_object_ms[:sample]) / sample
+    last = sum(per_object_ms[-sample:]) / sample
+    print(
+        f"Per object : first {first:.3f} ms, last {last:.3f} ms "
+        f"({result['scene_objects']} objects)"
+    )
+
+
+def print_texture_decode_time(result: dict):
+    # プリフェッチはデコードをバッチ内に移すため､両方の合計で比較する
+    if not result.get("textures"):
+        return
+    print(
+        f"Textures : batch {result['wall_time']:.3f} sec, "
+        f"first draw decode {result['first_draw_decode_time']:.3f} sec "
+        f"({result['first_draw_decode_mb']:.1f} MB, {result['textures']} images)"
+    )
+    if result.get("prefetch_decode_time") is not None:
+        print(
+            f"Prefetch decode : {result['prefetch_decode_time']:.3f} sec "
+            f"({result['prefetch_decode_mb_per_sec']:.1f} MB/s on the main thread)"
+        )
+
+
+def print_undo_push(result: dict):
+    if "undo_push_time" not in result:
+        return
+    if result["undo_push_time"] is None:
+        print(f"Undo push : unavailable ({result['undo_unavailable']})")
+        return
+    rss_delta = result["undo_push_rss_delta_mb"]
+    rss_text = "unknown" if rss_delta is None else f"{rss_delta:+.1f} MB"
+    print(f"Undo push : {result['undo_push_time']:.3f} sec, RSS {rss_text}")
+
+
+def run_startup(blender: str, repeat: int, temp_dir: Path) -> dict:
+    result_path = temp_dir.joinpath("startup.json")
+    print(f"Run startup benchmark : {repeat} times")
+    run_blender(
+        blender,
+        [
+            "startup",
+            "--addon-path",
+            str(ADDON_DIRECTORY),
+            "--repeat",
+            str(repeat),
+            "--result",
+            str(result_path),
+        ],
+    )
+    with open(result_path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    print(
+        f"Import {result['import_ms']:.1f} ms, "
+        f"register() {result['register_ms']:.1f} ms "
+        f"(median {result['register_median_ms']:.1f} ms)"
+    )
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blender", default="blender", help="Path to Blender")
+    parser.add_argument("--output", default="dd_import_benchmark.json")
+    parser.add_argument("--corpus-dir", help="Use existing FBX/VRM files")
+    parser.add_argument(
+        "--cases",
+        default="",
+        help="Comma separated case names (default: all cases)",
+    )
+    parser.add_argument("--files", type=int, default=10, help="Files per case")
+    parser.add_argument("--importers", default="BUILT_IN,BETTER_FBX")
+    parser.add_argument("--execution-modes", default="SESSION")
+    parser.add_argument(
+        "--file-namespace",
+        action="store_true",
+        help="Prefix imported names by file (Prefix Names by File)",
+    )
+    parser.add_argument(
+        "--texture-prefetch",
+        action="store_true",
+        help="Read and decode textures after the batch (Prefetch Textures)",
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="Open a window instead of --background to measure the undo push",
+    )
+    parser.add_argument("--startup-repeat", type=int, default=10)
+    parser.add_argument(
+        "--startup-only", action="store_true", help="Measure only register() time"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    case_names = [c for c in args.cases.split(",") if c]
+    importers = [i for i in args.importers.split(",") if i]
+    execution_modes = [m for m in args.execution_modes.split(",") if m]
+
+    with tempfile.TemporaryDirectory(prefix="ddimport_benchmark_") as temp:
+        temp_dir = Path(temp)
+        startup = run_startup(args.blender, args.startup_repeat, temp_dir)
+        if args.startup_only:
+            cases = {}
+        elif args.corpus_dir:
+            cases = find_corpus_cases(Path(args.corpus_dir), case_names)
+        else:
+            cases = generate_corpus(
+                args.blender,
+                temp_dir.joinpath("corpus"),
+                case_names or [*DEFAULT_CASES],
+                args.files,
+            )
+
+        results = []
+        for case_name, case_dir in cases.items():
+            for importer in importers:
+                for execution_mode in execution_modes:
+                    results.append(
+                        run_case(
+                            args.blender,
+                            case_name,
+                            case_dir,
+                            importer,
+                            execution_mode,
+                            args.file_namespace,
+                            args.texture_prefetch,
+                            args.interactive,
+                            temp_dir,
+                        )
+                    )
+
+    output = {
+        "blender": get_blender_version(args.blender),
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "startup": startup,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"Write benchmark results : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
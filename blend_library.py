@@ -0,0 +1,75 @@
+import bpy
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Datablock Snapshot
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class DatablockSnapshot:
+    """
+    インポート前に存在していたデータブロックを記録し､
+    インポートで新しく作成されたデータブロックを取得できるようにする｡
+    """
+
+    def __init__(self):
+        self.objects = {*bpy.data.objects}
+        self.actions = {*bpy.data.actions}
+
+    def get_new_objects(self) -> list[bpy.types.Object]:
+        return [obj for obj in bpy.data.objects if obj not in self.objects]
+
+    def get_new_actions(self) -> list[bpy.types.Action]:
+        return [act for act in bpy.data.actions if act not in self.actions]
+
+    def get_new_datablocks(self) -> list[bpy.types.ID]:
+        return [*self.get_new_objects(), *self.get_new_actions()]
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def append_objects_from_blend(
+    filepath: str, collection: bpy.types.Collection
+) -> list[bpy.types.Object]:
+    """
+    .blendファイルに含まれるオブジェクトとアクションをアペンドし､
+    オブジェクトを指定したコレクションにリンクする｡
+
+    Parameters
+    ----------
+    filepath : str
+        アペンド元の.blendファイルのパス
+    collection : bpy.types.Collection
+        アペンドしたオブジェクトをリンクするコレクション
+
+    Returns
+    -------
+    list[bpy.types.Object]
+        アペンドされたオブジェクトのリスト
+    """
+
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        data_to.objects = data_from.objects
+        data_to.actions = data_from.actions
+
+    appended_objects = [obj for obj in data_to.objects if obj is not None]
+    for obj in appended_objects:
+        collection.objects.link(obj)
+    logger.debug("Append %d objects from %s", len(appended_objects), filepath)
+    return appended_objects
@@ -0,0 +1,84 @@
+import bpy
+
+import json
+import time
+
+from pathlib import Path
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def get_checkpoint_path(template: Path, chunk_index: int) -> Path:
+    # checkpoint.blend → checkpoint_0003.blend
+    return template.with_name(f"{template.stem}_{chunk_index:04d}.blend")
+
+
+def get_manifest_path(checkpoint_path: Path) -> Path:
+    return checkpoint_path.with_suffix(".json")
+
+
+def save_checkpoint(checkpoint_path: Path, imported_files: list[str]) -> bool:
+    """
+    現在のセッションのコピーをチェックポイントの.blendとして保存する｡
+    隣にそこまでにインポートしたファイルの一覧をJSONで書き出し､
+    クラッシュした場合にどのファイルから再開すれば良いか分かるようにする｡
+    編集中のファイルのパスは変更しない｡
+
+    Parameters
+    ----------
+    checkpoint_path : Path
+        保存先の.blendのパス
+    imported_files : list[str]
+        チェックポイントに含まれるインポート済みのファイルのパス
+
+    Returns
+    -------
+    bool
+        保存に成功した
+    """
+
+    start_time = time.perf_counter()
+    try:
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        bpy.ops.wm.save_as_mainfile(
+            filepath=str(checkpoint_path), copy=True, check_existing=False
+        )
+        with open(get_manifest_path(checkpoint_path), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "blend_file": bpy.data.filepath,
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "imported_files": imported_files,
+                },
+                f,
+                indent=2,
+            )
+    except (RuntimeError, OSError) as e:
+        logger.error("Failed to save checkpoint %s : %s", checkpoint_path, e)
+        return False
+    logger.info(
+        "Save checkpoint : %s (%d files, %.3f sec)",
+        checkpoint_path,
+        len(imported_files),
+        time.perf_counter() - start_time,
+    )
+    return True
+
+
+def remove_checkpoint(checkpoint_path: Path):
+    checkpoint_path.unlink(missing_ok=True)
+    get_manifest_path(checkpoint_path).unlink(missing_ok=True)
@@ -0,0 +1,124 @@
+import bpy
+
+import hashlib
+
+import numpy as np
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# 属性の型毎の foreach_get のキー､要素数､配列の型
+ATTRIBUTE_LAYOUTS: dict[str, tuple[str, int, type]] = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, np.bool_),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+    "FLOAT4X4": ("value", 16, np.float32),
+}
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def read_collection_array(
+    collection: bpy.types.bpy_prop_collection,
+    key: str,
+    components: int,
+    dtype: type,
+) -> np.ndarray:
+    # foreach_get で連続した配列に直接読み込み､要素毎のPythonオブジェクトを作らない
+    array = np.empty(len(collection) * components, dtype=dtype)
+    collection.foreach_get(key, array)
+    return array
+
+
+def hash_mesh(mesh: bpy.types.Mesh) -> str:
+    """
+    メッシュの頂点､トポロジー､属性､シェイプキーの内容からハッシュを作る｡
+    名前や選択状態､割り当てられたマテリアルなど形状に関係しない情報は含めない｡
+
+    Parameters
+    ----------
+    mesh : bpy.types.Mesh
+        ハッシュを作るメッシュ
+
+    Returns
+    -------
+    str
+        内容が同じメッシュで一致するハッシュ
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        np.array(
+            [len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons)],
+            dtype=np.int64,
+        )
+    )
+    digest.update(read_collection_array(mesh.edges, "vertices", 2, np.int32))
+    digest.update(read_collection_array(mesh.loops, "vertex_index", 1, np.int32))
+    digest.update(read_collection_array(mesh.polygons, "loop_start", 1, np.int32))
+
+    # 頂点座標､UV､マテリアルインデックスなどは全て属性として読み込む
+    for attribute in sorted(mesh.attributes, key=lambda a: a.name):
+        # "."で始まる属性は選択や表示状態などの内部データ
+        if attribute.name.startswith("."):
+            continue
+        layout = ATTRIBUTE_LAYOUTS.get(attribute.data_type)
+        if layout is None:
+            continue
+        digest.update(
+            f"{attribute.name}:{attribute.domain}:{attribute.data_type}".encode("utf-8")
+        )
+        digest.update(read_collection_array(attribute.data, *layout))
+
+    if mesh.has_custom_normals:
+        digest.update(
+            read_collection_array(mesh.corner_normals, "vector", 3, np.float32)
+        )
+
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            digest.update(key_block.name.encode("utf-8"))
+            digest.update(read_collection_array(key_block.data, "co", 3, np.float32))
+
+    return digest.hexdigest()
+
+
+def get_mesh_data_size(mesh: bpy.types.Mesh) -> int:
+    """
+    ハッシュの対象になる配列の合計サイズ (バイト)｡
+    配列は読み込まずに要素数と型から計算する｡
+    """
+
+    size = (len(mesh.edges) * 2 + len(mesh.loops) + len(mesh.polygons)) * 4
+    for attribute in mesh.attributes:
+        layout = ATTRIBUTE_LAYOUTS.get(attribute.data_type)
+        if layout is not None:
+            _, components, dtype = layout
+            size += len(attribute.data) * components * np.dtype(dtype).itemsize
+    if mesh.shape_keys is not None:
+        size += len(mesh.shape_keys.key_blocks) * len(mesh.vertices) * 3 * 4
+    return size
@@ -0,0 +1,129 @@
+import bpy
+
+import importlib
+import inspect
+
+from typing import Any, Callable
+
+from .import_cache import hash_parameters
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+FBX_IMPORT_MODULE_NAME = "io_scene_fbx.import_fbx"
+# io_scene_fbx.import_fbx.load(operator, context, filepath="", **keywords)
+REQUIRED_PARAMETERS = ("operator", "context", "filepath")
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Direct Loader
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class DirectFbxLoader:
+    """
+    bpy.ops.import_scene.fbx を経由せずに io_scene_fbx の load() を直接呼び出す｡
+    オペレーターの検索､コンテキストのコピー､キーワードのRNA変換をファイル毎に行わず､
+    変換したキーワードはバッチ内の全てのファイルで使い回す｡
+    内部APIが見つからない場合やシグネチャが変わっている場合は利用できないものとして扱う｡
+    シグネチャはキーワードの変換時に1度だけ照合し､load() 内で発生したエラーはそのまま送出する｡
+    """
+
+    def __init__(self):
+        self._load: Callable | None = None
+        self._signature: inspect.Signature | None = None
+        self._is_checked: bool = False
+        self._keywords_hash: str = ""
+        self._prepared_keywords: dict[str, Any] | None = None
+
+    def is_available(self) -> bool:
+        if self._is_checked:
+            return self._load is not None
+        self._is_checked = True
+        try:
+            module = importlib.import_module(FBX_IMPORT_MODULE_NAME)
+            load = module.load
+            signature = inspect.signature(load)
+        except (ImportError, AttributeError, TypeError, ValueError) as e:
+            logger.warning("FBX load function is not available : %s", e)
+            return False
+        if not all(name in signature.parameters for name in REQUIRED_PARAMETERS):
+            logger.warning("Signature of FBX load function has changed")
+            return False
+        self._load = load
+        self._signature = signature
+        return True
+
+    def disable(self):
+        self._load = None
+        self._is_checked = True
+
+    def prepare_keywords(self, keywords: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        キーワードをload() に渡せる形に変換し､シグネチャと照合する｡
+        ジョブ毎に辞書がコピーされても再変換しないように､内容のハッシュで結果を使い回す｡
+
+        Parameters
+        ----------
+        keywords : dict[str, Any]
+            オペレーターに渡すキーワード
+
+        Returns
+        -------
+        dict[str, Any] | None
+            load() に渡すキーワード｡シグネチャと一致しない場合はNoneを返し､以降は利用できなくなる
+        """
+
+        if self._load is None:
+            return None
+        keywords_hash = hash_parameters(keywords)
+        if keywords_hash == self._keywords_hash:
+            return self._prepared_keywords
+
+        parameters = self._signature.parameters
+        unknown = [k for k in keywords if k not in parameters]
+        if unknown:
+            logger.debug("Ignore unknown FBX import keywords : %s", unknown)
+        prepared_keywords = {
+            k: v
+            for k, v in keywords.items()
+            if k in parameters and k not in REQUIRED_PARAMETERS
+        }
+        try:
+            self._signature.bind(None, None, filepath="", **prepared_keywords)
+        except TypeError as e:
+            # 内部APIの引数が変わっている場合はオペレーターでのインポートに切り替える
+            logger.warning("Fall back to FBX import operator : %s", e)
+            self.disable()
+            return None
+        self._keywords_hash = keywords_hash
+        self._prepared_keywords = prepared_keywords
+        return prepared_keywords
+
+    def load(
+        self,
+        operator: bpy.types.Operator,
+        context: bpy.types.Context,
+        filepath: str,
+        prepared_keywords: dict[str, Any],
+    ):
+        result = self._load(operator, context, filepath=filepath, **prepared_keywords)
+        if result != {"FINISHED"}:
+            raise RuntimeError(f"FBX load function returned {result}")
+
+
+direct_fbx_loader = DirectFbxLoader()
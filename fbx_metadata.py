@@ -0,0 +1,395 @@
+"""
+バイナリFBXのノードツリーをmmapで読み､インポート前にファイルの内容を集計する｡
+ジオメトリの配列は展開せず､必要の無いノードはEndOffsetで読み飛ばす｡
+bpyに依存しないため､スレッドプールとプロセスプールのどちらからでも呼び出せる｡
+"""
+
+import importlib.util
+import logging
+import mmap
+import os
+import site
+import struct
+import sys
+import time
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Iterator, Iterable
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+# プロセスプールではアドオンのパッケージ外から単体のモジュールとして読み込まれる
+try:
+    from .Logging.preparation_logger import preparating_logger
+
+    logger = preparating_logger(__name__)
+except ImportError:
+    logger = logging.getLogger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+FBX_BINARY_MAGIC = b"Kaydara FBX Binary  \x00"
+FBX_HEADER_SIZE = 27
+# バージョン7500以降はノードヘッダーのオフセットが64bitになる
+FBX_LARGE_HEADER_VERSION = 7500
+NODE_HEADER_32 = struct.Struct("<IIIB")
+NODE_HEADER_64 = struct.Struct("<QQQB")
+ARRAY_HEADER = struct.Struct("<III")
+UINT32 = struct.Struct("<I")
+
+SCALAR_PROPERTIES = {
+    ord("Y"): struct.Struct("<h"),
+    ord("C"): struct.Struct("<?"),
+    ord("I"): struct.Struct("<i"),
+    ord("F"): struct.Struct("<f"),
+    ord("D"): struct.Struct("<d"),
+    ord("L"): struct.Struct("<q"),
+}
+ARRAY_PROPERTIES = {ord(c) for c in "fdlib"}
+
+# 単位と軸の設定としてGlobalSettingsから取得するプロパティ
+AXIS_SETTINGS = (
+    "UpAxis",
+    "UpAxisSign",
+    "FrontAxis",
+    "FrontAxisSign",
+    "CoordAxis",
+    "CoordAxisSign",
+)
+BONE_MODEL_TYPES = {"LimbNode", "Limb", "Root"}
+
+
+class FbxFormatError(ValueError):
+    pass
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Metadata
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class FbxMetadata:
+    filepath: str
+    file_size: int = 0
+    version: int = 0
+    objects: int = 0
+    meshes: int = 0
+    vertices: int = 0
+    polygons: int = 0
+    bones: int = 0
+    materials: int = 0
+    textures: int = 0
+    animation_stacks: int = 0
+    animation_curves: int = 0
+    keys: int = 0
+    embedded_media_size: int = 0
+    unit_scale: float = 1.0
+    axis: dict[str, int] = field(default_factory=dict)
+    read_time_ms: float = 0.0
+    error: str = ""
+
+    @property
+    def file_name(self) -> str:
+        return Path(self.filepath).name
+
+
+@dataclass
+class FbxArray:
+    # 配列プロパティはヘッダーのみを読み､データの位置を保持する
+    type_code: int
+    length: int
+    encoding: int
+    offset: int
+    byte_length: int
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Node Reader
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class FbxNodeReader:
+    def __init__(self, buffer: mmap.mmap | bytes):
+        magic = buffer[: len(FBX_BINARY_MAGIC)]
+        if len(buffer) < FBX_HEADER_SIZE or magic != FBX_BINARY_MAGIC:
+            raise FbxFormatError("Not a binary FBX file")
+        self.buffer = buffer
+        self.version = UINT32.unpack_from(buffer, 23)[0]
+        if self.version >= FBX_LARGE_HEADER_VERSION:
+            self.node_header = NODE_HEADER_64
+        else:
+            self.node_header = NODE_HEADER_32
+
+    def iter_nodes(
+        self, offset: int, end: int
+    ) -> Iterator[tuple[str, int, int, int, int]]:
+        """
+        offsetからendまでの同じ階層のノードを列挙する｡
+
+        Returns
+        -------
+        Iterator[tuple[str, int, int, int, int]]
+            ノード名､EndOffset､プロパティ数､プロパティの開始位置､子ノードの開始位置
+        """
+
+        buffer = self.buffer
+        header = self.node_header
+        while offset + header.size <= end:
+            end_offset, property_count, property_length, name_length = (
+                header.unpack_from(buffer, offset)
+            )
+            # 全てのフィールドが0のレコードは階層の終端を表す
+            if end_offset == 0:
+                return
+            if end_offset > end or end_offset <= offset:
+                raise FbxFormatError(f"Invalid node end offset at {offset}")
+            name_offset = offset + header.size
+            name = bytes(buffer[name_offset : name_offset + name_length]).decode(
+                "ascii", "replace"
+            )
+            property_offset = name_offset + name_length
+            yield (
+                name,
+                end_offset,
+                property_count,
+                property_offset,
+                property_offset + property_length,
+            )
+            offset = end_offset
+
+    def iter_top_level_nodes(self) -> Iterator[tuple[str, int, int, int, int]]:
+        return self.iter_nodes(FBX_HEADER_SIZE, len(self.buffer))
+
+    def read_properties(self, offset: int, count: int) -> list[Any]:
+        # 文字列以外の可変長データはコピーせず､配列は位置とサイズのみを返す
+        buffer = self.buffer
+        values = []
+        for _ in range(count):
+            type_code = buffer[offset]
+            offset += 1
+            scalar = SCALAR_PROPERTIES.get(type_code)
+            if scalar is not None:
+                values.append(scalar.unpack_from(buffer, offset)[0])
+                offset += scalar.size
+            elif type_code in ARRAY_PROPERTIES:
+                length, encoding, byte_length = ARRAY_HEADER.unpack_from(buffer, offset)
+                offset += ARRAY_HEADER.size
+                values.append(
+                    FbxArray(type_code, length, encoding, offset, byte_length)
+                )
+                offset += byte_length
+            elif type_code == ord("S"):
+                length = UINT32.unpack_from(buffer, offset)[0]
+                offset += UINT32.size
+                values.append(
+                    bytes(buffer[offset : offset + length]).decode("utf-8", "replace")
+                )
+                offset += length
+            elif type_code == ord("R"):
+                length = UINT32.unpack_from(buffer, offset)[0]
+                offset += UINT32.size
+                values.append(length)
+                offset += length
+            else:
+                raise FbxFormatError(f"Unknown property type {chr(type_code)!r}")
+        return values
+
+    def read_array_bytes(self, array: FbxArray) -> bytes:
+        data = self.buffer[array.offset : array.offset + array.byte_length]
+        if array.encoding == 1:
+            return zlib.decompress(data)
+        return bytes(data)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def count_negative_int32(data: bytes) -> int:
+    # リトルエンディアンのint32は最上位バイトが0x80以上の場合に負の値になる
+    # 0x80未満のバイトを取り除き､残った最上位バイトの数を数える
+    return len(data[3::4].translate(None, bytes(range(0x80))))
+
+
+def _read_global_settings(reader: FbxNodeReader, node, metadata: FbxMetadata):
+    _, end_offset, _, _, child_offset = node
+    for child in reader.iter_nodes(child_offset, end_offset):
+        if child[0] != "Properties70":
+            continue
+        for p_node in reader.iter_nodes(child[4], child[1]):
+            name, _, property_count, property_offset, _ = p_node
+            values = reader.read_properties(property_offset, property_count)
+            if len(values) < 5:
+                continue
+            if values[0] == "UnitScaleFactor":
+                metadata.unit_scale = float(values[4])
+            elif values[0] in AXIS_SETTINGS:
+                metadata.axis[values[0]] = int(values[4])
+
+
+def _read_geometry(
+    reader: FbxNodeReader, node, metadata: FbxMetadata, count_polygons: bool
+):
+    _, end_offset, property_count, property_offset, child_offset = node
+    values = reader.read_properties(property_offset, property_count)
+    if len(values) < 3 or values[2] != "Mesh":
+        return
+    metadata.meshes += 1
+    for name, child_end, child_count, child_property_offset, _ in reader.iter_nodes(
+        child_offset, end_offset
+    ):
+        if name == "Vertices":
+            array = reader.read_properties(child_property_offset, child_count)[0]
+            metadata.vertices += array.length // 3
+        elif name == "PolygonVertexIndex" and count_polygons:
+            # ポリゴンの終端のインデックスは負の値で表されるため､その数がポリゴン数になる
+            array = reader.read_properties(child_property_offset, child_count)[0]
+            metadata.polygons += count_negative_int32(reader.read_array_bytes(array))
+
+
+def _read_objects(
+    reader: FbxNodeReader, node, metadata: FbxMetadata, count_polygons: bool
+):
+    _, end_offset, _, _, child_offset = node
+    for child in reader.iter_nodes(child_offset, end_offset):
+        name, child_end, property_count, property_offset, grandchild_offset = child
+        match name:
+            case "Model":
+                metadata.objects += 1
+                values = reader.read_properties(property_offset, property_count)
+                if len(values) >= 3 and values[2] in BONE_MODEL_TYPES:
+                    metadata.bones += 1
+            case "Geometry":
+                _read_geometry(reader, child, metadata, count_polygons)
+            case "Material":
+                metadata.materials += 1
+            case "Texture":
+                metadata.textures += 1
+            case "AnimationStack":
+                metadata.animation_stacks += 1
+            case "AnimationCurve":
+                metadata.animation_curves += 1
+                for key_node in reader.iter_nodes(grandchild_offset, child_end):
+                    if key_node[0] == "KeyTime":
+                        array = reader.read_properties(key_node[3], key_node[2])[0]
+                        metadata.keys += array.length
+                        break
+            case "Video":
+                for content_node in reader.iter_nodes(grandchild_offset, child_end):
+                    if content_node[0] == "Content" and content_node[2]:
+                        values = reader.read_properties(content_node[3], 1)
+                        if isinstance(values[0], int):
+                            metadata.embedded_media_size += values[0]
+
+
+def read_fbx_metadata(filepath: str, count_polygons: bool = True) -> FbxMetadata:
+    """
+    バイナリFBXの内容を集計する｡
+    読み込みに失敗した場合は例外を送出せず､errorに理由を設定して返す｡
+
+    Parameters
+    ----------
+    filepath : str
+        FBXファイルのパス
+    count_polygons : bool, optional
+        ポリゴン数を数える｡PolygonVertexIndexの配列のみ展開する
+
+    Returns
+    -------
+    FbxMetadata
+        集計結果
+    """
+
+    start_time = time.perf_counter()
+    metadata = FbxMetadata(filepath=str(filepath))
+    try:
+        with open(filepath, "rb") as f:
+            metadata.file_size = os.fstat(f.fileno()).st_size
+            if metadata.file_size == 0:
+                raise FbxFormatError("Empty file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                reader = FbxNodeReader(buffer)
+                metadata.version = reader.version
+                for node in reader.iter_top_level_nodes():
+                    match node[0]:
+                        case "GlobalSettings":
+                            _read_global_settings(reader, node, metadata)
+                        case "Objects":
+                            _read_objects(reader, node, metadata, count_polygons)
+    except (OSError, ValueError, IndexError, struct.error, zlib.error) as e:
+        metadata.error = str(e)
+    metadata.read_time_ms = (time.perf_counter() - start_time) * 1000
+    return metadata
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Pool
+------------------------------------------------------------
+---------------------------------------------------------"""
+STANDALONE_MODULE_NAME = "fbx_metadata"
+
+
+def _get_standalone_read_function():
+    # プロセスプールの子プロセスではbpyを含むアドオンのパッケージを読み込めないため､
+    # このファイルを単体のモジュールとして読み込んだ関数を渡す
+    module = sys.modules.get(STANDALONE_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(STANDALONE_MODULE_NAME, __file__)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[STANDALONE_MODULE_NAME] = module
+        spec.loader.exec_module(module)
+    elif Path(getattr(module, "__file__", "")) != Path(__file__):
+        return None
+    return module.read_fbx_metadata
+
+
+def read_fbx_metadata_batch(
+    filepaths: Iterable[str],
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    count_polygons: bool = True,
+) -> list[FbxMetadata]:
+    """
+    複数のFBXファイルを並列に集計する｡結果は入力と同じ順に返す｡
+    """
+
+    filepaths = [str(p) for p in filepaths]
+    if not filepaths:
+        return []
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(filepaths)))
+    counts = [count_polygons] * len(filepaths)
+
+    read_function = _get_standalone_read_function() if use_processes else None
+    if read_function is None:
+        if use_processes:
+            logger.warning("Module name conflict. Fall back to thread pool")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(read_fbx_metadata, filepaths, counts))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=get_context("spawn"),
+        initializer=site.addsitedir,
+        initargs=(str(Path(__file__).parent),),
+    ) as executor:
+        return list(executor.map(read_function, filepaths, counts))
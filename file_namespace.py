@@ -0,0 +1,159 @@
+import bpy
+
+from pathlib import Path
+from typing import Iterable
+
+from .batch_staging import find_layer_collection
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+NAMESPACE_COLLECTION_NAME = "DDImport_Namespace"
+
+
+def get_namespace_prefix(source_path: str) -> str:
+    return f"{Path(source_path).stem}_"
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def collect_namespace_targets(
+    objects: Iterable[bpy.types.Object],
+    collections: Iterable[bpy.types.Collection],
+    session_uid: int,
+) -> list[bpy.types.ID]:
+    """
+    インポートされたオブジェクトから辿れるデータブロックのうち､
+    session_uidが基準より大きい (基準のコレクションより後に作成された) ものを集める｡
+    bpy.dataの全体を走査しないため､処理時間はインポートされた数にのみ比例する｡
+    画像はファイル名で参照されることが多いため対象にしない｡
+    """
+
+    targets: dict[bpy.types.ID, None] = {}
+
+    def add(datablock: bpy.types.ID | None):
+        if (
+            datablock is not None
+            and datablock.library is None
+            and datablock.session_uid > session_uid
+        ):
+            targets[datablock] = None
+
+    def add_action(animation_data: bpy.types.AnimData | None):
+        if animation_data is not None:
+            add(animation_data.action)
+
+    for obj in objects:
+        add(obj)
+        add(obj.data)
+        add_action(obj.animation_data)
+        for slot in obj.material_slots:
+            add(slot.material)
+        shape_keys = getattr(obj.data, "shape_keys", None)
+        if shape_keys is not None:
+            add_action(shape_keys.animation_data)
+    for collection in collections:
+        add(collection)
+    return [*targets]
+
+
+def rename_with_prefix(datablocks: Iterable[bpy.types.ID], prefix: str) -> int:
+    # 既に接頭辞が付いている名前 (Better FBXのRename By Filenameなど) は変更しない
+    renamed = 0
+    for datablock in datablocks:
+        if datablock.name.startswith(prefix):
+            continue
+        datablock.name = prefix + datablock.name
+        renamed += 1
+    return renamed
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    File Namespace
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class FileNamespace:
+    """
+    1ファイル分のインポートを受け取る一時的なコレクション｡
+    終了時にオブジェクトをインポート先のコレクションへ移し､
+    そのファイルで作成されたデータブロックの名前にファイル名の接頭辞をまとめて付ける｡
+    次のファイルが同じ名前でデータを作成しても既存の名前と衝突しないため､
+    Blenderの重複した名前の解決 (.001､.002…) がバッチの大きさに応じて遅くならない｡
+
+    with FileNamespace(context, prefix):
+        インポート処理
+    """
+
+    def __init__(self, context: bpy.types.Context, prefix: str):
+        self.context = context
+        self.prefix = prefix
+        self.renamed = 0
+        self.view_layer = context.view_layer
+        self.target_collection = context.collection
+        self.collection: bpy.types.Collection | None = None
+
+    def __enter__(self):
+        # このコレクションより後に作成されたデータブロックがインポートされたもの
+        self.collection = bpy.data.collections.new(NAMESPACE_COLLECTION_NAME)
+        self.target_collection.children.link(self.collection)
+        layer_collection = find_layer_collection(
+            self.view_layer.layer_collection, self.collection
+        )
+        if layer_collection is not None:
+            self.view_layer.active_layer_collection = layer_collection
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        objects = [*self.collection.objects]
+        for obj in objects:
+            self.target_collection.objects.link(obj)
+        children = [*self.collection.children]
+        for child in children:
+            self.target_collection.children.link(child)
+
+        session_uid = self.collection.session_uid
+        bpy.data.collections.remove(self.collection)
+        self.collection = None
+        target_layer_collection = find_layer_collection(
+            self.view_layer.layer_collection, self.target_collection
+        )
+        if target_layer_collection is not None:
+            self.view_layer.active_layer_collection = target_layer_collection
+
+        # インポートに失敗した場合も作成済みのデータには接頭辞を付ける
+        imported_objects = {*objects}
+        for child in children:
+            imported_objects.update(child.all_objects)
+        targets = collect_namespace_targets(
+            imported_objects,
+            [c for child in children for c in (child, *child.children_recursive)],
+            session_uid,
+        )
+        self.renamed = rename_with_prefix(targets, self.prefix)
+        logger.debug(
+            "Namespace %s : %d of %d datablocks renamed",
+            self.prefix,
+            self.renamed,
+            len(targets),
+        )
+        return False
@@ -0,0 +1,307 @@
+import bpy
+
+import os
+import time
+
+from typing import Callable
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+WATCH_EXTENSIONS = (".fbx", ".vrm")
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 8.0
+# ファイルを上書きで更新した場合はフォルダの更新日時が変わらないため､
+# 最近書き込まれたファイルは毎回確認し､それ以外は一定間隔で全体を確認する
+RECENT_FILE_WINDOW = 300.0
+FULL_RESCAN_INTERVAL = 60.0
+# サイズと更新日時がこの回数連続で変わらなければ書き込みが完了したとみなす
+STABLE_POLL_COUNT = 2
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Watcher
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class HotFolderWatcher:
+    """
+    bpy.app.timersで指定したフォルダをポーリングし､新しく追加されたファイルと
+    更新されたファイルだけをコールバックに渡す｡
+
+    各ティックでは監視中の全てのフォルダ､保留中のファイル､最近書き込まれたファイルをstatする｡
+    更新日時が変わったフォルダは一覧を取得して前回の一覧と比較し､新しいファイルだけをstatする｡
+    上書きで更新された古いファイルはFULL_RESCAN_INTERVAL毎に全てのファイルをstatして検出する｡
+    書き込み中のファイルはサイズが安定するまで保留する｡
+    変化が無い間はポーリングの間隔を倍々に伸ばす｡
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        on_files_ready: Callable[[list[str]], None],
+        recursive: bool = True,
+        extensions: tuple[str, ...] = WATCH_EXTENSIONS,
+    ):
+        self.directory = directory
+        self.on_files_ready = on_files_ready
+        self.recursive = recursive
+        self.extensions = extensions
+        # インポート済みのファイル {パス: (更新日時, サイズ)}
+        self._index: dict[str, tuple[int, int]] = {}
+        # 書き込み完了を待っているファイル {パス: (更新日時, サイズ, 安定した回数)}
+        self._pending: dict[str, tuple[int, int, int]] = {}
+        # 最近書き込まれたファイル {パス: 確認を終える時刻}
+        self._recent: dict[str, float] = {}
+        self._directory_mtimes: dict[str, int] = {}
+        # フォルダ毎の監視対象のファイル名 (前回の一覧)
+        self._directory_files: dict[str, set[str]] = {}
+        self._interval = MIN_POLL_INTERVAL
+        self._last_full_rescan = 0.0
+        self.is_running = False
+
+    # ----------------------------------------------------------
+    #    Timer
+    # ----------------------------------------------------------
+    def start(self, import_existing: bool = False):
+        if self.is_running:
+            return
+        # 開始時にフォルダ内に存在するファイルはインポート済みとして索引に登録する
+        self._index.clear()
+        self._pending.clear()
+        self._recent.clear()
+        self._directory_mtimes.clear()
+        self._directory_files.clear()
+        self._scan_tree(register_only=not import_existing)
+        self._last_full_rescan = time.monotonic()
+        self._interval = MIN_POLL_INTERVAL
+        self.is_running = True
+        bpy.app.timers.register(
+            self._tick, first_interval=MIN_POLL_INTERVAL, persistent=True
+        )
+        logger.info(
+            "Start watching %s (%d files indexed)", self.directory, len(self._index)
+        )
+
+    def stop(self):
+        if bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.unregister(self._tick)
+        self.is_running = False
+        logger.info("Stop watching %s", self.directory)
+
+    def _tick(self) -> float | None:
+        if not self.is_running:
+            return None
+        try:
+            ready_files = self.poll()
+        except Exception as e:
+            # タイマーの例外はタイマーの登録を解除してしまうため記録して続行する
+            logger.error("Failed to poll %s : %s", self.directory, e)
+            ready_files = []
+
+        if ready_files:
+            try:
+                self.on_files_ready(ready_files)
+            except Exception:
+                # インポートの開始に失敗しても監視は続ける
+                logger.exception(
+                    "Failed to import %d files from %s",
+                    len(ready_files),
+                    self.directory,
+                )
+
+        if ready_files or self._pending:
+            self._interval = MIN_POLL_INTERVAL
+        else:
+            self._interval = min(self._interval * 2, MAX_POLL_INTERVAL)
+        return self._interval
+
+    # ----------------------------------------------------------
+    #    Poll
+    # ----------------------------------------------------------
+    def poll(self) -> list[str]:
+        now = time.monotonic()
+        if now - self._last_full_rescan >= FULL_RESCAN_INTERVAL:
+            self._last_full_rescan = now
+            self._scan_tree(stat_known=True)
+        else:
+            for directory in self._get_changed_directories():
+                # 新しく作られたサブフォルダはその中身も走査する
+                for subdirectory in self._scan_directory(directory):
+                    if subdirectory not in self._directory_mtimes:
+                        self._scan_tree(subdirectory)
+            self._check_recent_files(now)
+        return self._collect_stable_files()
+
+    def _get_changed_directories(self) -> list[str]:
+        changed = []
+        for directory, mtime in list(self._directory_mtimes.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._forget_directory(directory)
+                continue
+            if current != mtime:
+                changed.append(directory)
+        return changed
+
+    def _forget_directory(self, directory: str):
+        # 削除されたフォルダ以下の索引を取り除き､再作成された場合は新規として扱う
+        prefix = os.path.join(directory, "")
+        for path in [p for p in self._directory_mtimes if p.startswith(prefix)]:
+            del self._directory_mtimes[path]
+            self._directory_files.pop(path, None)
+        self._directory_mtimes.pop(directory, None)
+        self._directory_files.pop(directory, None)
+        for path in [p for p in self._index if p.startswith(prefix)]:
+            self._forget_file(path)
+
+    def _forget_file(self, path: str):
+        self._index.pop(path, None)
+        self._pending.pop(path, None)
+        self._recent.pop(path, None)
+
+    def _scan_tree(
+        self,
+        root: str | None = None,
+        register_only: bool = False,
+        stat_known: bool = False,
+    ):
+        stack = [root or self.directory]
+        while stack:
+            stack.extend(self._scan_directory(stack.pop(), register_only, stat_known))
+
+    def _scan_directory(
+        self, directory: str, register_only: bool = False, stat_known: bool = False
+    ) -> list[str]:
+        """
+        1階層分のフォルダの一覧を前回の一覧と比較し､新しいファイルを保留リストに追加する｡
+        前回もあったファイルはstat_knownの場合のみstatし､索引と異なれば保留リストに追加する｡
+        一覧から消えたファイルは索引から取り除く｡サブフォルダのリストを返す｡
+        """
+
+        subdirectories = []
+        known_names = self._directory_files.get(directory, set())
+        names = set()
+        try:
+            self._directory_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            subdirectories.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(self.extensions):
+                        continue
+                    names.add(entry.name)
+                    if entry.name in known_names and not stat_known:
+                        continue
+                    stat = entry.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    if register_only:
+                        self._index[entry.path] = signature
+                        self._add_recent_file(entry.path, stat.st_mtime)
+                    elif (
+                        self._index.get(entry.path) != signature
+                        and entry.path not in self._pending
+                    ):
+                        self._pending[entry.path] = (*signature, 0)
+        except OSError as e:
+            logger.warning("Failed to scan %s : %s", directory, e)
+            return []
+        for name in known_names - names:
+            self._forget_file(os.path.join(directory, name))
+        self._directory_files[directory] = names
+        return subdirectories
+
+    def _add_recent_file(self, path: str, mtime: float):
+        # 書き込まれてからRECENT_FILE_WINDOWの間は上書きされていないか毎回確認する
+        remaining = RECENT_FILE_WINDOW - (time.time() - mtime)
+        if remaining > 0:
+            self._recent[path] = time.monotonic() + remaining
+
+    def _check_recent_files(self, now: float):
+        for path, expiry in list(self._recent.items()):
+            if now >= expiry:
+                del self._recent[path]
+                continue
+            if path in self._pending:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._recent[path]
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._index.get(path) != signature:
+                self._pending[path] = (*signature, 0)
+
+    def _collect_stable_files(self) -> list[str]:
+        ready_files = []
+        for path, (mtime, size, stable_count) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != (mtime, size) or size == 0:
+                self._pending[path] = (*signature, 0)
+                continue
+            stable_count += 1
+            if stable_count < STABLE_POLL_COUNT:
+                self._pending[path] = (mtime, size, stable_count)
+                continue
+            del self._pending[path]
+            if self._index.get(path) == signature:
+                continue
+            self._index[path] = signature
+            self._add_recent_file(path, stat.st_mtime)
+            ready_files.append(path)
+        return ready_files
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+# 監視は1つのフォルダのみ行う
+_active_watcher: HotFolderWatcher | None = None
+
+
+def get_active_watcher() -> HotFolderWatcher | None:
+    return _active_watcher
+
+
+def start_hot_folder(
+    directory: str,
+    on_files_ready: Callable[[list[str]], None],
+    recursive: bool = True,
+) -> HotFolderWatcher:
+    global _active_watcher
+    stop_hot_folder()
+    _active_watcher = HotFolderWatcher(directory, on_files_ready, recursive)
+    _active_watcher.start()
+    return _active_watcher
+
+
+def stop_hot_folder():
+    global _active_watcher
+    if _active_watcher is not None:
+        _active_watcher.stop()
+        _active_watcher = None
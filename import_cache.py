@@ -0,0 +1,278 @@
+import bpy
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from pathlib import Path
+from typing import Any, Iterable
+
+from .background_workers import get_importer_version
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+INDEX_FILE_NAME = "index.json"
+INDEX_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def hash_file_content(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_parameters(keywords: dict[str, Any]) -> str:
+    # キーの順序や空白の違いでハッシュが変わらないように正規化してからハッシュ化する
+    canonical = json.dumps(keywords, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Import Cache
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class ImportCache:
+    """
+    インポート結果を.blendとして保存するディスクキャッシュ｡
+    キーはソースファイルの内容のハッシュ､インポーター､パラメーターのハッシュから作られる｡
+    Blenderやインポーターを更新した後に古い結果を使わないように､キーにはそれらのバージョンも含める｡
+    インデックスは最初にアクセスされた時に1度だけ読み込み､バッチの終了時に書き出す｡
+    """
+
+    # エントリーを追加する度にサイズ上限による削除を行う
+    evict_on_add: bool = True
+
+    def __init__(self):
+        self.directory: Path | None = None
+        self.size_limit: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._file_hashes: dict[str, dict[str, Any]] = {}
+        self._is_loaded: bool = False
+        self._is_dirty: bool = False
+
+    # ----------------------------------------------------------
+    #    Index
+    # ----------------------------------------------------------
+    def set_directory(self, directory: Path):
+        if self.directory == directory:
+            return
+        if self._is_dirty:
+            self.save_index()
+        self.directory = directory
+        self._is_loaded = False
+
+    def _ensure_loaded(self):
+        if self._is_loaded:
+            return
+        self._entries = {}
+        self._file_hashes = {}
+        index_path = self.directory.joinpath(INDEX_FILE_NAME)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                self._entries = index["entries"]
+                self._file_hashes = index["file_hashes"]
+        except (OSError, ValueError, KeyError):
+            logger.debug("Import cache index not found : %s", index_path)
+        self._is_loaded = True
+        self._is_dirty = False
+
+    def save_index(self):
+        if not self._is_loaded or not self._is_dirty:
+            return
+        self.prune_file_hashes()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index_path = self.directory.joinpath(INDEX_FILE_NAME)
+        temp_path = index_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "entries": self._entries,
+                    "file_hashes": self._file_hashes,
+                },
+                f,
+            )
+        os.replace(temp_path, index_path)
+        self._is_dirty = False
+
+    def prune_file_hashes(self):
+        # エントリーから参照されていないファイルと､存在しないファイルのハッシュを取り除く
+        sources = {entry["source"] for entry in self._entries.values()}
+        for filepath in [*self._file_hashes]:
+            if filepath not in sources or not os.path.exists(filepath):
+                del self._file_hashes[filepath]
+                self._is_dirty = True
+
+    # ----------------------------------------------------------
+    #    Key
+    # ----------------------------------------------------------
+    def get_file_hash(self, filepath: str) -> str:
+        # 更新日時とサイズが変わっていなければ前回計算したハッシュを使う
+        self._ensure_loaded()
+        stat = os.stat(filepath)
+        cached = self._file_hashes.get(filepath)
+        if (
+            cached
+            and cached["mtime_ns"] == stat.st_mtime_ns
+            and cached["size"] == stat.st_size
+        ):
+            return cached["digest"]
+        digest = hash_file_content(filepath)
+        self._file_hashes[filepath] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": digest,
+        }
+        self._is_dirty = True
+        return digest
+
+    def make_key(self, filepath: str, importer: str, keywords: dict[str, Any]) -> str:
+        key_source = "|".join(
+            (
+                self.get_file_hash(filepath),
+                importer,
+                get_importer_version(importer),
+                bpy.app.version_string,
+                hash_parameters(keywords),
+            )
+        )
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        return self.directory.joinpath(f"{key}.blend")
+
+    # ----------------------------------------------------------
+    #    Lookup / Store
+    # ----------------------------------------------------------
+    def lookup(self, key: str) -> str | None:
+        self._ensure_loaded()
+        entry = self._entries.get(key)
+        entry_path = self.get_entry_path(key)
+        if entry is None or not entry_path.exists():
+            if entry is not None:
+                del self._entries[key]
+                self._is_dirty = True
+            self.misses += 1
+            return None
+
+        entry["last_access"] = time.time()
+        self._is_dirty = True
+        self.hits += 1
+        return str(entry_path)
+
+    def store_datablocks(
+        self, key: str, datablocks: Iterable[bpy.types.ID], source: str
+    ) -> str:
+        # インポートで作成されたデータを依存データごと.blendに書き出す
+        self._ensure_loaded()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry_path = self.get_entry_path(key)
+        temp_path = entry_path.with_suffix(".tmp.blend")
+        bpy.data.libraries.write(str(temp_path), set(datablocks), path_remap="ABSOLUTE")
+        os.replace(temp_path, entry_path)
+        self._add_entry(key, entry_path, source)
+        return str(entry_path)
+
+    def store_file(self, key: str, blend_path: str, source: str) -> str:
+        # ワーカーが書き出した.blendはコピーせずにキャッシュへ移動する
+        self._ensure_loaded()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry_path = self.get_entry_path(key)
+        shutil.move(blend_path, entry_path)
+        self._add_entry(key, entry_path, source)
+        return str(entry_path)
+
+    def _add_entry(self, key: str, entry_path: Path, source: str):
+        self._entries[key] = {
+            "size": entry_path.stat().st_size,
+            "last_access": time.time(),
+            "source": source,
+        }
+        self._is_dirty = True
+        if self.evict_on_add:
+            self.evict()
+
+    # ----------------------------------------------------------
+    #    Eviction
+    # ----------------------------------------------------------
+    @property
+    def total_size(self) -> int:
+        self._ensure_loaded()
+        return sum(entry["size"] for entry in self._entries.values())
+
+    @property
+    def entry_count(self) -> int:
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def get_protected_keys(self) -> set[str]:
+        # 使用中のため削除しないエントリーのキー
+        return set()
+
+    def evict(self, reserve: int = 0):
+        # 上限を超えている場合は最後にアクセスされた日時が古いものから削除する｡
+        # reserveはこれから追加するエントリーのサイズ
+        if self.size_limit <= 0:
+            return
+        total_size = self.total_size + reserve
+        if total_size <= self.size_limit:
+            return
+        protected_keys = self.get_protected_keys()
+        for key, entry in sorted(
+            self._entries.items(), key=lambda item: item[1]["last_access"]
+        ):
+            if total_size <= self.size_limit:
+                break
+            if key in protected_keys:
+                continue
+            self.get_entry_path(key).unlink(missing_ok=True)
+            del self._entries[key]
+            total_size -= entry["size"]
+            logger.debug("Evict import cache : %s", entry["source"])
+        self._is_dirty = True
+
+    def clear(self):
+        self._ensure_loaded()
+        for key in [*self._entries]:
+            self.get_entry_path(key).unlink(missing_ok=True)
+        self._entries = {}
+        self._file_hashes = {}
+        self.hits = 0
+        self.misses = 0
+        self._is_dirty = True
+        self.save_index()
+
+
+import_cache = ImportCache()
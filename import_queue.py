@@ -0,0 +1,227 @@
+import bpy
+
+import os
+
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .source_scanner import SourceScanner
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+IMPORTER_BUILT_IN = "BUILT_IN"
+IMPORTER_BETTER_FBX = "BETTER_FBX"
+IMPORTER_VRM = "VRM"
+# VRMはアドオンのプリファレンスの設定でインポートする
+VRM_KEYWORDS = {"use_addon_preferences": True}
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Import Job
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class ImportJob:
+    importer: str
+    filepath: str
+    keywords: dict[str, Any] = field(default_factory=dict)
+    cache_key: str | None = None
+    # メモリの見積もりによるインポート中にだけ使われるメモリ (チャンクの区切りに使う)
+    transient_memory: int = 0
+    # 走査で見つかったファイルはサイズも分かっているため取得し直さない
+    file_size: int = 0
+    # 以前インポートしたオブジェクトを差し替える (プリファレンスに関係なく)
+    reimport: bool = False
+    # アーカイブ内のファイルは展開後のパスに置き換わるため､元のパスを保持する
+    source_path: str = ""
+    # ライブラリからリンクする場合にワーカーがオブジェクトをまとめるコレクションの名前
+    asset_collection: str = ""
+
+    def __post_init__(self):
+        if not self.source_path:
+            self.source_path = self.filepath
+
+    @property
+    def file_name(self) -> str:
+        return Path(self.filepath).name
+
+
+def get_file_size(filepath: str) -> int:
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return 0
+
+
+def get_importer_operator_idname(importer: str) -> str:
+    match importer:
+        case "BUILT_IN":
+            return "import_scene.fbx"
+        case "BETTER_FBX":
+            return "better_import.fbx"
+        case "VRM":
+            return "import_scene.vrm"
+    raise ValueError(f"Unknown importer : {importer}")
+
+
+def get_importer_operator(importer: str):
+    # オペレーターの参照はインポーターが無効化されている可能性があるため実行直前に解決する
+    module_name, operator_name = get_importer_operator_idname(importer).split(".")
+    return getattr(getattr(bpy.ops, module_name), operator_name)
+
+
+def execute_import_job(job: ImportJob):
+    import_operator = get_importer_operator(job.importer)
+    import_operator(filepath=job.filepath, **job.keywords)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Import Queue
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class ImportQueue:
+    """
+    ドロップされたファイルのインポートを1ファイルずつ処理するためのキュー｡
+    モーダルオペレーターの実行中に追加されたジョブは同じキューの末尾に積まれる｡
+    """
+
+    def __init__(self):
+        self._jobs: deque[ImportJob] = deque()
+        self._scanners: list[SourceScanner] = []
+        self.total: int = 0
+        self.total_bytes: int = 0
+        self.done: int = 0
+        self.failed: int = 0
+        self.is_running: bool = False
+        self.current_job: ImportJob | None = None
+        # メモリの上限を超えて一時停止している理由
+        self.paused_reason: str = ""
+        # メモリの見積もりで決めた1チャンクの一時的なメモリの量 (0はチャンクに分けない)
+        self.chunk_transient: int = 0
+        # ファイル毎のインポート時間 (ファイルパス, 秒)
+        self.timings: list[tuple[str, float]] = []
+        self.last_batch_timings: list[tuple[str, float]] = []
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add_jobs(self, jobs: Iterable[ImportJob]):
+        jobs = list(jobs)
+        self._jobs.extend(jobs)
+        self.total += len(jobs)
+        self.total_bytes += sum(
+            job.file_size or get_file_size(job.filepath) for job in jobs
+        )
+        logger.debug("Add %d jobs (queued %d)", len(jobs), len(self._jobs))
+
+    def add_scanner(self, scanner: SourceScanner):
+        self._scanners.append(scanner)
+        scanner.start()
+
+    def limit_chunk_transient(self, chunk_transient: int):
+        # 複数のドロップで見積もられた場合は最も小さいチャンクに合わせる
+        if chunk_transient and (
+            not self.chunk_transient or chunk_transient < self.chunk_transient
+        ):
+            self.chunk_transient = chunk_transient
+
+    def collect_scanned_jobs(
+        self, preflight: Callable[[list[ImportJob]], bool] | None = None
+    ) -> int:
+        """
+        走査スレッドが見つけたジョブをキューの末尾に追加し､完了した走査を取り除く｡
+        preflightがFalseを返したジョブはキューに追加せずに破棄する｡
+        """
+
+        collected = 0
+        for scanner in self._scanners[:]:
+            is_finished = scanner.is_finished
+            jobs = scanner.drain()
+            if jobs and (preflight is None or preflight(jobs)):
+                self.add_jobs(jobs)
+                collected += len(jobs)
+            if is_finished:
+                self._scanners.remove(scanner)
+        return collected
+
+    @property
+    def is_scanning(self) -> bool:
+        return bool(self._scanners)
+
+    def pop_job(self) -> ImportJob | None:
+        if not self._jobs:
+            return None
+        self.current_job = self._jobs.popleft()
+        return self.current_job
+
+    def complete_job(
+        self, job: ImportJob, is_succeeded: bool = True, elapsed: float = 0.0
+    ):
+        self.done += 1
+        if not is_succeeded:
+            self.failed += 1
+        self.timings.append((job.filepath, elapsed))
+        self.current_job = None
+
+    def clear(self) -> int:
+        # キャンセル時は走査を中止し､未処理のジョブを破棄して破棄した件数を返す
+        for scanner in self._scanners:
+            scanner.cancel()
+        self._scanners.clear()
+        discarded = len(self._jobs)
+        self._jobs.clear()
+        self.discard(discarded)
+        return discarded
+
+    def discard(self, count: int):
+        # キューから取り出した後に処理されなかったジョブを総数から除く
+        self.total -= count
+
+    def begin(self):
+        self.is_running = True
+
+    def finish(self):
+        self.is_running = False
+        self.total = 0
+        self.total_bytes = 0
+        self.done = 0
+        self.failed = 0
+        self.current_job = None
+        self.paused_reason = ""
+        self.chunk_transient = 0
+        self.last_batch_timings = self.timings
+        self.timings = []
+
+    @property
+    def is_paused(self) -> bool:
+        return bool(self.paused_reason)
+
+    @property
+    def progress(self) -> float:
+        if self.total == 0:
+            return 0.0
+        return self.done / self.total
+
+
+import_job_queue = ImportQueue()
@@ -0,0 +1,276 @@
+import bpy
+from mathutils import Matrix
+
+import time
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .datablock_hash import get_mesh_data_size, hash_mesh
+from .material_dedup import get_rna_values
+from .reimport import PROP_SOURCE, PROP_SOURCE_NAME, PROP_SOURCE_SIGNATURE
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# インスタンスに記録するカスタムプロパティ
+PROP_INSTANCE_SOURCE = "dd_import_instance_source"
+PROP_INSTANCE_OF = "dd_import_instance_of"
+
+INSTANCE_SOURCES_COLLECTION_NAME = "DDImport_Instance_Sources"
+# インスタンス元のオブジェクトの名前の接尾辞｡元の名前はインスタンスが引き継ぐ
+INSTANCE_SOURCE_SUFFIX = "_InstanceSource"
+# 削除する前に名前を空けるために付ける接尾辞
+REPLACED_SUFFIX = "_DDImportReplaced"
+# 入力値がRNAプロパティとして読めないモディファイアを持つオブジェクトはまとめない
+UNSUPPORTED_MODIFIER_TYPES = {"NODES"}
+IGNORED_MODIFIER_PROPERTIES = {
+    "name",
+    "show_expanded",
+    "show_on_cage",
+    "show_in_editmode",
+    "is_active",
+    "is_override_data",
+    "use_pin_to_last",
+    "persistent_uid",
+}
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Signature
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def has_action(id_data: bpy.types.ID | None) -> bool:
+    return (
+        id_data is not None
+        and id_data.animation_data is not None
+        and id_data.animation_data.action is not None
+    )
+
+
+def is_instanceable(obj: bpy.types.Object) -> bool:
+    # 個別に動くもの､子を持つもの､ウェイトを比較できないものはインスタンスにしない
+    return (
+        obj.type == "MESH"
+        and obj.library is None
+        and obj.data.library is None
+        and not obj.children
+        and not obj.constraints
+        and not obj.vertex_groups
+        and not has_action(obj)
+        and not has_action(obj.data.shape_keys)
+        and not any(m.type in UNSUPPORTED_MODIFIER_TYPES for m in obj.modifiers)
+    )
+
+
+def get_object_signature(obj: bpy.types.Object, mesh_hash: str) -> tuple[Any, ...]:
+    materials = tuple(
+        (slot.link, slot.material.as_pointer() if slot.material else 0)
+        for slot in obj.material_slots
+    )
+    modifiers = tuple(
+        (modifier.type, repr(get_rna_values(modifier, IGNORED_MODIFIER_PROPERTIES)))
+        for modifier in obj.modifiers
+    )
+    return (mesh_hash, materials, modifiers)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Instancing
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class InstancingResult:
+    objects: int = 0
+    sources: int = 0
+    instances: int = 0
+    removed_objects: int = 0
+    removed_meshes: int = 0
+    reclaimed_bytes: int = 0
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Instanced {self.instances} of {self.objects} objects "
+            f"from {self.sources} sources, removed {self.removed_objects} objects "
+            f"and {self.removed_meshes} meshes "
+            f"({self.reclaimed_bytes / 1024 ** 2:.1f} MB)"
+        )
+
+
+def get_instance_sources_collection(
+    context: bpy.types.Context,
+) -> bpy.types.Collection:
+    # インスタンス元はビューレイヤーから除外したコレクションにまとめる
+    collection = bpy.data.collections.get(INSTANCE_SOURCES_COLLECTION_NAME)
+    if collection is None or collection.library is not None:
+        collection = bpy.data.collections.new(INSTANCE_SOURCES_COLLECTION_NAME)
+    if collection.name not in context.scene.collection.children:
+        context.scene.collection.children.link(collection)
+    layer_collection = context.view_layer.layer_collection.children.get(collection.name)
+    if layer_collection is not None:
+        layer_collection.exclude = True
+    return collection
+
+
+def create_collection_instance(
+    name: str, obj: bpy.types.Object, collection: bpy.types.Collection
+) -> bpy.types.Object:
+    # 親子関係とローカルの変換をそのまま引き継ぎ､ワールドでの位置を変えない
+    instance = bpy.data.objects.new(name, None)
+    instance.instance_type = "COLLECTION"
+    instance.instance_collection = collection
+    instance.empty_display_size = max(obj.dimensions) / 2 or 1.0
+    instance.parent = obj.parent
+    instance.parent_type = obj.parent_type
+    instance.parent_bone = obj.parent_bone
+    instance.matrix_parent_inverse = obj.matrix_parent_inverse
+    instance.rotation_mode = obj.rotation_mode
+    instance.matrix_basis = obj.matrix_basis
+    instance.hide_viewport = obj.hide_viewport
+    instance.hide_render = obj.hide_render
+    instance.hide_select = obj.hide_select
+    instance.color = obj.color
+    instance.pass_index = obj.pass_index
+    # インポート元 (再インポートでの照合に使う) などのカスタムプロパティも引き継ぐ
+    for key in obj.keys():
+        instance[key] = obj[key]
+    for user_collection in obj.users_collection:
+        user_collection.objects.link(instance)
+    return instance
+
+
+def set_instance_provenance(
+    instance: bpy.types.Object, obj: bpy.types.Object, source: bpy.types.Object
+):
+    instance[PROP_INSTANCE_SOURCE] = obj.get(PROP_SOURCE, "")
+    instance[PROP_INSTANCE_OF] = source.name
+
+
+def move_to_source_collection(
+    source: bpy.types.Object, collection: bpy.types.Collection
+):
+    # インスタンス元のオブジェクトは原点に置き､インスタンス化するコレクションだけに入れる｡
+    # 複数のファイルのインスタンスで共有されるため､インポート元は各インスタンスにだけ残す
+    for key in (PROP_SOURCE, PROP_SOURCE_NAME, PROP_SOURCE_SIGNATURE):
+        if key in source:
+            del source[key]
+    for user_collection in [*source.users_collection]:
+        user_collection.objects.unlink(source)
+    collection.objects.link(source)
+    source.parent = None
+    source.matrix_parent_inverse = Matrix.Identity(4)
+    source.matrix_basis = Matrix.Identity(4)
+
+
+def instance_identical_objects(
+    context: bpy.types.Context,
+    objects: Iterable[bpy.types.Object],
+    instance_type: str = "COLLECTION",
+) -> InstancingResult:
+    """
+    メッシュ､マテリアル､モディファイアが同じオブジェクトを1つのインスタンス元から作成する｡
+    COLLECTIONはオブジェクトをコレクションインスタンスのエンプティに置き換え､
+    LINKEDはオブジェクトを残してメッシュを共有するリンク複製にする｡
+    各インスタンスにはインポート元のファイルとインスタンス元の名前を記録する｡
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        インスタンス元のコレクションを追加するシーンのコンテキスト
+    objects : Iterable[bpy.types.Object]
+        まとめるオブジェクト (バッチでインポートされたオブジェクト)
+    instance_type : str, optional
+        "COLLECTION" または "LINKED"
+
+    Returns
+    -------
+    InstancingResult
+        インスタンスにしたオブジェクトの数と削除したメッシュのサイズ
+    """
+
+    result = InstancingResult()
+    start_time = time.perf_counter()
+
+    # 名前順に並べ､番号の付いていない元のオブジェクトをインスタンス元にする
+    objects = sorted((o for o in objects if is_instanceable(o)), key=lambda o: o.name)
+    result.objects = len(objects)
+    mesh_hashes: dict[bpy.types.Mesh, str] = {}
+    groups: dict[tuple, list[bpy.types.Object]] = {}
+    for obj in objects:
+        mesh_hash = mesh_hashes.get(obj.data)
+        if mesh_hash is None:
+            mesh_hash = mesh_hashes[obj.data] = hash_mesh(obj.data)
+        groups.setdefault(get_object_signature(obj, mesh_hash), []).append(obj)
+
+    groups = {key: group for key, group in groups.items() if len(group) > 1}
+    if not groups:
+        result.elapsed = time.perf_counter() - start_time
+        return result
+
+    replaced_meshes: set[bpy.types.Mesh] = set()
+    replaced_objects: list[bpy.types.Object] = []
+    sources_collection = None
+    if instance_type == "COLLECTION":
+        sources_collection = get_instance_sources_collection(context)
+
+    for group in groups.values():
+        source = group[0]
+        result.sources += 1
+        result.instances += len(group)
+        if instance_type == "LINKED":
+            for obj in group:
+                if obj.data != source.data:
+                    replaced_meshes.add(obj.data)
+                    obj.data = source.data
+                set_instance_provenance(obj, obj, source)
+            continue
+
+        # インスタンス元も含めて全てのオブジェクトを同じ名前のエンプティに置き換える
+        source_name = source.name
+        source.name = source_name + INSTANCE_SOURCE_SUFFIX
+        collection = bpy.data.collections.new(source.name)
+        sources_collection.children.link(collection)
+        for obj in group:
+            if obj is source:
+                name = source_name
+            else:
+                name = obj.name
+                obj.name = name + REPLACED_SUFFIX
+                if obj.data != source.data:
+                    replaced_meshes.add(obj.data)
+                replaced_objects.append(obj)
+            instance = create_collection_instance(name, obj, collection)
+            set_instance_provenance(instance, obj, source)
+        move_to_source_collection(source, collection)
+
+    result.removed_objects = len(replaced_objects)
+    if replaced_objects:
+        bpy.data.batch_remove(replaced_objects)
+    unused_meshes = [mesh for mesh in replaced_meshes if not mesh.users]
+    result.removed_meshes = len(unused_meshes)
+    result.reclaimed_bytes = sum(get_mesh_data_size(mesh) for mesh in unused_meshes)
+    if unused_meshes:
+        bpy.data.batch_remove(unused_meshes)
+
+    result.elapsed = time.perf_counter() - start_time
+    logger.info("%s (%.3f sec)", result.describe(), result.elapsed)
+    return result
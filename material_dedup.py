@@ -0,0 +1,263 @@
+import bpy
+
+import hashlib
+import os
+import time
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import numpy as np
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+SIGNATURE_PROPERTY_TYPES = {"BOOLEAN", "INT", "FLOAT", "ENUM", "STRING", "POINTER"}
+# シェーダーの結果に影響しない表示用のプロパティ
+IGNORED_NODE_PROPERTIES = {
+    "name",
+    "label",
+    "location",
+    "location_absolute",
+    "width",
+    "width_hidden",
+    "height",
+    "dimensions",
+    "select",
+    "hide",
+    "show_options",
+    "show_preview",
+    "show_texture",
+    "color",
+    "use_custom_color",
+    "parent",
+    "warning_propagation",
+}
+IGNORED_MATERIAL_PROPERTIES = {
+    "name",
+    "name_full",
+    "use_fake_user",
+    "use_extra_user",
+    "tag",
+    "is_evaluated",
+    "preview_render_type",
+    "use_preview_world",
+    "paint_active_slot",
+    "paint_clone_slot",
+    "node_tree",
+    "library_weak_reference",
+}
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Signature
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def get_rna_values(struct: bpy.types.bpy_struct, ignored: set[str]) -> list[Any]:
+    # 編集可能なRNAプロパティの値を比較できる形で並べる｡データブロックへの参照は同一性で比較する
+    values = []
+    for prop in struct.bl_rna.properties:
+        if (
+            prop.identifier in ignored
+            or prop.is_readonly
+            or prop.type not in SIGNATURE_PROPERTY_TYPES
+        ):
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == "POINTER":
+            if not isinstance(value, bpy.types.ID):
+                continue
+            value = value.as_pointer()
+        elif prop.type == "ENUM" and prop.is_enum_flag:
+            value = tuple(sorted(value))
+        elif getattr(prop, "array_length", 0):
+            value = tuple(value)
+        values.append((prop.identifier, value))
+    return values
+
+
+def get_socket_value(socket: bpy.types.NodeSocket) -> Any:
+    value = getattr(socket, "default_value", None)
+    if isinstance(value, bpy.types.ID):
+        return value.as_pointer()
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(value)
+    return value
+
+
+def get_node_tree_signature(node_tree: bpy.types.NodeTree) -> list[Any]:
+    """
+    ノードツリーの構造を名前や配置に依存しない形で表す｡
+    ノードは種類と設定で並べ替え､リンクは並べ替えた後のインデックスで表す｡
+    """
+
+    nodes = []
+    for node in node_tree.nodes:
+        inputs = tuple(
+            (socket.identifier, get_socket_value(socket))
+            for socket in node.inputs
+            if not socket.is_linked
+        )
+        nodes.append(
+            (
+                repr((node.bl_idname, get_rna_values(node, IGNORED_NODE_PROPERTIES))),
+                inputs,
+                node,
+            )
+        )
+    nodes.sort(key=lambda item: (item[0], repr(item[1])))
+    node_indices = {item[2]: index for index, item in enumerate(nodes)}
+
+    links = sorted(
+        (
+            node_indices[link.from_node],
+            link.from_socket.identifier,
+            node_indices[link.to_node],
+            link.to_socket.identifier,
+            link.is_muted,
+        )
+        for link in node_tree.links
+    )
+    return [[(item[0], item[1]) for item in nodes], links]
+
+
+def get_material_signature(material: bpy.types.Material) -> str:
+    signature = [get_rna_values(material, IGNORED_MATERIAL_PROPERTIES)]
+    if material.use_nodes and material.node_tree is not None:
+        signature.append(get_node_tree_signature(material.node_tree))
+    return hashlib.blake2b(repr(signature).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_image_key(image: bpy.types.Image) -> tuple | None:
+    """
+    画像の内容を表すキー｡ファイルの画像は解決したパス､埋め込まれた画像はデータのハッシュ､
+    それ以外はピクセルのハッシュを使う｡比較できない画像はNoneを返す｡
+    """
+
+    settings = (image.source, image.colorspace_settings.name, image.alpha_mode)
+    if image.packed_file is not None:
+        digest = hashlib.blake2b(image.packed_file.data, digest_size=16).hexdigest()
+        return ("PACKED", digest, *settings)
+
+    if image.source in {"FILE", "SEQUENCE", "TILED"}:
+        if not image.filepath:
+            return None
+        filepath = bpy.path.abspath(image.filepath, library=image.library)
+        return ("FILE", os.path.normcase(os.path.realpath(filepath)), *settings)
+
+    if image.source == "GENERATED" and image.has_data:
+        pixels = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        digest = hashlib.blake2b(pixels, digest_size=16).hexdigest()
+        return ("PIXELS", tuple(image.size), digest, *settings)
+    return None
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Deduplication
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class ConsolidationResult:
+    images: int = 0
+    merged_images: int = 0
+    materials: int = 0
+    merged_materials: int = 0
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Merged {self.merged_images} of {self.images} images "
+            f"and {self.merged_materials} of {self.materials} materials"
+        )
+
+
+def merge_datablocks(
+    datablocks: list[bpy.types.ID], get_key: Callable[[bpy.types.ID], Any]
+) -> tuple[int, list[bpy.types.ID]]:
+    """
+    キーが同じデータブロックを1つにまとめる｡キーで振り分けるため比較は要素数に比例する｡
+    まとめられたデータブロックの使用者は残すデータブロックに付け替える｡
+    ファイルをまたいでまとめたマテリアルは､再インポートではそのファイルのスロットだけ付け替える｡
+
+    Returns
+    -------
+    tuple[int, list[bpy.types.ID]]
+        キーを計算したデータブロックの数と､削除するデータブロックのリスト
+    """
+
+    # 名前順に並べ､番号の付いていない元のデータブロックを残す
+    datablocks = sorted(
+        (d for d in datablocks if d.library is None and d.users),
+        key=lambda d: d.name,
+    )
+    keep_datablocks: dict[Any, bpy.types.ID] = {}
+    duplicates = []
+    for datablock in datablocks:
+        key = get_key(datablock)
+        if key is None:
+            continue
+        keep = keep_datablocks.setdefault(key, datablock)
+        if keep is datablock:
+            continue
+        datablock.user_remap(keep)
+        duplicates.append(datablock)
+    return len(datablocks), duplicates
+
+
+def consolidate_materials(
+    materials: Iterable[bpy.types.Material], images: Iterable[bpy.types.Image]
+) -> ConsolidationResult:
+    """
+    同じ画像を読み込んだ画像データブロックと､構造が同じマテリアルをまとめて削除する｡
+    画像を先にまとめることで､別々の画像を参照していたマテリアルも同じシグネチャになる｡
+
+    Parameters
+    ----------
+    materials : Iterable[bpy.types.Material]
+        重複を探すマテリアル
+    images : Iterable[bpy.types.Image]
+        重複を探す画像
+
+    Returns
+    -------
+    ConsolidationResult
+        まとめた画像とマテリアルの数
+    """
+
+    result = ConsolidationResult()
+    start_time = time.perf_counter()
+
+    result.images, duplicate_images = merge_datablocks([*images], get_image_key)
+    if duplicate_images:
+        bpy.data.batch_remove(duplicate_images)
+    result.merged_images = len(duplicate_images)
+
+    result.materials, duplicate_materials = merge_datablocks(
+        [*materials], get_material_signature
+    )
+    if duplicate_materials:
+        bpy.data.batch_remove(duplicate_materials)
+    result.merged_materials = len(duplicate_materials)
+
+    result.elapsed = time.perf_counter() - start_time
+    logger.info("%s (%.3f sec)", result.describe(), result.elapsed)
+    return result
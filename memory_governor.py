@@ -0,0 +1,278 @@
+import bpy
+
+import gc
+import math
+import time
+
+from dataclasses import dataclass
+
+from .fbx_metadata import FbxMetadata
+from .system_memory import get_available_memory, get_current_rss
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# インポート後にシーンに残るデータの見積もり (バイト)
+BYTES_PER_VERTEX = 256
+BYTES_PER_POLYGON = 128
+BYTES_PER_KEY = 96
+BYTES_PER_OBJECT = 8 * 1024
+# 埋め込まれた画像は展開されると圧縮時の数倍になる
+EMBEDDED_MEDIA_FACTOR = 4
+# ヘッダーを読めないファイル (ASCII FBXやVRM) はファイルサイズから見積もる
+FALLBACK_FILE_SIZE_FACTOR = 6
+# インポート中にだけ使われる一時的なメモリ (パース結果や展開した配列)
+TRANSIENT_FILE_SIZE_FACTOR = 3
+# RSSが上限を超えて一時停止した後､この割合まで下がったら再開する
+RESUME_RATIO = 0.95
+# 一時停止してからこの秒数が経っても下がらない場合はインポートを中止する
+PAUSE_TIMEOUT = 60.0
+
+
+def to_megabytes(value: int | float) -> float:
+    return value / 1024**2
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Estimate
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class MemoryEstimate:
+    filepath: str
+    resident: int
+    transient: int
+
+
+def estimate_import_memory(
+    filepath: str, file_size: int, metadata: FbxMetadata | None = None
+) -> MemoryEstimate:
+    """
+    ファイルのインポートに必要なメモリを見積もる｡
+
+    Parameters
+    ----------
+    filepath : str
+        インポートするファイルのパス
+    file_size : int
+        ファイルサイズ
+    metadata : FbxMetadata | None, optional
+        FBXのヘッダーから集計した内容｡無い場合はファイルサイズのみから見積もる
+
+    Returns
+    -------
+    MemoryEstimate
+        インポート後に残るメモリと､インポート中にだけ使われるメモリ
+    """
+
+    transient = file_size * TRANSIENT_FILE_SIZE_FACTOR
+    if metadata is None or metadata.error:
+        return MemoryEstimate(
+            filepath, file_size * FALLBACK_FILE_SIZE_FACTOR, transient
+        )
+
+    # ポリゴン数を数えていない場合は頂点数と同程度とみなす
+    polygons = metadata.polygons or metadata.vertices
+    resident = (
+        metadata.vertices * BYTES_PER_VERTEX
+        + polygons * BYTES_PER_POLYGON
+        + metadata.keys * BYTES_PER_KEY
+        + metadata.objects * BYTES_PER_OBJECT
+        + metadata.embedded_media_size * EMBEDDED_MEDIA_FACTOR
+    )
+    return MemoryEstimate(filepath, resident, transient)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Plan
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class MemoryPlan:
+    estimates: list[MemoryEstimate]
+    available: int | None
+    budget: int | None
+    # 1チャンクで処理する一時的なメモリの見積もり (0はチャンクに分けない)｡
+    # ワーカーの結果は大きいファイルから届くため､完了したジョブの見積もりの合計で区切る
+    chunk_transient: int = 0
+    is_refused: bool = False
+
+    @property
+    def resident_total(self) -> int:
+        return sum(e.resident for e in self.estimates)
+
+    @property
+    def transient_total(self) -> int:
+        return sum(e.transient for e in self.estimates)
+
+    @property
+    def chunk_count(self) -> int:
+        if not self.chunk_transient:
+            return 1
+        # 1つのチャンクには少なくとも1ファイルが含まれる
+        chunk_count = math.ceil(self.transient_total / self.chunk_transient)
+        return max(1, min(chunk_count, len(self.estimates)))
+
+    def describe(self) -> str:
+        if self.available is None:
+            return (
+                f"Estimated {to_megabytes(self.resident_total):.0f} MB "
+                "(available memory unknown)"
+            )
+        text = (
+            f"Estimated {to_megabytes(self.resident_total):.0f} MB "
+            f"(+{to_megabytes(self.transient_total):.0f} MB while importing), "
+            f"budget {to_megabytes(self.budget):.0f} MB "
+            f"of {to_megabytes(self.available):.0f} MB available"
+        )
+        if self.is_refused:
+            return f"Not enough memory for this import. {text}"
+        if self.chunk_transient:
+            return f"Import split into {self.chunk_count} chunks. {text}"
+        return text
+
+
+def plan_import_batch(
+    estimates: list[MemoryEstimate],
+    budget_ratio: float,
+    refuse_over_budget: bool,
+    available: int | None = None,
+) -> MemoryPlan:
+    """
+    バッチ全体の見積もりと空きメモリを比較し､インポートの方法を決める｡
+    インポート後に残るデータだけで予算を超える場合は拒否する (refuse_over_budget) か､
+    チャンクに分けて一時的なメモリのピークを抑える｡
+
+    Parameters
+    ----------
+    estimates : list[MemoryEstimate]
+        キューに追加する順の見積もり
+    budget_ratio : float
+        空きメモリのうちインポートに使ってよい割合
+    refuse_over_budget : bool
+        予算を超える場合にインポートを拒否する
+    available : int | None, optional
+        空きメモリ｡省略した場合はシステムから取得する
+
+    Returns
+    -------
+    MemoryPlan
+        1チャンクで処理する一時的なメモリの量と拒否するかどうか
+    """
+
+    if available is None:
+        available = get_available_memory()
+    if available is None:
+        return MemoryPlan(estimates, None, None)
+
+    plan = MemoryPlan(estimates, available, int(available * budget_ratio))
+    resident_total = plan.resident_total
+    if resident_total + plan.transient_total <= plan.budget:
+        return plan
+
+    if resident_total > plan.budget and refuse_over_budget:
+        plan.is_refused = True
+        return plan
+
+    # 一時的なメモリがチャンク内で積み重なっても予算に収まるように区切る｡
+    # 残るデータだけで予算を超える場合は1ファイル毎に区切る
+    plan.chunk_transient = max(plan.budget - resident_total, 1)
+    return plan
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Watchdog
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def purge_orphans() -> int:
+    """
+    使用者のいないデータブロックを再帰的に削除し､Pythonのガベージコレクションを行う｡
+    インポート前から存在していた孤立データも削除される｡
+    """
+
+    purged = bpy.data.orphans_purge(
+        do_local_ids=True, do_linked_ids=True, do_recursive=True
+    )
+    gc.collect()
+    logger.debug("Purge %d orphan datablocks", purged)
+    return purged
+
+
+class MemoryWatchdog:
+    """
+    バッチの処理中にプロセスのRSSを監視し､上限を超えたらキューを一時停止させる｡
+    PAUSE_TIMEOUTの間に下がらない場合はis_expiredを立て､呼び出し元にインポートを中止させる｡
+    """
+
+    def __init__(self, ceiling: int):
+        self.ceiling = ceiling
+        self.is_tripped: bool = False
+        self.is_expired: bool = False
+        self.tripped_time: float = 0.0
+        self.last_rss: int | None = None
+
+    def check(self) -> bool:
+        """
+        RSSを確認し､キューを停止すべき場合はTrueを返す｡
+        上限を超えた時は孤立データを削除してから再確認し､
+        停止後はRESUME_RATIOまで下がった時点で再開する｡
+        停止したまま時間切れになった場合は孤立データを削除し直し､それでも下がらなければ中止する｡
+        """
+
+        self.last_rss = get_current_rss()
+        if self.last_rss is None:
+            return False
+
+        if self.is_tripped:
+            if time.monotonic() - self.tripped_time > PAUSE_TIMEOUT:
+                purge_orphans()
+                self.last_rss = get_current_rss() or self.last_rss
+                if self.last_rss >= self.ceiling * RESUME_RATIO:
+                    self.is_expired = True
+                    logger.error(
+                        "Abort import : RSS %.0f MB stayed above %.0f MB for %.0f sec",
+                        to_megabytes(self.last_rss),
+                        to_megabytes(self.ceiling),
+                        PAUSE_TIMEOUT,
+                    )
+                    return self.is_tripped
+            if self.last_rss < self.ceiling * RESUME_RATIO:
+                self.is_tripped = False
+                logger.info("Resume import : RSS %.0f MB", to_megabytes(self.last_rss))
+            return self.is_tripped
+
+        if self.last_rss <= self.ceiling:
+            return False
+
+        purge_orphans()
+        self.last_rss = get_current_rss() or self.last_rss
+        if self.last_rss > self.ceiling:
+            self.is_tripped = True
+            self.tripped_time = time.monotonic()
+            logger.warning(
+                "Pause import : RSS %.0f MB exceeds %.0f MB",
+                to_megabytes(self.last_rss),
+                to_megabytes(self.ceiling),
+            )
+        return self.is_tripped
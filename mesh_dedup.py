@@ -0,0 +1,106 @@
+import bpy
+
+import time
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from .datablock_hash import get_mesh_data_size, hash_mesh
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Mesh Deduplication
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class DeduplicationResult:
+    hashed: int = 0
+    merged: int = 0
+    hashed_vertices: int = 0
+    reclaimed_bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def vertices_per_second(self) -> float:
+        if self.elapsed == 0:
+            return 0.0
+        return self.hashed_vertices / self.elapsed
+
+    def describe(self) -> str:
+        return (
+            f"Merged {self.merged} of {self.hashed} meshes, "
+            f"reclaimed {self.reclaimed_bytes / 1024 ** 2:.1f} MB"
+        )
+
+
+def get_weighted_meshes() -> set[bpy.types.Mesh]:
+    # ウェイトは属性として読めないため､頂点グループを持つオブジェクトのメッシュは共有しない
+    return {
+        obj.data for obj in bpy.data.objects if obj.type == "MESH" and obj.vertex_groups
+    }
+
+
+def deduplicate_meshes(meshes: Iterable[bpy.types.Mesh]) -> DeduplicationResult:
+    """
+    内容が同じメッシュを1つのデータブロックにまとめ､使われなくなったメッシュを削除する｡
+    マテリアルはメッシュに割り当てられているため､マテリアルの並びが同じものだけをまとめる｡
+
+    Parameters
+    ----------
+    meshes : Iterable[bpy.types.Mesh]
+        重複を探すメッシュ (バッチでインポートされたメッシュ)
+
+    Returns
+    -------
+    DeduplicationResult
+        まとめたメッシュの数と削除したデータのサイズ
+    """
+
+    result = DeduplicationResult()
+    start_time = time.perf_counter()
+    weighted_meshes = get_weighted_meshes()
+    meshes = [
+        mesh
+        for mesh in meshes
+        if mesh.library is None and mesh.users and mesh not in weighted_meshes
+    ]
+    # 名前順に並べ､番号の付いていない元のメッシュを残す
+    meshes.sort(key=lambda mesh: mesh.name)
+
+    keep_meshes: dict[tuple, bpy.types.Mesh] = {}
+    duplicates: list[bpy.types.Mesh] = []
+    for mesh in meshes:
+        key = (hash_mesh(mesh), tuple(mesh.materials))
+        result.hashed += 1
+        result.hashed_vertices += len(mesh.vertices)
+        keep_mesh = keep_meshes.setdefault(key, mesh)
+        if keep_mesh is mesh:
+            continue
+        result.reclaimed_bytes += get_mesh_data_size(mesh)
+        mesh.user_remap(keep_mesh)
+        duplicates.append(mesh)
+
+    if duplicates:
+        bpy.data.batch_remove(duplicates)
+    result.merged = len(duplicates)
+    result.elapsed = time.perf_counter() - start_time
+    logger.info(
+        "%s (%d vertices hashed in %.3f sec, %.0f vertices/sec)",
+        result.describe(),
+        result.hashed_vertices,
+        result.elapsed,
+        result.vertices_per_second,
+    )
+    return result
@@ -0,0 +1,48 @@
+"""
+バックグラウンドのBlenderで実行されるテクスチャのプロキシ作成用スクリプト｡
+アドオンからは読み込まれず､プロキシを作成するプロセスの起動時に --python で渡される｡
+
+blender --background --factory-startup --python proxy_worker_script.py -- <jobs.json>
+"""
+
+import bpy
+
+import json
+import sys
+
+
+def load_jobs() -> dict:
+    jobs_path = sys.argv[sys.argv.index("--") + 1]
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_proxy(job: dict):
+    image = bpy.data.images.load(job["source"])
+    try:
+        width, height = image.size
+        scale = job["size"] / max(width, height, 1)
+        # 既にプロキシのサイズ以下の画像は縮小せずに同じ形式で保存する
+        if scale < 1.0:
+            image.scale(max(1, round(width * scale)), max(1, round(height * scale)))
+        image.filepath_raw = job["output"]
+        image.file_format = job["file_format"]
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def main():
+    jobs_spec = load_jobs()
+    results = []
+    for job in jobs_spec["jobs"]:
+        try:
+            build_proxy(job)
+            results.append({"output": job["output"], "error": ""})
+        except (RuntimeError, OSError) as e:
+            results.append({"output": job["output"], "error": str(e)})
+    with open(jobs_spec["results"], "w", encoding="utf-8") as f:
+        json.dump(results, f)
+
+
+main()
@@ -0,0 +1,383 @@
+import bpy
+
+import os
+import re
+
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from .batch_staging import find_layer_collection
+from .datablock_hash import hash_mesh
+from .source_scanner import split_archive_member
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# インポート元を記録するカスタムプロパティ
+PROP_SOURCE = "dd_import_source"
+PROP_SOURCE_NAME = "dd_import_source_name"
+PROP_SOURCE_SIGNATURE = "dd_import_source_signature"
+
+REIMPORT_COLLECTION_NAME = "DDImport_Reimport"
+# 再インポート中に既存のオブジェクトに一時的に付ける名前の接頭辞
+TEMPORARY_NAME_PREFIX = "DDImport_Reimport_"
+# 名前が重複した時にBlenderが付ける番号
+NAME_SUFFIX_PATTERN = re.compile(r"\.\d{3,}$")
+# 再インポート後に使われなくなったデータブロックを探す対象
+CLEANUP_COLLECTIONS = ("meshes", "materials", "actions", "armatures", "images")
+
+
+def get_source_signature(source_path: str) -> str:
+    # アーカイブ内のファイルはアーカイブ自体の更新日時とサイズで判定する
+    archive_member = split_archive_member(source_path)
+    if archive_member is not None:
+        source_path = archive_member[0]
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def strip_name_suffix(name: str) -> str:
+    return NAME_SUFFIX_PATTERN.sub("", name)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Provenance
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def record_provenance(objects: Iterable[bpy.types.Object], source_path: str):
+    """
+    インポートされたオブジェクトと､そのマテリアルとアクションにインポート元のファイルを記録する｡
+
+    Parameters
+    ----------
+    objects : Iterable[bpy.types.Object]
+        インポートで作成されたオブジェクト
+    source_path : str
+        インポート元のファイルのパス (アーカイブ内のファイルは展開前のパス)
+    """
+
+    signature = get_source_signature(source_path)
+    for obj in objects:
+        obj[PROP_SOURCE] = source_path
+        obj[PROP_SOURCE_NAME] = obj.name
+        obj[PROP_SOURCE_SIGNATURE] = signature
+        for slot in obj.material_slots:
+            if slot.material is not None and not slot.material.library:
+                slot.material[PROP_SOURCE] = source_path
+        if obj.animation_data is not None and obj.animation_data.action is not None:
+            obj.animation_data.action[PROP_SOURCE] = source_path
+
+
+def find_tracked_objects(source_path: str) -> list[bpy.types.Object]:
+    return [obj for obj in bpy.data.objects if obj.get(PROP_SOURCE) == source_path]
+
+
+def get_tracked_sources() -> dict[str, str]:
+    # シーン内のインポート元と記録されたシグネチャ {パス: シグネチャ}
+    sources = {}
+    for obj in bpy.data.objects:
+        source_path = obj.get(PROP_SOURCE)
+        if source_path is not None:
+            sources.setdefault(source_path, obj.get(PROP_SOURCE_SIGNATURE, ""))
+    return sources
+
+
+def is_source_changed(
+    tracked_objects: list[bpy.types.Object], source_path: str
+) -> bool:
+    signature = get_source_signature(source_path)
+    return not signature or any(
+        obj.get(PROP_SOURCE_SIGNATURE) != signature for obj in tracked_objects
+    )
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Re-import
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class ReimportResult:
+    replaced_meshes: int = 0
+    skipped_meshes: int = 0
+    replaced_materials: int = 0
+    replaced_actions: int = 0
+    added_objects: int = 0
+    removed_datablocks: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"{self.replaced_meshes} meshes replaced, "
+            f"{self.skipped_meshes} unchanged, "
+            f"{self.replaced_materials} materials, "
+            f"{self.replaced_actions} actions, "
+            f"{self.added_objects} new objects"
+        )
+
+
+def replace_datablock(old: bpy.types.ID, new: bpy.types.ID):
+    # 古いデータブロックの全ての使用者を新しいデータブロックに付け替え､名前を引き継ぐ
+    name = old.name
+    old.user_remap(new)
+    old.name = f"{TEMPORARY_NAME_PREFIX}{name}"
+    new.name = name
+
+
+class InPlaceReimport:
+    """
+    変更されたファイルを一時的なコレクションにインポートし､
+    同じファイルから以前インポートされたオブジェクトのメッシュ､マテリアル､アクションだけを
+    user_remapで差し替える｡
+    既存のオブジェクトはそのまま残すため､モディファイアー､コンストレイント､親子関係､
+    トランスフォームは保持される｡内容のハッシュが一致するメッシュは差し替えない｡
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+        インポート先のコレクションを持つコンテキスト
+    source_path : str
+        インポート元のファイルのパス
+    tracked_objects : list[bpy.types.Object]
+        同じファイルから以前インポートされたオブジェクト
+    """
+
+    def __init__(
+        self,
+        context: bpy.types.Context,
+        source_path: str,
+        tracked_objects: list[bpy.types.Object],
+    ):
+        self.context = context
+        self.source_path = source_path
+        self.tracked_objects = tracked_objects
+        self.result = ReimportResult()
+        self._original_names: dict[bpy.types.Object, str] = {}
+        self._existing_ids: dict[str, set[bpy.types.ID]] = {}
+        # 差し替えで使われなくなった可能性があるデータブロック
+        self._cleanup_candidates: set[bpy.types.ID] = set()
+
+    def run(self, import_file: Callable[[], None]) -> ReimportResult:
+        view_layer = self.context.view_layer
+        active_layer_collection = view_layer.active_layer_collection
+        target_collection = self.context.collection
+        staging = bpy.data.collections.new(REIMPORT_COLLECTION_NAME)
+        self.context.scene.collection.children.link(staging)
+        view_layer.active_layer_collection = find_layer_collection(
+            view_layer.layer_collection, staging
+        )
+
+        # 既存のオブジェクトの名前を空けて､インポートされるオブジェクトがファイル内の名前になるようにする
+        for index, obj in enumerate(self.tracked_objects):
+            self._original_names[obj] = obj.name
+            obj.name = f"{TEMPORARY_NAME_PREFIX}{index}"
+        self._existing_ids = {
+            name: {*getattr(bpy.data, name)} for name in CLEANUP_COLLECTIONS
+        }
+        existing_objects = {*bpy.data.objects}
+        try:
+            import_file()
+            new_objects = [
+                obj for obj in bpy.data.objects if obj not in existing_objects
+            ]
+            self.swap_objects(new_objects, staging, target_collection)
+        finally:
+            for obj, name in self._original_names.items():
+                obj.name = name
+            bpy.data.collections.remove(staging)
+            view_layer.active_layer_collection = active_layer_collection
+
+        self.remove_unused_datablocks()
+        logger.info("Re-import %s : %s", self.source_path, self.result.describe())
+        return self.result
+
+    def swap_objects(
+        self,
+        new_objects: list[bpy.types.Object],
+        staging: bpy.types.Collection,
+        target_collection: bpy.types.Collection,
+    ):
+        tracked_by_name: dict[str, bpy.types.Object] = {}
+        tracked_by_stem: dict[str, bpy.types.Object] = {}
+        for obj in self.tracked_objects:
+            source_name = obj.get(PROP_SOURCE_NAME, self._original_names[obj])
+            tracked_by_name[source_name] = obj
+            tracked_by_stem.setdefault(strip_name_suffix(source_name), obj)
+
+        matches: dict[bpy.types.Object, bpy.types.Object] = {}
+        matched_objects: set[bpy.types.Object] = set()
+        for new_obj in new_objects:
+            old_obj = tracked_by_name.get(new_obj.name) or tracked_by_stem.get(
+                strip_name_suffix(new_obj.name)
+            )
+            # インスタンス化でエンプティに置き換えたオブジェクトはメッシュのオブジェクトとも照合する
+            if (
+                old_obj is None
+                or (
+                    old_obj.type != new_obj.type and old_obj.instance_collection is None
+                )
+                or old_obj in matched_objects
+            ):
+                continue
+            matches[new_obj] = old_obj
+            matched_objects.add(old_obj)
+
+        remapped_materials: dict[bpy.types.Material, bpy.types.Material] = {}
+        for new_obj, old_obj in matches.items():
+            old_obj[PROP_SOURCE_SIGNATURE] = get_source_signature(self.source_path)
+            # インスタンスは共有しているインスタンス元の形状を変えずにそのまま残す
+            if old_obj.type != new_obj.type:
+                continue
+            if new_obj.type == "MESH":
+                self.swap_mesh(old_obj, new_obj)
+            self.swap_materials(old_obj, new_obj, remapped_materials)
+            self.swap_action(old_obj, new_obj)
+
+        # 新しく追加されたオブジェクトはインポート先に移し､親が差し替え済みであれば既存の親に付け替える
+        added_objects = [obj for obj in new_objects if obj not in matches]
+        for obj in added_objects:
+            if obj.parent in matches:
+                matrix_world = obj.matrix_world.copy()
+                obj.parent = matches[obj.parent]
+                obj.matrix_world = matrix_world
+            if all(c == staging for c in obj.users_collection):
+                target_collection.objects.link(obj)
+        record_provenance(added_objects, self.source_path)
+        self.result.added_objects = len(added_objects)
+
+        for new_obj in matches:
+            bpy.data.objects.remove(new_obj)
+
+        # インポーターが作成したコレクションは新しいオブジェクトが残っている場合のみ移動する
+        for child in [*staging.children]:
+            if child.all_objects:
+                target_collection.children.link(child)
+            else:
+                bpy.data.collections.remove(child)
+
+    def swap_mesh(self, old_obj: bpy.types.Object, new_obj: bpy.types.Object):
+        old_mesh, new_mesh = old_obj.data, new_obj.data
+        if old_mesh is new_mesh:
+            return
+        if hash_mesh(old_mesh) == hash_mesh(new_mesh):
+            self.result.skipped_meshes += 1
+            self._cleanup_candidates.add(new_mesh)
+            return
+        if old_mesh.shape_keys is not None and old_mesh.shape_keys.animation_data:
+            if old_mesh.shape_keys.animation_data.action is not None:
+                self._cleanup_candidates.add(old_mesh.shape_keys.animation_data.action)
+        # 重複の削除やインスタンス化で他のファイルのオブジェクトと共有されているメッシュは
+        # このオブジェクトだけ付け替え､他のオブジェクトの形状は変えない
+        if old_mesh.users > 1:
+            old_obj.data = new_mesh
+        else:
+            replace_datablock(old_mesh, new_mesh)
+        # Blender 3.0以降は頂点グループの名前がメッシュに保存されるため､メッシュと一緒に入れ替わる
+        self._cleanup_candidates.add(old_mesh)
+        self.result.replaced_meshes += 1
+
+    def swap_materials(
+        self,
+        old_obj: bpy.types.Object,
+        new_obj: bpy.types.Object,
+        remapped_materials: dict[bpy.types.Material, bpy.types.Material],
+    ):
+        # インポートされたマテリアルだけを差し替え､ユーザーが割り当てたものは残す
+        for old_slot, new_slot in zip(old_obj.material_slots, new_obj.material_slots):
+            old_material, new_material = old_slot.material, new_slot.material
+            if (
+                old_material is None
+                or new_material is None
+                or old_material is new_material
+                or old_material.get(PROP_SOURCE) is None
+            ):
+                continue
+            new_material[PROP_SOURCE] = self.source_path
+            self._cleanup_candidates.update(get_material_images(old_material))
+            self._cleanup_candidates.add(old_material)
+            if old_material not in remapped_materials:
+                remapped_materials[old_material] = new_material
+                self.result.replaced_materials += 1
+            # 重複の削除で他のオブジェクトと共有されているマテリアルはこのオブジェクトのスロットだけ付け替え､
+            # 他のファイルのオブジェクトの見た目は変えない
+            if (
+                old_material.users > 1
+                or old_material.get(PROP_SOURCE) != self.source_path
+            ):
+                # 共有されているメッシュのマテリアルを変えないよう､オブジェクトのスロットに割り当てる
+                if old_slot.link == "DATA" and old_obj.data.users > 1:
+                    old_slot.link = "OBJECT"
+                old_slot.material = new_material
+            else:
+                replace_datablock(old_material, new_material)
+
+    def swap_action(self, old_obj: bpy.types.Object, new_obj: bpy.types.Object):
+        if new_obj.animation_data is None or new_obj.animation_data.action is None:
+            return
+        new_action = new_obj.animation_data.action
+        new_action[PROP_SOURCE] = self.source_path
+        old_action = None
+        if old_obj.animation_data is not None:
+            old_action = old_obj.animation_data.action
+        if old_action is new_action:
+            return
+        if old_action is None:
+            old_obj.animation_data_create().action = new_action
+        elif old_action.get(PROP_SOURCE) == self.source_path:
+            replace_datablock(old_action, new_action)
+            self._cleanup_candidates.add(old_action)
+        else:
+            return
+        self.result.replaced_actions += 1
+
+    def remove_unused_datablocks(self):
+        # シーン全体の孤立データは削除せず､この再インポートで不要になったものだけを削除する
+        for name in CLEANUP_COLLECTIONS:
+            existing = self._existing_ids[name]
+            self._cleanup_candidates.update(
+                datablock
+                for datablock in getattr(bpy.data, name)
+                if datablock not in existing
+            )
+        candidates = self._cleanup_candidates
+        # マテリアルを削除すると画像の使用者が減るため､削除できなくなるまで繰り返す
+        while True:
+            unused = {
+                datablock
+                for datablock in candidates
+                if datablock.users == 0 and not datablock.use_fake_user
+            }
+            if not unused:
+                break
+            candidates -= unused
+            bpy.data.batch_remove(unused)
+            self.result.removed_datablocks += len(unused)
+
+
+def get_material_images(material: bpy.types.Material) -> list[bpy.types.Image]:
+    if material.node_tree is None:
+        return []
+    return [
+        node.image
+        for node in material.node_tree.nodes
+        if node.type == "TEX_IMAGE" and node.image is not None
+    ]
@@ -0,0 +1,417 @@
+import hashlib
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+ARCHIVE_EXTENSIONS = (".zip",)
+# アーカイブからモデルと一緒に展開するテクスチャ
+IMAGE_EXTENSIONS = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".tga",
+    ".tif",
+    ".tiff",
+    ".bmp",
+    ".exr",
+    ".hdr",
+    ".dds",
+    ".psd",
+)
+ARCHIVE_CACHE_DIRECTORY = Path(tempfile.gettempdir(), "DDImport", "Archives")
+# アーカイブ内のファイルを表すパスの区切り (archive.zip::dir/model.fbx)
+ARCHIVE_MEMBER_SEPARATOR = "::"
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def is_scan_source(path: str) -> bool:
+    # フォルダとアーカイブは中身を走査してインポートするファイルを探す
+    return os.path.isdir(path) or (is_archive(path) and os.path.isfile(path))
+
+
+def classify_dropped_files(
+    directory: str, file_names: list[str]
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    ドロップされたファイルを走査するソース､FBX､VRMに振り分ける｡
+    ファイル名が無い場合はフォルダ自体がドロップ (または選択) されている｡
+
+    Parameters
+    ----------
+    directory : str
+        ファイルのあるフォルダ
+    file_names : list[str]
+        ドロップされたファイル名
+
+    Returns
+    -------
+    tuple[list[str], list[str], list[str]]
+        走査するフォルダとアーカイブのパス､FBXのファイル名､VRMのファイル名
+    """
+
+    sources = []
+    fbx_files = []
+    vrm_files = []
+    for file_name in [i for i in file_names if i] or [""]:
+        path = str(Path(directory, file_name))
+        if is_scan_source(path):
+            sources.append(path)
+            continue
+        match Path(file_name).suffix.lower():
+            case ".fbx":
+                fbx_files.append(file_name)
+            case ".vrm":
+                vrm_files.append(file_name)
+    return sources, fbx_files, vrm_files
+
+
+def split_archive_member(path: str) -> tuple[str, str] | None:
+    archive_path, separator, member = path.partition(ARCHIVE_MEMBER_SEPARATOR)
+    if not separator:
+        return None
+    return archive_path, member
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Scan
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def iter_directory_files(
+    directory: str, extensions: tuple[str, ...]
+) -> Iterator[os.DirEntry]:
+    """
+    os.scandirでフォルダを再帰的に走査し､拡張子が一致するファイルを見つけた順に返す｡
+    エントリの種類はscandirの結果から判定し､ファイル毎のstatは行わない｡
+    シンボリックリンクのフォルダはループを避けるために辿らない｡
+    """
+
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning("Failed to scan %s : %s", current, e)
+
+
+def iter_archive_members(
+    archive_path: str, extensions: tuple[str, ...]
+) -> Iterator[zipfile.ZipInfo]:
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(extensions):
+                    continue
+                if get_member_parts(info.filename) is None:
+                    logger.warning(
+                        "Skip unsafe member %s in %s", info.filename, archive_path
+                    )
+                    continue
+                yield info
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.warning("Failed to read archive %s : %s", archive_path, e)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Archive
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def get_archive_cache_directory(archive_path: str) -> Path:
+    # アーカイブが更新された場合は別のディレクトリに展開する
+    stat = os.stat(archive_path)
+    key = f"{Path(archive_path).resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return ARCHIVE_CACHE_DIRECTORY.joinpath(digest)
+
+
+def get_member_directory(member: str) -> str:
+    # アーカイブの直下は空文字で表す
+    directory = str(PurePosixPath(member).parent)
+    return "" if directory == "." else directory
+
+
+def is_in_directory(directory: str, parent: str) -> bool:
+    return not parent or directory == parent or directory.startswith(f"{parent}/")
+
+
+def get_member_parts(member: str) -> list[str] | None:
+    # 絶対パスとドライブ名は取り除き､".." を含むメンバーはキャッシュの外を指すためNoneを返す
+    parts = [p for p in member.replace("\\", "/").split("/") if p not in ("", ".")]
+    if parts and parts[0].endswith(":"):
+        parts = parts[1:]
+    if not parts or ".." in parts:
+        return None
+    return parts
+
+
+def get_member_target(cache_directory: Path, member: str) -> Path:
+    """
+    アーカイブのメンバーを展開するパスを返す｡
+
+    Raises
+    ------
+    ValueError
+        メンバーのパスがキャッシュディレクトリの外を指す場合
+    """
+
+    parts = get_member_parts(member)
+    if parts is None:
+        raise ValueError(f"Unsafe archive member : {member}")
+    target = cache_directory.joinpath(*parts)
+    if not target.resolve().is_relative_to(cache_directory.resolve()):
+        raise ValueError(f"Unsafe archive member : {member}")
+    return target
+
+
+def _extract_member(
+    archive: zipfile.ZipFile, info: zipfile.ZipInfo, cache_directory: Path
+) -> str:
+    target = get_member_target(cache_directory, info.filename)
+    # 展開済みで同じサイズのファイルがあれば再利用する
+    if target.is_file() and target.stat().st_size == info.file_size:
+        return str(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with archive.open(info) as source, open(target, "wb") as destination:
+        shutil.copyfileobj(source, destination)
+    return str(target)
+
+
+@dataclass
+class OpenArchive:
+    archive: zipfile.ZipFile
+    cache_directory: Path
+    # フォルダ毎の画像 {アーカイブ内のフォルダ: 画像}
+    images: dict[str, list[zipfile.ZipInfo]] = field(default_factory=dict)
+    # 画像を展開済みのフォルダ
+    extracted_directories: set[str] = field(default_factory=set)
+
+
+class ArchiveReader:
+    """
+    バッチの間アーカイブを開いたままにしてメンバーを展開する｡
+    メンバーの一覧はアーカイブを開いた時に1度だけ読んで画像をフォルダ毎にまとめ､
+    同じフォルダの画像は最初のメンバーを展開した時に1度だけ展開する｡
+    バッチの終了時にclose()で全てのアーカイブを閉じる｡
+    """
+
+    def __init__(self):
+        self._archives: dict[str, OpenArchive] = {}
+
+    def open(self, archive_path: str) -> OpenArchive:
+        opened = self._archives.get(archive_path)
+        if opened is not None:
+            return opened
+        cache_directory = get_archive_cache_directory(archive_path)
+        archive = zipfile.ZipFile(archive_path)
+        opened = OpenArchive(archive, cache_directory)
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            if get_member_parts(info.filename) is not None:
+                directory = get_member_directory(info.filename)
+                opened.images.setdefault(directory, []).append(info)
+        self._archives[archive_path] = opened
+        return opened
+
+    def extract(self, archive_path: str, member: str) -> str:
+        """
+        アーカイブから必要なファイルだけを一時キャッシュに展開する｡
+        モデルが参照するテクスチャのために､同じフォルダ以下の画像も一緒に展開する｡
+
+        Parameters
+        ----------
+        archive_path : str
+            アーカイブのパス
+        member : str
+            展開するファイルのアーカイブ内のパス
+
+        Returns
+        -------
+        str
+            展開されたファイルのパス
+        """
+
+        opened = self.open(archive_path)
+        extracted = _extract_member(
+            opened.archive, opened.archive.getinfo(member), opened.cache_directory
+        )
+        member_directory = get_member_directory(member)
+        for directory, infos in opened.images.items():
+            if directory in opened.extracted_directories or not is_in_directory(
+                directory, member_directory
+            ):
+                continue
+            for info in infos:
+                _extract_member(opened.archive, info, opened.cache_directory)
+            opened.extracted_directories.add(directory)
+        logger.debug("Extract %s from %s", member, archive_path)
+        return extracted
+
+    def close(self):
+        for opened in self._archives.values():
+            opened.archive.close()
+        self._archives.clear()
+
+
+archive_reader = ArchiveReader()
+
+
+def extract_archive_member(archive_path: str, member: str) -> str:
+    return archive_reader.extract(archive_path, member)
+
+
+def resolve_import_path(filepath: str) -> str:
+    """
+    アーカイブ内のファイルを表すパスであれば展開して実際のパスを返す｡
+    展開に失敗した場合はOSErrorを送出する｡
+    """
+
+    archive_member = split_archive_member(filepath)
+    if archive_member is None:
+        return filepath
+    try:
+        return extract_archive_member(*archive_member)
+    except (KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise OSError(f"Failed to extract {filepath} : {e}") from e
+
+
+def clear_archive_cache():
+    shutil.rmtree(ARCHIVE_CACHE_DIRECTORY, ignore_errors=True)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Scanner
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class SourceScanner:
+    """
+    ドロップされたフォルダとアーカイブを別スレッドで走査し､
+    見つかったファイルからジョブを作ってキューに流す｡
+    メインスレッドはdrain()で見つかった分だけを受け取り､走査の完了を待たずにインポートを始める｡
+
+    Parameters
+    ----------
+    sources : list[str]
+        走査するフォルダまたはアーカイブのパス
+    extensions : tuple[str, ...]
+        インポートするファイルの拡張子 (小文字)
+    make_job : Callable[[str, int], object]
+        ファイルパスとサイズからジョブを作る関数｡走査スレッドから呼び出される
+    """
+
+    def __init__(
+        self,
+        sources: list[str],
+        extensions: tuple[str, ...],
+        make_job: Callable[[str, int], object],
+    ):
+        self.sources = sources
+        self.extensions = extensions
+        self.make_job = make_job
+        self.found: int = 0
+        self.elapsed: float = 0.0
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="DDImportSourceScanner", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def is_finished(self) -> bool:
+        return not self._thread.is_alive() and self._results.empty()
+
+    def drain(self) -> list:
+        jobs = []
+        while True:
+            try:
+                jobs.append(self._results.get_nowait())
+            except queue.Empty:
+                return jobs
+
+    def _emit(self, filepath: str, file_size: int):
+        self.found += 1
+        self._results.put(self.make_job(filepath, file_size))
+
+    def _scan_archive(self, archive_path: str):
+        for info in iter_archive_members(archive_path, self.extensions):
+            if self._cancel_event.is_set():
+                return
+            self._emit(
+                f"{archive_path}{ARCHIVE_MEMBER_SEPARATOR}{info.filename}",
+                info.file_size,
+            )
+
+    def _run(self):
+        start_time = time.perf_counter()
+        scan_extensions = self.extensions + ARCHIVE_EXTENSIONS
+        for source in self.sources:
+            if is_archive(source):
+                self._scan_archive(source)
+                continue
+            for entry in iter_directory_files(source, scan_extensions):
+                if self._cancel_event.is_set():
+                    return
+                if is_archive(entry.name):
+                    self._scan_archive(entry.path)
+                    continue
+                try:
+                    file_size = entry.stat().st_size
+                except OSError:
+                    file_size = 0
+                self._emit(entry.path, file_size)
+        self.elapsed = time.perf_counter() - start_time
+        logger.info(
+            "Scan finished : %d files in %d sources (%.3f sec)",
+            self.found,
+            len(self.sources),
+            self.elapsed,
+        )
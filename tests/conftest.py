@@ -0,0 +1,60 @@
+import importlib.machinery
+import sys
+import tempfile
+import types
+
+from pathlib import Path
+from unittest import mock
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+# アドオンのフォルダ名はインストール先によって変わるため､テストでは固定の名前で読み込む
+PACKAGE_NAME = "dd_import"
+PACKAGE_DIRECTORY = Path(__file__).resolve().parent.parent
+LOG_DIRECTORY = Path(tempfile.gettempdir(), "DDImportTests")
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Stub
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def user_resource(resource_type: str, path: str = "", create: bool = False) -> str:
+    directory = LOG_DIRECTORY.joinpath(path)
+    if create:
+        directory.mkdir(parents=True, exist_ok=True)
+    return str(directory)
+
+
+def install_bpy_stub():
+    # Blenderの外ではbpyが無いため､モジュールの読み込みとテストで使う属性だけを用意する
+    bpy = mock.MagicMock(name="bpy")
+    bpy.app.version_string = "4.2.0"
+    bpy.app.background = True
+    bpy.utils.user_resource.side_effect = user_resource
+    sys.modules["bpy"] = bpy
+    sys.modules["addon_utils"] = mock.MagicMock(name="addon_utils")
+    sys.modules["mathutils"] = mock.MagicMock(name="mathutils")
+
+
+def install_package():
+    # __init__.pyは登録処理でbpyのクラスを継承するため実行せず､サブモジュールだけを読み込む
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [str(PACKAGE_DIRECTORY)]
+    package.__spec__ = importlib.machinery.ModuleSpec(
+        PACKAGE_NAME, None, is_package=True
+    )
+    package.__spec__.submodule_search_locations = package.__path__
+    package.__file__ = str(PACKAGE_DIRECTORY.joinpath("__init__.py"))
+    sys.modules[PACKAGE_NAME] = package
+    # pytestはアドオンのフォルダもパッケージとして読み込むため､フォルダ名でも同じものを返す
+    sys.modules.setdefault(PACKAGE_DIRECTORY.name, package)
+
+
+install_bpy_stub()
+install_package()
@@ -0,0 +1,78 @@
+import pytest
+
+from dd_import import addon_registry
+from dd_import.addon_registry import (
+    EnabledAddonRegistry,
+    install_addon_hooks,
+    remove_addon_hooks,
+)
+
+
+@pytest.fixture
+def addons(monkeypatch):
+    # bpy.context.preferences.addons の代わり (キーはモジュール名)
+    addons = dict.fromkeys(["io_scene_fbx", "bl_ext.user.better_fbx"])
+    monkeypatch.setattr(addon_registry.bpy.context.preferences, "addons", addons)
+    return addons
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = EnabledAddonRegistry()
+    monkeypatch.setattr(addon_registry, "enabled_addon_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def addon_utils(monkeypatch, addons):
+    def enable(module_name, **kwargs):
+        addons[module_name] = None
+
+    def disable(module_name, **kwargs):
+        addons.pop(module_name, None)
+
+    monkeypatch.setattr(addon_registry.addon_utils, "enable", enable)
+    monkeypatch.setattr(addon_registry.addon_utils, "disable", disable)
+    yield addon_registry.addon_utils
+    remove_addon_hooks()
+
+
+def test_queries_do_not_refresh(addons, registry):
+    for _ in range(10):
+        assert registry.is_better_fbx_available()
+        assert not registry.is_vrm_available()
+
+    assert registry.refresh_count == 1
+    assert registry.get_module_name("better_fbx") == "bl_ext.user.better_fbx"
+
+
+def test_hooks_invalidate_registry(addons, registry, addon_utils):
+    install_addon_hooks()
+    assert registry.is_better_fbx_available()
+
+    # 件数が変わらない有効化と無効化もフックで検出する
+    addon_utils.disable("bl_ext.user.better_fbx")
+    addon_utils.enable("vrm")
+
+    assert not registry.is_better_fbx_available()
+    assert registry.get_vrm_module_name() == "vrm"
+    assert registry.refresh_count == 2
+
+
+def test_remove_hooks_restores_functions(addons, registry, addon_utils):
+    enable = addon_utils.enable
+    install_addon_hooks()
+    install_addon_hooks()
+    assert addon_utils.enable is not enable
+
+    remove_addon_hooks()
+
+    assert addon_utils.enable is enable
+
+
+def test_count_change_without_hooks_refreshes(addons, registry):
+    assert not registry.is_enabled("rigify")
+
+    addons["rigify"] = None
+
+    assert registry.is_enabled("rigify")
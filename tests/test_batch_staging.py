@@ -0,0 +1,21 @@
+import types
+
+from unittest import mock
+
+from dd_import import batch_staging
+from dd_import.batch_staging import STAGING_REDRAW_INTERVAL, BatchStaging
+
+
+def test_redraw_is_throttled(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        batch_staging, "time", types.SimpleNamespace(monotonic=lambda: now[0])
+    )
+    staging = BatchStaging(mock.MagicMock())
+
+    assert staging.should_redraw()
+    assert not staging.should_redraw()
+    now[0] += STAGING_REDRAW_INTERVAL / 2
+    assert not staging.should_redraw()
+    now[0] += STAGING_REDRAW_INTERVAL
+    assert staging.should_redraw()
@@ -0,0 +1,208 @@
+import struct
+import zlib
+
+import pytest
+
+from dd_import.fbx_metadata import (
+    FBX_BINARY_MAGIC,
+    FBX_LARGE_HEADER_VERSION,
+    NODE_HEADER_32,
+    NODE_HEADER_64,
+    count_negative_int32,
+    read_fbx_metadata,
+)
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    FBX Writer
+------------------------------------------------------------
+---------------------------------------------------------"""
+ARRAY_FORMATS = {"d": "<d", "i": "<i", "l": "<q", "f": "<f"}
+
+
+def encode_property(type_code: str, value, compress: bool = False) -> bytes:
+    if type_code in ARRAY_FORMATS:
+        data = b"".join(struct.pack(ARRAY_FORMATS[type_code], v) for v in value)
+        if compress:
+            data = zlib.compress(data)
+        header = struct.pack("<III", len(value), int(compress), len(data))
+        return type_code.encode() + header + data
+    if type_code in "SR":
+        data = value.encode("utf-8") if isinstance(value, str) else value
+        return type_code.encode() + struct.pack("<I", len(data)) + data
+    formats = {"Y": "<h", "C": "<?", "I": "<i", "F": "<f", "D": "<d", "L": "<q"}
+    return type_code.encode() + struct.pack(formats[type_code], value)
+
+
+def encode_node(
+    header: struct.Struct,
+    offset: int,
+    name: str,
+    properties: list[tuple] = (),
+    children: list[tuple] = (),
+) -> bytes:
+    # EndOffsetはファイルの先頭からの位置のため､書き出す位置を渡しながら組み立てる
+    property_bytes = b"".join(encode_property(*p) for p in properties)
+    name_bytes = name.encode("ascii")
+    child_offset = offset + header.size + len(name_bytes) + len(property_bytes)
+    child_bytes = b""
+    for child in children:
+        child_bytes += encode_node(header, child_offset + len(child_bytes), *child)
+    if children:
+        child_bytes += bytes(header.size)
+    end_offset = child_offset + len(child_bytes)
+    return (
+        header.pack(end_offset, len(properties), len(property_bytes), len(name_bytes))
+        + name_bytes
+        + property_bytes
+        + child_bytes
+    )
+
+
+def encode_fbx(version: int, nodes: list[tuple]) -> bytes:
+    if version >= FBX_LARGE_HEADER_VERSION:
+        header = NODE_HEADER_64
+    else:
+        header = NODE_HEADER_32
+    data = FBX_BINARY_MAGIC + b"\x1a\x00" + struct.pack("<I", version)
+    for node in nodes:
+        data += encode_node(header, len(data), *node)
+    return data + bytes(header.size)
+
+
+def make_scene_nodes(compress: bool) -> list[tuple]:
+    def p(name: str, type_code: str, value) -> tuple:
+        return ("P", [("S", name), ("S", ""), ("S", ""), ("S", ""), (type_code, value)])
+
+    global_settings = (
+        "GlobalSettings",
+        [],
+        [
+            ("Version", [("I", 1000)]),
+            (
+                "Properties70",
+                [],
+                [
+                    p("UpAxis", "I", 2),
+                    p("UpAxisSign", "I", -1),
+                    p("UnitScaleFactor", "D", 100.0),
+                ],
+            ),
+        ],
+    )
+    geometry = (
+        "Geometry",
+        [("L", 1), ("S", "Cube\x00\x01Geometry"), ("S", "Mesh")],
+        [
+            ("Vertices", [("d", [0.0] * 24, compress)]),
+            # 4角形と3角形 (終端のインデックスは負の値)
+            ("PolygonVertexIndex", [("i", [0, 1, 2, -4, 4, 5, -7], compress)]),
+        ],
+    )
+    curve = (
+        "AnimationCurve",
+        [("L", 6), ("S", "\x00\x01AnimCurve"), ("S", "")],
+        [("KeyTime", [("l", [0, 100, 200], compress)])],
+    )
+    objects = (
+        "Objects",
+        [],
+        [
+            ("Model", [("L", 2), ("S", "Cube\x00\x01Model"), ("S", "Mesh")]),
+            ("Model", [("L", 3), ("S", "Hips\x00\x01Model"), ("S", "LimbNode")]),
+            geometry,
+            # メッシュ以外のジオメトリは数えない
+            ("Geometry", [("L", 4), ("S", "\x00\x01Geometry"), ("S", "Shape")]),
+            ("Material", [("L", 5), ("S", "Mat\x00\x01Material"), ("S", "")]),
+            ("Texture", [("L", 7), ("S", "Tex\x00\x01Texture"), ("S", "")]),
+            ("AnimationStack", [("L", 8), ("S", "Take\x00\x01AnimStack"), ("S", "")]),
+            curve,
+            ("Video", [("L", 9)], [("Content", [("R", bytes(1000))])]),
+        ],
+    )
+    return [
+        ("FBXHeaderExtension", [], [("FBXVersion", [("I", 7400)])]),
+        global_settings,
+        objects,
+    ]
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Tests
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@pytest.mark.parametrize("version", [7400, 7500])
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_fbx_metadata(tmp_path, version, compress):
+    filepath = tmp_path.joinpath("scene.fbx")
+    filepath.write_bytes(encode_fbx(version, make_scene_nodes(compress)))
+
+    metadata = read_fbx_metadata(str(filepath))
+
+    assert metadata.error == ""
+    assert metadata.version == version
+    assert metadata.file_size == filepath.stat().st_size
+    assert metadata.objects == 2
+    assert metadata.bones == 1
+    assert metadata.meshes == 1
+    assert metadata.vertices == 8
+    assert metadata.polygons == 2
+    assert metadata.materials == 1
+    assert metadata.textures == 1
+    assert metadata.animation_stacks == 1
+    assert metadata.animation_curves == 1
+    assert metadata.keys == 3
+    assert metadata.embedded_media_size == 1000
+    assert metadata.unit_scale == 100.0
+    assert metadata.axis == {"UpAxis": 2, "UpAxisSign": -1}
+
+
+def test_read_fbx_metadata_without_polygons(tmp_path):
+    filepath = tmp_path.joinpath("scene.fbx")
+    filepath.write_bytes(encode_fbx(7400, make_scene_nodes(compress=True)))
+
+    metadata = read_fbx_metadata(str(filepath), count_polygons=False)
+
+    assert metadata.error == ""
+    assert metadata.vertices == 8
+    assert metadata.polygons == 0
+
+
+@pytest.mark.parametrize("version", [7400, 7500])
+def test_read_fbx_metadata_truncated_file(tmp_path, version):
+    # ノードのEndOffsetがファイルの終端を超える
+    data = encode_fbx(version, make_scene_nodes(compress=False))
+    filepath = tmp_path.joinpath("truncated.fbx")
+    filepath.write_bytes(data[: len(data) // 2])
+
+    metadata = read_fbx_metadata(str(filepath))
+
+    assert "Invalid node end offset" in metadata.error
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"; FBX 7.4.0 project file\n", FBX_BINARY_MAGIC[:10]]
+)
+def test_read_fbx_metadata_rejects_non_binary_files(tmp_path, content):
+    filepath = tmp_path.joinpath("ascii.fbx")
+    filepath.write_bytes(content)
+
+    metadata = read_fbx_metadata(str(filepath))
+
+    assert metadata.error != ""
+    assert metadata.objects == 0
+
+
+def test_read_fbx_metadata_missing_file(tmp_path):
+    metadata = read_fbx_metadata(str(tmp_path.joinpath("missing.fbx")))
+
+    assert metadata.error != ""
+
+
+def test_count_negative_int32():
+    data = struct.pack("<8i", 0, -1, 2, -2147483648, 2147483647, -4, 5, 0)
+
+    assert count_negative_int32(data) == 3
@@ -0,0 +1,183 @@
+import os
+
+import pytest
+
+from dd_import import hot_folder
+from dd_import.hot_folder import STABLE_POLL_COUNT, HotFolderWatcher
+
+
+@pytest.fixture
+def watch_directory(tmp_path):
+    directory = tmp_path.joinpath("watch")
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def ready_files():
+    return []
+
+
+@pytest.fixture
+def watcher(watch_directory, ready_files):
+    watcher = HotFolderWatcher(str(watch_directory), ready_files.extend)
+    yield watcher
+    watcher.stop()
+
+
+def write_file(path, content: bytes = b"fbx"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def poll_until_stable(watcher: HotFolderWatcher) -> list[str]:
+    ready_files = []
+    for _ in range(STABLE_POLL_COUNT):
+        ready_files.extend(watcher.poll())
+    return ready_files
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Tests
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_existing_files_are_not_imported(watcher, watch_directory):
+    write_file(watch_directory.joinpath("old.fbx"))
+
+    watcher.start()
+
+    assert poll_until_stable(watcher) == []
+
+
+def test_existing_files_are_imported_on_request(watcher, watch_directory):
+    path = write_file(watch_directory.joinpath("old.fbx"))
+
+    watcher.start(import_existing=True)
+
+    assert poll_until_stable(watcher) == [path]
+
+
+def test_new_file_is_ready_after_stable_polls(watcher, watch_directory):
+    watcher.start()
+    path = write_file(watch_directory.joinpath("sub", "new.FBX"))
+    write_file(watch_directory.joinpath("sub", "note.txt"))
+
+    # 書き込みが完了したとみなすまでは渡さない
+    for _ in range(STABLE_POLL_COUNT - 1):
+        assert watcher.poll() == []
+    assert watcher.poll() == [path]
+    assert poll_until_stable(watcher) == []
+
+
+def test_growing_file_is_held_until_size_is_stable(watcher, watch_directory):
+    watcher.start()
+    path = watch_directory.joinpath("growing.fbx")
+    write_file(path, b"")
+
+    # 空のファイルは書き込み中とみなす
+    assert poll_until_stable(watcher) == []
+    for size in range(1, 4):
+        write_file(path, bytes(size * 100))
+        assert watcher.poll() == []
+    assert poll_until_stable(watcher) == [str(path)]
+
+
+def test_overwritten_file_is_imported_again(watcher, watch_directory):
+    path = write_file(watch_directory.joinpath("model.fbx"), b"first")
+    watcher.start()
+
+    # 上書きではフォルダの更新日時が変わらないため､最近のファイルとして確認される
+    write_file(watch_directory.joinpath("model.fbx"), b"second version")
+
+    assert poll_until_stable(watcher) == [path]
+
+
+def test_old_overwritten_file_is_found_by_full_rescan(watcher, watch_directory):
+    old_time = os.stat(watch_directory).st_mtime - hot_folder.RECENT_FILE_WINDOW * 2
+    path = write_file(watch_directory.joinpath("model.fbx"), b"first")
+    os.utime(path, (old_time, old_time))
+    watcher.start()
+    write_file(watch_directory.joinpath("model.fbx"), b"second version")
+    os.utime(path, (old_time + 1, old_time + 1))
+
+    # 最近のファイルではないため､全体を確認するまでは見つからない
+    assert poll_until_stable(watcher) == []
+    watcher._last_full_rescan -= hot_folder.FULL_RESCAN_INTERVAL
+
+    assert poll_until_stable(watcher) == [path]
+
+
+def test_deleted_and_recreated_file_is_imported(watcher, watch_directory):
+    path = write_file(watch_directory.joinpath("model.fbx"))
+    watcher.start()
+    os.remove(path)
+    assert poll_until_stable(watcher) == []
+    assert path not in watcher._index
+
+    write_file(watch_directory.joinpath("model.fbx"))
+
+    assert poll_until_stable(watcher) == [path]
+
+
+def test_deleted_folder_is_forgotten(watcher, watch_directory):
+    path = write_file(watch_directory.joinpath("sub", "model.fbx"))
+    watcher.start()
+    os.remove(path)
+    os.rmdir(watch_directory.joinpath("sub"))
+
+    assert poll_until_stable(watcher) == []
+    assert str(watch_directory.joinpath("sub")) not in watcher._directory_mtimes
+    assert watcher._index == {}
+
+
+def test_not_recursive(watch_directory):
+    watcher = HotFolderWatcher(str(watch_directory), print, recursive=False)
+    watcher.start()
+    try:
+        write_file(watch_directory.joinpath("sub", "model.fbx"))
+        top = write_file(watch_directory.joinpath("top.fbx"))
+
+        assert poll_until_stable(watcher) == [top]
+    finally:
+        watcher.stop()
+
+
+def test_tick_backs_off_while_idle(watcher, watch_directory, ready_files):
+    watcher.start()
+
+    intervals = [watcher._tick() for _ in range(6)]
+
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == hot_folder.MAX_POLL_INTERVAL
+
+    path = write_file(watch_directory.joinpath("new.fbx"))
+    assert watcher._tick() == hot_folder.MIN_POLL_INTERVAL
+    assert watcher._tick() == hot_folder.MIN_POLL_INTERVAL
+    assert ready_files == [path]
+
+
+def test_tick_continues_when_callback_raises(watch_directory):
+    received = []
+
+    def on_files_ready(files: list[str]):
+        received.extend(files)
+        raise RuntimeError("import failed")
+
+    watcher = HotFolderWatcher(str(watch_directory), on_files_ready)
+    watcher.start()
+    try:
+        first = write_file(watch_directory.joinpath("first.fbx"))
+        # 例外が起きてもタイマーの登録を解除しないよう間隔を返し続ける
+        for _ in range(STABLE_POLL_COUNT):
+            assert watcher._tick() == hot_folder.MIN_POLL_INTERVAL
+        second = write_file(watch_directory.joinpath("second.fbx"))
+        for _ in range(STABLE_POLL_COUNT):
+            assert watcher._tick() == hot_folder.MIN_POLL_INTERVAL
+    finally:
+        watcher.stop()
+
+    assert received == [first, second]
@@ -0,0 +1,189 @@
+import itertools
+import sys
+import types
+
+import pytest
+
+from dd_import import background_workers, import_cache
+from dd_import.import_cache import ImportCache
+
+KEYWORDS = {"global_scale": 1.0, "use_anim": True}
+
+
+@pytest.fixture(autouse=True)
+def importer_version(monkeypatch):
+    versions = {"BUILT_IN": "5.12.0", "BETTER_FBX": "6.1.0"}
+    monkeypatch.setattr(import_cache, "get_importer_version", versions.get)
+    return versions
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # 最後にアクセスした日時の順序を決めるため､呼び出す度に1秒進める
+    counter = itertools.count(1000)
+    clock = types.SimpleNamespace(time=lambda: float(next(counter)))
+    monkeypatch.setattr(import_cache, "time", clock)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ImportCache()
+    cache.set_directory(tmp_path.joinpath("cache"))
+    return cache
+
+
+def write_file(path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def store(cache: ImportCache, tmp_path, key: str, size: int) -> str:
+    blend_path = write_file(tmp_path.joinpath("worker", f"{key}.blend"), bytes(size))
+    return cache.store_file(key, blend_path, f"{key}.fbx")
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Key
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_key_depends_on_content_not_path(cache, tmp_path):
+    a = write_file(tmp_path.joinpath("a.fbx"), b"same")
+    b = write_file(tmp_path.joinpath("b.fbx"), b"same")
+    c = write_file(tmp_path.joinpath("c.fbx"), b"different")
+
+    key = cache.make_key(a, "BUILT_IN", KEYWORDS)
+
+    assert cache.make_key(b, "BUILT_IN", KEYWORDS) == key
+    assert cache.make_key(c, "BUILT_IN", KEYWORDS) != key
+
+
+def test_key_ignores_keyword_order(cache, tmp_path):
+    filepath = write_file(tmp_path.joinpath("a.fbx"), b"fbx")
+    reordered = dict(reversed([*KEYWORDS.items()]))
+
+    assert cache.make_key(filepath, "BUILT_IN", KEYWORDS) == cache.make_key(
+        filepath, "BUILT_IN", reordered
+    )
+    assert cache.make_key(filepath, "BUILT_IN", KEYWORDS) != cache.make_key(
+        filepath, "BUILT_IN", {**KEYWORDS, "global_scale": 0.01}
+    )
+
+
+def test_key_changes_with_importer_and_versions(
+    cache, tmp_path, importer_version, monkeypatch
+):
+    filepath = write_file(tmp_path.joinpath("a.fbx"), b"fbx")
+    key = cache.make_key(filepath, "BUILT_IN", KEYWORDS)
+
+    assert cache.make_key(filepath, "BETTER_FBX", KEYWORDS) != key
+
+    importer_version["BUILT_IN"] = "5.13.0"
+    assert cache.make_key(filepath, "BUILT_IN", KEYWORDS) != key
+
+    importer_version["BUILT_IN"] = "5.12.0"
+    monkeypatch.setattr(import_cache.bpy.app, "version_string", "4.3.0")
+    assert cache.make_key(filepath, "BUILT_IN", KEYWORDS) != key
+
+
+def test_file_hash_is_recomputed_when_file_changes(cache, tmp_path):
+    filepath = write_file(tmp_path.joinpath("a.fbx"), b"first")
+    first = cache.get_file_hash(filepath)
+
+    write_file(tmp_path.joinpath("a.fbx"), b"second version")
+
+    assert cache.get_file_hash(filepath) != first
+
+
+def test_get_importer_version(monkeypatch):
+    module = types.ModuleType("io_scene_fbx")
+    monkeypatch.setitem(sys.modules, "io_scene_fbx", module)
+    monkeypatch.setattr(
+        background_workers.addon_utils,
+        "module_bl_info",
+        lambda m: {"version": (5, 12, 3)} if m is module else {},
+    )
+
+    assert background_workers.get_importer_version("BUILT_IN") == "5.12.3"
+    monkeypatch.delitem(sys.modules, "io_scene_fbx")
+    assert background_workers.get_importer_version("BUILT_IN") == ""
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Lookup / Eviction
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_lookup(cache, tmp_path):
+    assert cache.lookup("a") is None
+    entry_path = store(cache, tmp_path, "a", 10)
+
+    assert cache.lookup("a") == entry_path
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lookup_forgets_missing_entry_file(cache, tmp_path):
+    entry_path = store(cache, tmp_path, "a", 10)
+    import_cache.os.remove(entry_path)
+
+    assert cache.lookup("a") is None
+    assert cache.entry_count == 0
+
+
+def test_evict_least_recently_used(cache, tmp_path):
+    cache.size_limit = 250
+    store(cache, tmp_path, "a", 100)
+    store(cache, tmp_path, "b", 100)
+    # aを使うとbの方が古くなる
+    cache.lookup("a")
+    store(cache, tmp_path, "c", 100)
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert cache.lookup("c") is not None
+    assert cache.total_size == 200
+    assert not cache.get_entry_path("b").exists()
+
+
+def test_evict_with_reserve_skips_protected_keys(tmp_path):
+    class ProtectedCache(ImportCache):
+        evict_on_add = False
+
+        def get_protected_keys(self) -> set[str]:
+            return {"a"}
+
+    cache = ProtectedCache()
+    cache.set_directory(tmp_path.joinpath("cache"))
+    cache.size_limit = 300
+    for key in "abc":
+        store(cache, tmp_path, key, 100)
+    assert cache.entry_count == 3
+
+    cache.evict(reserve=150)
+
+    # 最も古いaは使用中のため､次に古いbとcを削除する
+    assert cache.lookup("a") is not None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") is None
+
+
+def test_index_round_trip(cache, tmp_path):
+    source = write_file(tmp_path.joinpath("a.fbx"), b"fbx")
+    unused = write_file(tmp_path.joinpath("unused.fbx"), b"unused")
+    key = cache.make_key(source, "BUILT_IN", KEYWORDS)
+    cache.make_key(unused, "BUILT_IN", KEYWORDS)
+    blend_path = write_file(tmp_path.joinpath("worker", "a.blend"), bytes(10))
+    cache.store_file(key, blend_path, source)
+    cache.save_index()
+
+    reloaded = ImportCache()
+    reloaded.set_directory(cache.directory)
+
+    assert reloaded.lookup(key) == str(cache.get_entry_path(key))
+    # エントリーから参照されていないファイルのハッシュは保存しない
+    assert [*reloaded._file_hashes] == [source]
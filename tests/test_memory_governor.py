@@ -0,0 +1,134 @@
+import pytest
+
+from dd_import import memory_governor
+from dd_import.fbx_metadata import FbxMetadata
+from dd_import.memory_governor import (
+    BYTES_PER_OBJECT,
+    BYTES_PER_POLYGON,
+    BYTES_PER_VERTEX,
+    FALLBACK_FILE_SIZE_FACTOR,
+    TRANSIENT_FILE_SIZE_FACTOR,
+    MemoryEstimate,
+    MemoryPlan,
+    estimate_import_memory,
+    plan_import_batch,
+)
+
+MB = 1024**2
+
+
+def make_estimates(resident: int, transient: int, count: int) -> list[MemoryEstimate]:
+    return [MemoryEstimate(f"{i}.fbx", resident, transient) for i in range(count)]
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Estimate
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_estimate_from_file_size_without_metadata():
+    estimate = estimate_import_memory("a.fbx", 10 * MB)
+
+    assert estimate.resident == 10 * MB * FALLBACK_FILE_SIZE_FACTOR
+    assert estimate.transient == 10 * MB * TRANSIENT_FILE_SIZE_FACTOR
+
+
+def test_estimate_ignores_metadata_with_error():
+    metadata = FbxMetadata("a.fbx", vertices=1000, error="Not a binary FBX file")
+
+    estimate = estimate_import_memory("a.fbx", 10 * MB, metadata)
+
+    assert estimate.resident == 10 * MB * FALLBACK_FILE_SIZE_FACTOR
+
+
+def test_estimate_from_metadata():
+    metadata = FbxMetadata("a.fbx", objects=2, vertices=1000, polygons=500)
+
+    estimate = estimate_import_memory("a.fbx", MB, metadata)
+
+    assert estimate.resident == (
+        1000 * BYTES_PER_VERTEX + 500 * BYTES_PER_POLYGON + 2 * BYTES_PER_OBJECT
+    )
+    assert estimate.transient == MB * TRANSIENT_FILE_SIZE_FACTOR
+
+
+def test_estimate_uses_vertices_when_polygons_are_not_counted():
+    metadata = FbxMetadata("a.fbx", vertices=1000)
+
+    estimate = estimate_import_memory("a.fbx", MB, metadata)
+
+    assert estimate.resident == 1000 * (BYTES_PER_VERTEX + BYTES_PER_POLYGON)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Plan
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_plan_within_budget_is_not_chunked():
+    plan = plan_import_batch(
+        make_estimates(10 * MB, 10 * MB, 4), 0.5, False, available=200 * MB
+    )
+
+    assert plan.budget == 100 * MB
+    assert not plan.is_refused
+    assert plan.chunk_transient == 0
+    assert plan.chunk_count == 1
+
+
+def test_plan_splits_transient_memory_into_chunks():
+    # 残るデータ40MB､一時的なメモリ160MB､予算100MB → 1チャンクに60MBずつ
+    plan = plan_import_batch(
+        make_estimates(10 * MB, 40 * MB, 4), 0.5, False, available=200 * MB
+    )
+
+    assert not plan.is_refused
+    assert plan.chunk_transient == 60 * MB
+    assert plan.chunk_count == 3
+
+
+def test_plan_refuses_when_resident_data_exceeds_budget():
+    plan = plan_import_batch(
+        make_estimates(40 * MB, 10 * MB, 4), 0.5, True, available=200 * MB
+    )
+
+    assert plan.is_refused
+    assert "Not enough memory" in plan.describe()
+
+
+def test_plan_imports_one_file_per_chunk_when_resident_data_exceeds_budget():
+    plan = plan_import_batch(
+        make_estimates(40 * MB, 10 * MB, 4), 0.5, False, available=200 * MB
+    )
+
+    assert not plan.is_refused
+    assert plan.chunk_transient == 1
+    assert plan.chunk_count == 4
+
+
+def test_plan_without_available_memory(monkeypatch):
+    monkeypatch.setattr(memory_governor, "get_available_memory", lambda: None)
+
+    plan = plan_import_batch(make_estimates(10 * MB, 10 * MB, 4), 0.5, True)
+
+    assert plan.available is None
+    assert plan.budget is None
+    assert not plan.is_refused
+    assert plan.chunk_count == 1
+    assert "available memory unknown" in plan.describe()
+
+
+@pytest.mark.parametrize(
+    "chunk_transient, expected",
+    [(0, 1), (40 * MB, 1), (39 * MB, 2), (10 * MB, 4), (15 * MB, 3)],
+)
+def test_chunk_count(chunk_transient, expected):
+    plan = MemoryPlan(
+        make_estimates(0, 10 * MB, 4), 200 * MB, 100 * MB, chunk_transient
+    )
+
+    assert plan.chunk_count == expected
@@ -0,0 +1,297 @@
+import os
+import time
+import zipfile
+
+import pytest
+
+from dd_import import source_scanner
+from dd_import.source_scanner import (
+    ARCHIVE_MEMBER_SEPARATOR,
+    ArchiveReader,
+    SourceScanner,
+    classify_dropped_files,
+    get_member_directory,
+    get_member_target,
+    is_in_directory,
+    is_scan_source,
+    resolve_import_path,
+    split_archive_member,
+)
+
+SCAN_TIMEOUT = 10.0
+
+
+@pytest.fixture(autouse=True)
+def archive_cache_directory(tmp_path, monkeypatch):
+    directory = tmp_path.joinpath("archive_cache")
+    monkeypatch.setattr(source_scanner, "ARCHIVE_CACHE_DIRECTORY", directory)
+    return directory
+
+
+def write_file(path, content: bytes = b"data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def write_archive(path, members: dict[str, bytes]):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return path
+
+
+def run_scanner(sources: list[str], extensions: tuple[str, ...]) -> dict[str, int]:
+    scanner = SourceScanner(sources, extensions, lambda path, size: (path, size))
+    scanner.start()
+    jobs = []
+    deadline = time.monotonic() + SCAN_TIMEOUT
+    while not scanner.is_finished:
+        assert time.monotonic() < deadline, "Scanner did not finish"
+        jobs.extend(scanner.drain())
+        time.sleep(0.01)
+    jobs.extend(scanner.drain())
+    assert scanner.found == len(jobs)
+    return dict(jobs)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Paths
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_split_archive_member():
+    assert split_archive_member("a.zip::dir/model.fbx") == ("a.zip", "dir/model.fbx")
+    assert split_archive_member("dir/model.fbx") is None
+
+
+def test_is_scan_source(tmp_path):
+    archive = write_archive(tmp_path.joinpath("a.ZIP"), {"model.fbx": b"fbx"})
+    model = write_file(tmp_path.joinpath("model.fbx"))
+
+    assert is_scan_source(str(tmp_path))
+    assert is_scan_source(str(archive))
+    assert not is_scan_source(str(model))
+    assert not is_scan_source(str(tmp_path.joinpath("missing.zip")))
+
+
+def test_classify_dropped_folder(tmp_path):
+    folder = tmp_path.joinpath("drop")
+    folder.mkdir()
+
+    # ファイル名が無い場合はフォルダ自体を走査する
+    assert classify_dropped_files(str(folder), []) == ([str(folder)], [], [])
+    assert classify_dropped_files(str(folder), [""]) == ([str(folder)], [], [])
+
+
+def test_classify_dropped_files(tmp_path):
+    write_file(tmp_path.joinpath("sub", "model.fbx"))
+    archive = write_archive(tmp_path.joinpath("pack.zip"), {"model.fbx": b"fbx"})
+
+    sources, fbx_files, vrm_files = classify_dropped_files(
+        str(tmp_path), ["a.FBX", "b.vrm", "sub", "pack.zip", "note.txt"]
+    )
+
+    assert sources == [str(tmp_path.joinpath("sub")), str(archive)]
+    assert fbx_files == ["a.FBX"]
+    assert vrm_files == ["b.vrm"]
+
+
+@pytest.mark.parametrize(
+    "member, expected",
+    [("model.fbx", ""), ("a/model.fbx", "a"), ("a/b/model.fbx", "a/b")],
+)
+def test_get_member_directory(member, expected):
+    assert get_member_directory(member) == expected
+
+
+@pytest.mark.parametrize(
+    "directory, parent, expected",
+    [
+        ("a", "", True),
+        ("a", "a", True),
+        ("a/textures", "a", True),
+        ("ab/textures", "a", False),
+        ("", "a", False),
+    ],
+)
+def test_is_in_directory(directory, parent, expected):
+    assert is_in_directory(directory, parent) == expected
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Scanner
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_scan_folder(tmp_path):
+    root = tmp_path.joinpath("drop")
+    top = write_file(root.joinpath("top.fbx"), b"1")
+    nested = write_file(root.joinpath("a", "b", "Nested.FBX"), b"22")
+    write_file(root.joinpath("a", "readme.txt"))
+    write_file(root.joinpath("a", "texture.png"))
+
+    jobs = run_scanner([str(root)], (".fbx",))
+
+    assert jobs == {str(top): 1, str(nested): 2}
+
+
+def test_scan_archives_in_folder_and_dropped_archives(tmp_path):
+    root = tmp_path.joinpath("drop")
+    root.mkdir()
+    nested_archive = write_archive(
+        root.joinpath("pack.zip"),
+        {"models/a.fbx": b"aaa", "models/a.png": b"png", "b.vrm": b"v"},
+    )
+    dropped_archive = write_archive(
+        tmp_path.joinpath("dropped.zip"), {"c.fbx": b"cccc", "docs/": b""}
+    )
+
+    jobs = run_scanner([str(root), str(dropped_archive)], (".fbx", ".vrm"))
+
+    assert jobs == {
+        f"{nested_archive}{ARCHIVE_MEMBER_SEPARATOR}models/a.fbx": 3,
+        f"{nested_archive}{ARCHIVE_MEMBER_SEPARATOR}b.vrm": 1,
+        f"{dropped_archive}{ARCHIVE_MEMBER_SEPARATOR}c.fbx": 4,
+    }
+
+
+def test_scan_skips_broken_archives(tmp_path):
+    root = tmp_path.joinpath("drop")
+    model = write_file(root.joinpath("model.fbx"))
+    write_file(root.joinpath("broken.zip"), b"not a zip")
+
+    jobs = run_scanner([str(root)], (".fbx",))
+
+    assert [*jobs] == [str(model)]
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Archive
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_archive_reader_extracts_images_below_member_directory(tmp_path):
+    archive_path = str(
+        write_archive(
+            tmp_path.joinpath("pack.zip"),
+            {
+                "chara/model.fbx": b"fbx",
+                "chara/body.png": b"body",
+                "chara/textures/face.tga": b"face",
+                "other/other.png": b"other",
+                "root.jpg": b"root",
+            },
+        )
+    )
+    reader = ArchiveReader()
+    try:
+        extracted = reader.extract(archive_path, "chara/model.fbx")
+        cache_directory = reader.open(archive_path).cache_directory
+    finally:
+        reader.close()
+
+    assert extracted == os.path.join(cache_directory, "chara", "model.fbx")
+    assert cache_directory.joinpath("chara", "body.png").read_bytes() == b"body"
+    assert cache_directory.joinpath("chara", "textures", "face.tga").is_file()
+    assert not cache_directory.joinpath("other", "other.png").exists()
+    assert not cache_directory.joinpath("root.jpg").exists()
+
+
+def test_archive_reader_extracts_each_image_directory_once(tmp_path, monkeypatch):
+    archive_path = str(
+        write_archive(
+            tmp_path.joinpath("pack.zip"),
+            {"a.fbx": b"a", "b.fbx": b"b", "textures/t.png": b"t"},
+        )
+    )
+    extracted_members = []
+    extract_member = source_scanner._extract_member
+
+    def record_extract_member(archive, info, cache_directory):
+        extracted_members.append(info.filename)
+        return extract_member(archive, info, cache_directory)
+
+    monkeypatch.setattr(source_scanner, "_extract_member", record_extract_member)
+    reader = ArchiveReader()
+    try:
+        reader.extract(archive_path, "a.fbx")
+        reader.extract(archive_path, "b.fbx")
+        opened = reader.open(archive_path)
+        assert opened is reader.open(archive_path)
+        assert opened.extracted_directories == {"textures"}
+    finally:
+        reader.close()
+
+    assert extracted_members == ["a.fbx", "textures/t.png", "b.fbx"]
+    assert opened.archive.fp is None
+
+
+@pytest.mark.parametrize(
+    "member, expected",
+    [
+        ("a/model.fbx", ("a", "model.fbx")),
+        ("./a//model.fbx", ("a", "model.fbx")),
+        ("/abs/model.fbx", ("abs", "model.fbx")),
+        ("C:\\abs\\model.fbx", ("abs", "model.fbx")),
+    ],
+)
+def test_get_member_target(tmp_path, member, expected):
+    assert get_member_target(tmp_path, member) == tmp_path.joinpath(*expected)
+
+
+@pytest.mark.parametrize(
+    "member", ["../model.fbx", "a/../../model.fbx", "a\\..\\..\\model.fbx", "/"]
+)
+def test_get_member_target_rejects_unsafe_members(tmp_path, member):
+    with pytest.raises(ValueError):
+        get_member_target(tmp_path, member)
+
+
+def test_unsafe_archive_members_are_skipped(tmp_path, archive_cache_directory):
+    archive_path = str(
+        write_archive(
+            tmp_path.joinpath("pack.zip"),
+            {
+                "model.fbx": b"fbx",
+                "../evil.fbx": b"evil",
+                "../textures/evil.png": b"evil",
+            },
+        )
+    )
+
+    jobs = run_scanner([archive_path], (".fbx",))
+    reader = ArchiveReader()
+    try:
+        reader.extract(archive_path, "model.fbx")
+        with pytest.raises(ValueError):
+            reader.extract(archive_path, "../evil.fbx")
+    finally:
+        reader.close()
+
+    assert [*jobs] == [f"{archive_path}{ARCHIVE_MEMBER_SEPARATOR}model.fbx"]
+    assert not tmp_path.joinpath("evil.fbx").exists()
+    assert not archive_cache_directory.joinpath("evil.fbx").exists()
+    assert not tmp_path.joinpath("textures").exists()
+
+
+def test_resolve_import_path(tmp_path):
+    archive_path = write_archive(tmp_path.joinpath("pack.zip"), {"m.fbx": b"m"})
+    model = str(tmp_path.joinpath("model.fbx"))
+
+    try:
+        assert resolve_import_path(model) == model
+        extracted = resolve_import_path(f"{archive_path}::m.fbx")
+        assert open(extracted, "rb").read() == b"m"
+        with pytest.raises(OSError):
+            resolve_import_path(f"{archive_path}::missing.fbx")
+        with pytest.raises(OSError):
+            resolve_import_path(f"{archive_path}::../m.fbx")
+    finally:
+        source_scanner.archive_reader.close()
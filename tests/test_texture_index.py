@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from dd_import.texture_index import TextureIndex, get_file_name
+
+
+@pytest.fixture
+def texture_root(tmp_path):
+    root = tmp_path.joinpath("textures")
+    for path in (
+        "chara_a/Body.PNG",
+        "chara_b/body.png",
+        "props/metal.tga",
+        "props/metal.jpg",
+        "props/wood.dds",
+        "props/readme.txt",
+    ):
+        root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(path).write_bytes(b"image")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path, texture_root):
+    index = TextureIndex()
+    index.set_roots([str(texture_root)], tmp_path.joinpath("texture_index.json"))
+    index.refresh()
+    return index
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Lookup
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@pytest.mark.parametrize(
+    "filepath, expected",
+    [
+        ("C:\\Users\\artist\\wood.dds", "wood.dds"),
+        ("/home/artist/wood.dds", "wood.dds"),
+        ("wood.dds", "wood.dds"),
+    ],
+)
+def test_get_file_name(filepath, expected):
+    assert get_file_name(filepath) == expected
+
+
+def test_find_ignores_case_and_separators(index, texture_root):
+    assert index.find("C:\\work\\props\\WOOD.dds") == str(
+        texture_root.joinpath("props", "wood.dds")
+    )
+
+
+def test_find_prefers_longest_common_path(index, texture_root):
+    chara_a = os.path.join(texture_root, "chara_a", "Body.PNG")
+    chara_b = os.path.join(texture_root, "chara_b", "body.png")
+
+    assert index.find(os.path.join(texture_root, "chara_b", "BODY.png")) == chara_b
+    assert index.find(os.path.join(texture_root, "chara_a", "body.png")) == chara_a
+    # 共通する部分が同じ長さであれば名前順で先のものを選ぶ
+    assert index.find("D:/elsewhere/body.png") == min(chara_a, chara_b)
+
+
+def test_find_falls_back_to_other_extensions(index, texture_root):
+    # 拡張子だけが異なる画像はIMAGE_EXTENSIONSの順 (.jpgが.tgaより先) で選ぶ
+    assert index.find("metal.png") == str(texture_root.joinpath("props", "metal.jpg"))
+    assert index.find("wood.png") == str(texture_root.joinpath("props", "wood.dds"))
+
+
+def test_find_missing(index):
+    assert index.find("missing.png") is None
+    assert index.find("readme.png") is None
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Refresh
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_refresh_scans_only_changed_folders(index, texture_root):
+    assert index.file_count == 5
+    assert index.refresh() == 0
+
+    texture_root.joinpath("props", "stone.png").write_bytes(b"image")
+
+    assert index.refresh() == 1
+    assert index.find("stone.png") == str(texture_root.joinpath("props", "stone.png"))
+
+
+def test_refresh_removes_deleted_folders(index, texture_root):
+    os.remove(texture_root.joinpath("chara_b", "body.png"))
+    os.rmdir(texture_root.joinpath("chara_b"))
+
+    index.refresh()
+
+    assert index.find("chara_b/body.png") == str(
+        texture_root.joinpath("chara_a", "Body.PNG")
+    )
+
+
+def test_index_is_loaded_from_cache(index, texture_root):
+    reloaded = TextureIndex()
+    reloaded.set_roots([str(texture_root)], index.cache_path)
+
+    assert reloaded.refresh() == 0
+    assert reloaded.file_count == index.file_count
+    assert reloaded.find("wood.dds") == str(texture_root.joinpath("props", "wood.dds"))
+
+
+def test_clear(index):
+    index.clear()
+
+    assert index.file_count == 0
+    assert index.find("wood.dds") is None
+    assert not index.cache_path.exists()
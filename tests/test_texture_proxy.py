@@ -0,0 +1,126 @@
+import os
+import stat
+import time
+
+from unittest import mock
+
+import pytest
+
+from dd_import import texture_proxy
+from dd_import.texture_proxy import (
+    PendingProxyBuild,
+    ProxyBuild,
+    ProxyJob,
+    cancel_proxy_builds,
+    get_building_image_uids,
+)
+
+BUILD_TIMEOUT = 10.0
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="Uses a shell script")
+
+
+@pytest.fixture
+def make_blender(tmp_path):
+    # 引数を無視して指定したコマンドを実行するBlenderの代わり
+    def make_blender(script: str) -> str:
+        path = tmp_path.joinpath("blender")
+        path.write_text(f"#!/bin/sh\n{script}\n")
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        return str(path)
+
+    return make_blender
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    jobs = []
+    for name in ("a.png", "b.png", "c.png"):
+        source = tmp_path.joinpath(name)
+        source.write_bytes(b"image")
+        jobs.append(ProxyJob(str(source), f"key_{name}", 512))
+    return jobs
+
+
+@pytest.fixture(autouse=True)
+def pending_builds():
+    yield texture_proxy._pending_builds
+    cancel_proxy_builds()
+
+
+def wait_for_build(build: ProxyBuild):
+    deadline = time.monotonic() + BUILD_TIMEOUT
+    while not build.poll():
+        assert time.monotonic() < deadline, "Build did not finish"
+        time.sleep(0.01)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Tests
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def test_build_reports_failed_processes(make_blender, jobs):
+    build = ProxyBuild(make_blender("exit 3"), jobs, max_workers=2)
+    try:
+        wait_for_build(build)
+
+        assert build.collect() == []
+        assert {job.error for job in jobs} == {"exit code 3"}
+    finally:
+        build.cleanup()
+    assert not build.temp_directory.exists()
+
+
+def test_poll_does_not_block_and_stops_timed_out_processes(
+    make_blender, jobs, monkeypatch
+):
+    build = ProxyBuild(make_blender("exec sleep 30"), jobs, max_workers=1)
+    try:
+        # ポーリングはプロセスの終了を待たずに戻る
+        start_time = time.monotonic()
+        assert not build.poll()
+        assert time.monotonic() - start_time < 1.0
+
+        monkeypatch.setattr(texture_proxy, "PROXY_JOB_TIMEOUT", 0.0)
+
+        assert build.poll()
+        assert build.collect() == []
+        assert all(job.error.startswith("timed out") for job in jobs)
+    finally:
+        build.cancel()
+        build.cleanup()
+
+
+def test_timer_finishes_pending_builds(make_blender, jobs, pending_builds):
+    build = ProxyBuild(make_blender("exit 1"), jobs, max_workers=1)
+    cache = mock.MagicMock()
+    pending_builds.append(
+        PendingProxyBuild(
+            build, cache, {job.source: [index] for index, job in enumerate(jobs)}, 0.0
+        )
+    )
+    assert get_building_image_uids() == {0, 1, 2}
+
+    deadline = time.monotonic() + BUILD_TIMEOUT
+    while texture_proxy._poll_proxy_builds() is not None:
+        assert time.monotonic() < deadline, "Build did not finish"
+        time.sleep(0.01)
+
+    assert pending_builds == []
+    assert get_building_image_uids() == set()
+    cache.save_index.assert_called_once()
+    assert not build.temp_directory.exists()
+
+
+def test_cancel_stops_running_builds(make_blender, jobs, pending_builds):
+    build = ProxyBuild(make_blender("exec sleep 30"), jobs, max_workers=1)
+    pending_builds.append(PendingProxyBuild(build, mock.MagicMock(), {}, 0.0))
+
+    cancel_proxy_builds()
+
+    assert pending_builds == []
+    assert build.poll()
+    assert not build.temp_directory.exists()
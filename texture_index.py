@@ -0,0 +1,284 @@
+import bpy
+
+import json
+import os
+import re
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from .source_scanner import IMAGE_EXTENSIONS
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+INDEX_FILE_NAME = "texture_index.json"
+INDEX_VERSION = 1
+# FBXに記録されたパスは別のOSで作られている場合があるため､どちらの区切りでも分割する
+PATH_SEPARATOR_PATTERN = re.compile(r"[\\/]")
+
+
+def get_file_name(filepath: str) -> str:
+    return PATH_SEPARATOR_PATTERN.split(filepath)[-1]
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Texture Index
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class DirectoryEntry:
+    mtime: int
+    files: list[str] = field(default_factory=list)
+    subdirectories: list[str] = field(default_factory=list)
+
+
+class TextureIndex:
+    """
+    テクスチャのルートフォルダ以下の画像ファイルを ファイル名 → パス で引ける索引｡
+    フォルダ毎の内容と更新日時をディスクに保存し､更新時はフォルダのstatだけを確認して
+    更新日時が変わったフォルダのみを走査し直す｡
+    """
+
+    def __init__(self):
+        self.roots: tuple[str, ...] = ()
+        self.cache_path: Path | None = None
+        self._directories: dict[str, DirectoryEntry] = {}
+        # 小文字のファイル名 → パス､小文字の拡張子を除いた名前 → パス
+        self._names: dict[str, list[str]] = {}
+        self._stems: dict[str, list[str]] = {}
+        self._is_loaded: bool = False
+
+    @property
+    def file_count(self) -> int:
+        return sum(len(entry.files) for entry in self._directories.values())
+
+    def set_roots(self, roots: Iterable[str], cache_path: Path):
+        self.roots = tuple(roots)
+        if cache_path != self.cache_path:
+            self.cache_path = cache_path
+            self._is_loaded = False
+
+    # ----------------------------------------------------------
+    #    Cache
+    # ----------------------------------------------------------
+    def load(self):
+        self._is_loaded = True
+        self._directories.clear()
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        for directory, entry in data.get("directories", {}).items():
+            self._directories[directory] = DirectoryEntry(
+                entry["mtime"], entry["files"], entry["subdirectories"]
+            )
+        self.rebuild_lookup()
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "directories": {
+                directory: {
+                    "mtime": entry.mtime,
+                    "files": entry.files,
+                    "subdirectories": entry.subdirectories,
+                }
+                for directory, entry in self._directories.items()
+            },
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.warning("Failed to save texture index : %s", e)
+
+    def clear(self):
+        self._directories.clear()
+        self._names.clear()
+        self._stems.clear()
+        self._is_loaded = True
+        if self.cache_path is not None:
+            self.cache_path.unlink(missing_ok=True)
+
+    # ----------------------------------------------------------
+    #    Scan
+    # ----------------------------------------------------------
+    def refresh(self) -> int:
+        """
+        ルートフォルダ以下の索引を最新にする｡
+        更新日時が変わったフォルダのみを走査し､走査したフォルダの数を返す｡
+        """
+
+        if not self._is_loaded:
+            self.load()
+
+        start_time = time.perf_counter()
+        visited = set()
+        scanned = 0
+        stack = [os.path.normpath(root) for root in self.roots]
+        while stack:
+            directory = stack.pop()
+            if directory in visited:
+                continue
+            visited.add(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            entry = self._directories.get(directory)
+            if entry is None or entry.mtime != mtime:
+                entry = self._scan_directory(directory, mtime)
+                self._directories[directory] = entry
+                scanned += 1
+            stack.extend(entry.subdirectories)
+
+        # ルートから辿れなくなったフォルダを取り除く
+        removed = [d for d in self._directories if d not in visited]
+        for directory in removed:
+            del self._directories[directory]
+
+        if scanned or removed:
+            self.rebuild_lookup()
+            self.save()
+        logger.info(
+            "Refresh texture index : %d of %d folders scanned, %d files (%.3f sec)",
+            scanned,
+            len(visited),
+            self.file_count,
+            time.perf_counter() - start_time,
+        )
+        return scanned
+
+    def _scan_directory(self, directory: str, mtime: int) -> DirectoryEntry:
+        entry = DirectoryEntry(mtime)
+        try:
+            with os.scandir(directory) as entries:
+                for dir_entry in entries:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            entry.subdirectories.append(dir_entry.path)
+                        elif dir_entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            entry.files.append(dir_entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning("Failed to scan %s : %s", directory, e)
+        return entry
+
+    def rebuild_lookup(self):
+        self._names.clear()
+        self._stems.clear()
+        for directory, entry in self._directories.items():
+            for file_name in entry.files:
+                path = os.path.join(directory, file_name)
+                lower_name = file_name.lower()
+                self._names.setdefault(lower_name, []).append(path)
+                self._stems.setdefault(os.path.splitext(lower_name)[0], []).append(path)
+
+    # ----------------------------------------------------------
+    #    Lookup
+    # ----------------------------------------------------------
+    def find(self, filepath: str) -> str | None:
+        """
+        パスのファイル名 (大文字小文字を区別しない) から画像を探す｡
+        同じ名前が無い場合は拡張子だけが異なる画像を IMAGE_EXTENSIONS の順で探す｡
+        候補が複数ある場合は元のパスと共通する部分が長いものを選ぶ｡
+        """
+
+        lower_name = get_file_name(filepath).lower()
+        candidates = self._names.get(lower_name)
+        if not candidates:
+            stem_candidates = self._stems.get(os.path.splitext(lower_name)[0])
+            if not stem_candidates:
+                return None
+            for extension in IMAGE_EXTENSIONS:
+                candidates = [
+                    path for path in stem_candidates if path.lower().endswith(extension)
+                ]
+                if candidates:
+                    break
+        if len(candidates) == 1:
+            return candidates[0]
+
+        original = filepath.replace("\\", "/").lower()
+        return max(
+            sorted(candidates),
+            key=lambda path: len(
+                os.path.commonprefix([path.replace("\\", "/").lower(), original])
+            ),
+        )
+
+
+texture_search_index = TextureIndex()
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def resolve_missing_images(
+    images: Iterable[bpy.types.Image], index: TextureIndex
+) -> tuple[int, int]:
+    """
+    ファイルが見つからない画像のパスを索引から探して置き換える｡
+
+    Parameters
+    ----------
+    images : Iterable[bpy.types.Image]
+        確認する画像 (バッチでインポートされた画像)
+    index : TextureIndex
+        更新済みのテクスチャの索引
+
+    Returns
+    -------
+    tuple[int, int]
+        見つかった画像の数と､見つからなかった画像の数
+    """
+
+    resolved = 0
+    missing = 0
+    for image in images:
+        if (
+            image.source != "FILE"
+            or image.packed_file is not None
+            or image.library is not None
+            or not image.filepath
+        ):
+            continue
+        if os.path.exists(bpy.path.abspath(image.filepath)):
+            continue
+        found = index.find(image.filepath)
+        if found is None:
+            missing += 1
+            logger.debug("Texture not found : %s", image.filepath)
+            continue
+        image.filepath = found
+        image.reload()
+        resolved += 1
+    logger.info("Resolve textures : %d found, %d missing", resolved, missing)
+    return resolved, missing
@@ -0,0 +1,199 @@
+import bpy
+
+import concurrent.futures
+import os
+import time
+
+from dataclasses import dataclass
+from typing import Iterable
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+# 同時に読み込み中にするファイル数はスレッド数のこの倍数までにする
+PENDING_FACTOR = 2
+
+
+def get_default_preload_threads() -> int:
+    # ファイルの読み込みはI/O待ちが主なため､CPU数より多めのスレッドで並列に読む
+    return min(16, (os.cpu_count() or 2) * 2)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+def read_image_file(filepath: str) -> int:
+    # ファイル全体を読み込んでOSのキャッシュに載せ､読み込んだバイト数を返す｡
+    # 読み込みはGILを解放するため､スレッドで並列に実行できる
+    size = 0
+    buffer = bytearray(READ_CHUNK_SIZE)
+    with open(filepath, "rb", buffering=0) as f:
+        while read := f.readinto(buffer):
+            size += read
+    return size
+
+
+def get_prefetch_targets(images: Iterable[bpy.types.Image]) -> dict[str, list]:
+    # 同じファイルを参照する画像は1度だけ読み込む {ファイルパス: [画像]}
+    targets: dict[str, list[bpy.types.Image]] = {}
+    for image in images:
+        if (
+            image.source != "FILE"
+            or image.packed_file is not None
+            or image.has_data
+            or not image.filepath
+        ):
+            continue
+        filepath = bpy.path.abspath(image.filepath, library=image.library)
+        if os.path.isfile(filepath):
+            targets.setdefault(filepath, []).append(image)
+    return targets
+
+
+def load_image_buffers(images: list[bpy.types.Image], upload_to_gpu: bool) -> int:
+    # 画像のサイズを参照するとBlenderがファイルをデコードしてImBufを作る｡
+    # デコードはbpyのデータを変更するためメインスレッドでのみ行える｡デコードしたピクセル数を返す
+    if upload_to_gpu:
+        import gpu
+    pixels = 0
+    for image in images:
+        width, height = image.size
+        pixels += width * height
+        if upload_to_gpu:
+            gpu.texture.from_image(image)
+    return pixels
+
+
+@dataclass
+class PrefetchResult:
+    images: int = 0
+    failed: int = 0
+    total_bytes: int = 0
+    # デコードした画像のファイルのバイト数とピクセル数
+    decoded_bytes: int = 0
+    decoded_pixels: int = 0
+    # メインスレッドでのデコード (とGPUへの転送) にかかった時間
+    decode_time: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def read_throughput(self) -> float:
+        # デコード中も読み込みは進むため､デコード以外の時間で割った目安の MB/s
+        read_time = self.elapsed - self.decode_time
+        if read_time <= 0:
+            return 0.0
+        return self.total_bytes / 1024**2 / read_time
+
+    @property
+    def decode_throughput(self) -> float:
+        # メインスレッドで1秒間にデコードしたファイルの MB/s
+        if self.decode_time <= 0:
+            return 0.0
+        return self.decoded_bytes / 1024**2 / self.decode_time
+
+    @property
+    def decode_pixel_rate(self) -> float:
+        # メインスレッドで1秒間にデコードしたメガピクセル数
+        if self.decode_time <= 0:
+            return 0.0
+        return self.decoded_pixels / 1e6 / self.decode_time
+
+    def describe(self) -> str:
+        return (
+            f"Prefetched {self.images} textures "
+            f"({self.total_bytes / 1024 ** 2:.1f} MB, "
+            f"decoded in {self.decode_time:.2f} sec at "
+            f"{self.decode_throughput:.1f} MB/s)"
+        )
+
+
+def prefetch_images(
+    images: Iterable[bpy.types.Image], max_threads: int, upload_to_gpu: bool = False
+) -> PrefetchResult:
+    """
+    画像ファイルをスレッドプールで並列に読み込んでOSのキャッシュに載せ､
+    読み込みが完了したものからメインスレッドでImBufを作成する｡
+    デコードはBlenderの画像データを作るためメインスレッドでしか行えず､
+    最初の描画で払うデコードのコストはバッチの終了時に移るだけで､
+    短縮されるのはファイルの読み込みを並列にした分である｡デコードの速度は結果に記録する｡
+    スレッドではファイルの読み込みのみを行い､bpyのデータには触れない｡
+    同時に読み込むファイル数はスレッド数に比例する数までに制限する｡
+
+    Parameters
+    ----------
+    images : Iterable[bpy.types.Image]
+        読み込む画像 (バッチでインポートされた画像)
+    max_threads : int
+        ファイルを読み込むスレッドの最大数
+    upload_to_gpu : bool, optional
+        デコードした画像をGPUテクスチャとしても作成する
+
+    Returns
+    -------
+    PrefetchResult
+        読み込んだ画像の数とデコードにかかった時間と速度
+    """
+
+    result = PrefetchResult()
+    start_time = time.perf_counter()
+    targets = get_prefetch_targets(images)
+    pending_paths = list(targets)
+    max_pending = max_threads * PENDING_FACTOR
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_threads, thread_name_prefix="DDImportTexturePreload"
+    ) as executor:
+        futures: dict[concurrent.futures.Future, str] = {}
+        while pending_paths or futures:
+            while pending_paths and len(futures) < max_pending:
+                filepath = pending_paths.pop()
+                futures[executor.submit(read_image_file, filepath)] = filepath
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                filepath = futures.pop(future)
+                try:
+                    file_size = future.result()
+                except OSError as e:
+                    logger.warning("Failed to read %s : %s", filepath, e)
+                    result.failed += 1
+                    continue
+                result.total_bytes += file_size
+                # 読み込み待ちのファイルがある間に､読み込み済みのファイルをデコードする
+                decode_start_time = time.perf_counter()
+                try:
+                    result.decoded_pixels += load_image_buffers(
+                        targets[filepath], upload_to_gpu
+                    )
+                except (RuntimeError, SystemError) as e:
+                    logger.warning("Failed to load %s : %s", filepath, e)
+                    result.failed += 1
+                    continue
+                finally:
+                    result.decode_time += time.perf_counter() - decode_start_time
+                result.decoded_bytes += file_size
+                result.images += len(targets[filepath])
+
+    result.elapsed = time.perf_counter() - start_time
+    logger.info(
+        "%s, failed %d (%.3f sec)", result.describe(), result.failed, result.elapsed
+    )
+    return result
@@ -0,0 +1,461 @@
+import bpy
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .import_cache import ImportCache
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+PROXY_WORKER_SCRIPT_PATH = str(Path(__file__).with_name("proxy_worker_script.py"))
+# プロキシに切り替えた画像に記録するカスタムプロパティ
+PROP_FULL_PATH = "dd_import_full_path"
+PROP_PROXY_PATH = "dd_import_proxy_path"
+# 元の形式で保存できない画像はPNGで保存する
+PROXY_FILE_FORMATS = {
+    ".png": ("PNG", ".png"),
+    ".jpg": ("JPEG", ".jpg"),
+    ".jpeg": ("JPEG", ".jpg"),
+    ".tga": ("TARGA", ".tga"),
+    ".tif": ("TIFF", ".tif"),
+    ".tiff": ("TIFF", ".tif"),
+    ".bmp": ("BMP", ".bmp"),
+    ".exr": ("OPEN_EXR", ".exr"),
+    ".hdr": ("HDR", ".hdr"),
+}
+DEFAULT_PROXY_FILE_FORMAT = ("PNG", ".png")
+PROXY_POLL_INTERVAL = 0.05
+# 1枚あたりの作成の制限時間｡プロセス毎に担当する枚数を掛けた時間を超えたら停止させる
+PROXY_JOB_TIMEOUT = 60.0
+
+
+def get_proxy_file_format(filepath: str) -> tuple[str, str]:
+    return PROXY_FILE_FORMATS.get(
+        os.path.splitext(filepath)[1].lower(), DEFAULT_PROXY_FILE_FORMAT
+    )
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Proxy Cache
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class TextureProxyCache(ImportCache):
+    """
+    縮小したテクスチャを保存するディスクキャッシュ｡
+    キーは元の画像の内容のハッシュとプロキシのサイズから作られるため､
+    同じ画像であればパスやファイルが異なっても再利用される｡
+    インデックスとサイズ上限による削除はインポートキャッシュと共通だが､
+    削除は作成したプロキシを割り当てる前にまとめて行い､画像が参照しているプロキシは削除しない｡
+    """
+
+    evict_on_add = False
+
+    def get_protected_keys(self) -> set[str]:
+        return {
+            Path(image[PROP_PROXY_PATH]).name
+            for image in bpy.data.images
+            if PROP_PROXY_PATH in image
+        }
+
+    def make_proxy_key(self, filepath: str, size: int) -> str:
+        extension = get_proxy_file_format(filepath)[1]
+        return f"{self.get_file_hash(filepath)[:32]}_{size}{extension}"
+
+    def get_entry_path(self, key: str) -> Path:
+        return self.directory.joinpath(key)
+
+
+texture_proxy_cache = TextureProxyCache()
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Build
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class ProxyJob:
+    source: str
+    key: str
+    size: int
+    output: str = ""
+    error: str = ""
+
+
+class ProxyBuild:
+    """
+    バックグラウンドのBlenderのプロセスプールでプロキシを作成する｡
+    ジョブはファイルサイズの大きい順に各プロセスへ振り分け､poll()で全てのプロセスの完了を確認する｡
+    制限時間を超えたプロセスは停止し､そのプロセスのジョブは失敗として扱う｡
+    作成したプロキシは一時ディレクトリに置かれ､cleanup()で削除する｡
+    """
+
+    def __init__(self, blender_path: str, jobs: list[ProxyJob], max_workers: int):
+        self.temp_directory = Path(tempfile.mkdtemp(prefix="ddimport_proxies_"))
+        worker_count = max(1, min(max_workers, len(jobs)))
+        chunks: list[list[ProxyJob]] = [[] for _ in range(worker_count)]
+        jobs = sorted(jobs, key=lambda job: os.path.getsize(job.source), reverse=True)
+        for index, job in enumerate(jobs):
+            job.output = str(self.temp_directory.joinpath(job.key))
+            chunks[index % worker_count].append(job)
+
+        self._processes: list[tuple[subprocess.Popen, list[ProxyJob], Path]] = []
+        for index, chunk in enumerate(chunks):
+            jobs_path = self.temp_directory.joinpath(f"jobs_{index:03d}.json")
+            results_path = self.temp_directory.joinpath(f"results_{index:03d}.json")
+            with open(jobs_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "jobs": [
+                            {
+                                "source": job.source,
+                                "output": job.output,
+                                "size": job.size,
+                                "file_format": get_proxy_file_format(job.source)[0],
+                            }
+                            for job in chunk
+                        ],
+                        "results": str(results_path),
+                    },
+                    f,
+                )
+            command = [
+                blender_path,
+                "--background",
+                "--factory-startup",
+                "--python-exit-code",
+                "1",
+                "--python",
+                PROXY_WORKER_SCRIPT_PATH,
+                "--",
+                str(jobs_path),
+            ]
+            process = subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            self._processes.append((process, chunk, results_path))
+        self._start_time = time.monotonic()
+        self._timed_out: set[subprocess.Popen] = set()
+
+    def poll(self) -> bool:
+        # プロセスが応答しなくなっても終われるように､制限時間を超えたプロセスは停止する｡
+        # 全てのプロセスが終了していればTrueを返す
+        elapsed = time.monotonic() - self._start_time
+        is_finished = True
+        for process, chunk, _ in self._processes:
+            if process.poll() is not None:
+                continue
+            if elapsed > PROXY_JOB_TIMEOUT * len(chunk):
+                process.kill()
+                process.wait()
+                self._timed_out.add(process)
+                continue
+            is_finished = False
+        return is_finished
+
+    def collect(self) -> list[ProxyJob]:
+        # 作成に成功したジョブ (outputに一時ファイルのパスが入る) を返す
+        built = []
+        for process, chunk, results_path in self._processes:
+            try:
+                with open(results_path, "r", encoding="utf-8") as f:
+                    errors = {r["output"]: r["error"] for r in json.load(f)}
+            except (OSError, ValueError):
+                errors = {}
+            if process in self._timed_out:
+                default_error = (
+                    f"timed out after {PROXY_JOB_TIMEOUT * len(chunk):.0f} sec"
+                )
+            else:
+                default_error = f"exit code {process.returncode}"
+            for job in chunk:
+                job.error = errors.get(job.output, default_error)
+                if not job.error and os.path.isfile(job.output):
+                    built.append(job)
+                else:
+                    logger.warning(
+                        "Failed to build proxy %s : %s", job.source, job.error
+                    )
+        return built
+
+    def cancel(self):
+        for process, _, _ in self._processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    def cleanup(self):
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+
+
+@dataclass
+class PendingProxyBuild:
+    build: ProxyBuild
+    cache: TextureProxyCache
+    # プロキシを割り当てる画像 {ファイルパス: [session_uid]}｡
+    # 作成中にアンドゥなどで画像が作り直されても参照し続けないよう､IDではなく番号を保持する
+    targets: dict[str, list[int]]
+    start_time: float
+
+
+# UIを止めないようにタイマーで完了を待っているプロキシの作成
+_pending_builds: list[PendingProxyBuild] = []
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Functions
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+@dataclass
+class ProxyResult:
+    images: int = 0
+    reused: int = 0
+    built: int = 0
+    failed: int = 0
+    # タイマーで完了を待っている作成中のプロキシの数
+    building: int = 0
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        description = (
+            f"{self.images} textures use proxies "
+            f"({self.reused} cached, {self.built} built, {self.failed} failed)"
+        )
+        if self.building:
+            description += f", building {self.building} proxies"
+        return description
+
+
+def set_proxy_path(image: bpy.types.Image, proxy_path: str):
+    if PROP_FULL_PATH not in image:
+        image[PROP_FULL_PATH] = image.filepath
+    image[PROP_PROXY_PATH] = proxy_path
+    image.filepath = proxy_path
+
+
+def restore_missing_proxies(images: Iterable[bpy.types.Image]) -> int:
+    # キャッシュから削除されたプロキシを参照している画像は元の解像度の画像に戻す
+    restored = 0
+    for image in images:
+        proxy_path = image.get(PROP_PROXY_PATH)
+        if (
+            proxy_path
+            and image.filepath == proxy_path
+            and not os.path.isfile(proxy_path)
+        ):
+            image.filepath = image[PROP_FULL_PATH]
+            restored += 1
+    if restored:
+        logger.warning("Restore %d textures whose proxies are missing", restored)
+    return restored
+
+
+def apply_texture_proxies(
+    images: Iterable[bpy.types.Image],
+    cache: TextureProxyCache,
+    size: int,
+    blender_path: str,
+    max_workers: int,
+) -> ProxyResult:
+    """
+    画像を縮小したプロキシに差し替える｡キャッシュに無いプロキシはまとめて作成する｡
+    作成の完了はbpy.app.timersで待ち､UIを止めずに完了したものから差し替える｡
+    イベントループの無いバックグラウンドモードでは完了するまで待つ｡
+
+    Parameters
+    ----------
+    images : Iterable[bpy.types.Image]
+        差し替える画像 (バッチでインポートされた画像)
+    cache : TextureProxyCache
+        ディレクトリとサイズ上限を設定したキャッシュ
+    size : int
+        プロキシの長辺のピクセル数
+    blender_path : str
+        プロキシを作成するBlenderの実行ファイルのパス
+    max_workers : int
+        プロキシを作成するプロセスの最大数
+
+    Returns
+    -------
+    ProxyResult
+        差し替えた画像の数 (作成中のプロキシはbuildingに数える)
+    """
+
+    result = ProxyResult()
+    start_time = time.perf_counter()
+
+    # 同じファイルを参照する画像は1つのプロキシを共有する {ファイルパス: [画像]}
+    targets: dict[str, list[bpy.types.Image]] = {}
+    for image in images:
+        if (
+            image.source != "FILE"
+            or image.packed_file is not None
+            or image.library is not None
+            or PROP_FULL_PATH in image
+        ):
+            continue
+        filepath = bpy.path.abspath(image.filepath)
+        if os.path.isfile(filepath):
+            targets.setdefault(filepath, []).append(image)
+
+    jobs = []
+    for filepath, target_images in targets.items():
+        key = cache.make_proxy_key(filepath, size)
+        proxy_path = cache.lookup(key)
+        if proxy_path is None:
+            jobs.append(ProxyJob(filepath, key, size))
+            continue
+        for image in target_images:
+            set_proxy_path(image, proxy_path)
+        result.reused += 1
+        result.images += len(target_images)
+
+    if jobs:
+        pending = PendingProxyBuild(
+            ProxyBuild(blender_path, jobs, max_workers),
+            cache,
+            {job.source: [i.session_uid for i in targets[job.source]] for job in jobs},
+            start_time,
+        )
+        if bpy.app.background:
+            while not pending.build.poll():
+                time.sleep(PROXY_POLL_INTERVAL)
+            finish_proxy_build(pending, result)
+        else:
+            _pending_builds.append(pending)
+            if not bpy.app.timers.is_registered(_poll_proxy_builds):
+                bpy.app.timers.register(
+                    _poll_proxy_builds,
+                    first_interval=PROXY_POLL_INTERVAL,
+                    persistent=True,
+                )
+            result.building = len(jobs)
+    cache.save_index()
+    restore_missing_proxies(bpy.data.images)
+
+    result.elapsed = time.perf_counter() - start_time
+    logger.info("%s (%.3f sec)", result.describe(), result.elapsed)
+    return result
+
+
+def finish_proxy_build(pending: PendingProxyBuild, result: ProxyResult):
+    # 作成したプロキシをキャッシュに移し､まだ存在する画像に割り当てる
+    try:
+        built = pending.build.collect()
+        # 割り当てる前に新しいプロキシの分の場所を空ける (割り当て済みのプロキシは残る)
+        pending.cache.evict(reserve=sum(os.path.getsize(job.output) for job in built))
+        images = {image.session_uid: image for image in bpy.data.images}
+        for job in built:
+            proxy_path = pending.cache.store_file(job.key, job.output, job.source)
+            for session_uid in pending.targets[job.source]:
+                image = images.get(session_uid)
+                if image is not None:
+                    set_proxy_path(image, proxy_path)
+                    result.images += 1
+        result.built += len(built)
+        result.failed += len(pending.targets) - len(built)
+    finally:
+        pending.build.cleanup()
+
+
+def _poll_proxy_builds() -> float | None:
+    for pending in [*_pending_builds]:
+        try:
+            if not pending.build.poll():
+                continue
+            _pending_builds.remove(pending)
+            result = ProxyResult()
+            finish_proxy_build(pending, result)
+            pending.cache.save_index()
+            restore_missing_proxies(bpy.data.images)
+        except Exception:
+            # タイマーの例外はタイマーの登録を解除してしまうため記録して続行する
+            logger.exception("Failed to finish texture proxies")
+            if pending in _pending_builds:
+                _pending_builds.remove(pending)
+                pending.build.cancel()
+                pending.build.cleanup()
+            continue
+        result.elapsed = time.perf_counter() - pending.start_time
+        logger.info("%s (%.3f sec)", result.describe(), result.elapsed)
+        # 差し替えた画像を表示するためにビューポートを再描画する
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                area.tag_redraw()
+    if not _pending_builds:
+        return None
+    return PROXY_POLL_INTERVAL
+
+
+def get_building_image_uids() -> set[int]:
+    # 作成中のプロキシに差し替えられる画像のsession_uid
+    return {
+        session_uid
+        for pending in _pending_builds
+        for session_uids in pending.targets.values()
+        for session_uid in session_uids
+    }
+
+
+def cancel_proxy_builds():
+    # アドオンの無効化やキャッシュの削除の前に作成中のプロセスを停止する
+    if bpy.app.timers.is_registered(_poll_proxy_builds):
+        bpy.app.timers.unregister(_poll_proxy_builds)
+    for pending in _pending_builds:
+        pending.build.cancel()
+        pending.build.cleanup()
+    if _pending_builds:
+        logger.info("Cancel %d texture proxy builds", len(_pending_builds))
+    _pending_builds.clear()
+
+
+def switch_texture_proxies(use_proxies: bool) -> int:
+    """
+    プロキシに差し替えた画像を元の解像度の画像とプロキシの間で切り替える｡
+    キャッシュから削除されたプロキシには切り替えず､参照している画像は元の解像度に戻す｡
+    切り替えた画像の数を返す｡
+    """
+
+    switched = restore_missing_proxies(bpy.data.images)
+    for image in bpy.data.images:
+        if PROP_FULL_PATH not in image:
+            continue
+        if use_proxies:
+            filepath = image.get(PROP_PROXY_PATH, "")
+            if not os.path.isfile(filepath):
+                continue
+        else:
+            filepath = image[PROP_FULL_PATH]
+        if image.filepath != filepath:
+            image.filepath = filepath
+            switched += 1
+    return switched
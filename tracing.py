@@ -0,0 +1,168 @@
+import bpy
+
+import json
+import os
+import threading
+import time
+
+from collections import deque
+from typing import Any
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Logger
+------------------------------------------------------------
+---------------------------------------------------------"""
+from .Logging.preparation_logger import preparating_logger
+
+logger = preparating_logger(__name__)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Variables
+------------------------------------------------------------
+---------------------------------------------------------"""
+DEFAULT_BUFFER_SIZE = 10000
+# インポートで作成された数を記録するデータブロックの種類
+TRACKED_DATABLOCKS = ("objects", "meshes", "materials", "actions")
+
+
+def get_datablock_counts() -> dict[str, int]:
+    return {name: len(getattr(bpy.data, name)) for name in TRACKED_DATABLOCKS}
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Span
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class NullSpan:
+    # トレースが無効な時に使われる何もしないスパン｡偽として評価される
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __bool__(self) -> bool:
+        return False
+
+    def set(self, **kwargs):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start_ns", "datablock_counts")
+
+    def __init__(self, tracer: "Tracer", name: str, track_datablocks: bool, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+        self.datablock_counts = get_datablock_counts() if track_datablocks else None
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_ns = time.perf_counter_ns()
+        if self.datablock_counts is not None:
+            counts = get_datablock_counts()
+            for name, count in self.datablock_counts.items():
+                self.args[f"{name}_created"] = counts[name] - count
+        if exc_type is not None:
+            self.args["error"] = str(exc_value)
+        self.tracer.record(self, end_ns - self.start_ns)
+        return False
+
+    def __bool__(self) -> bool:
+        return True
+
+    def set(self, **kwargs):
+        self.args.update(kwargs)
+
+
+"""---------------------------------------------------------
+------------------------------------------------------------
+    Tracer
+------------------------------------------------------------
+---------------------------------------------------------"""
+
+
+class Tracer:
+    """
+    インポートの各段階の処理時間を記録するトレーサー｡
+    記録したスパンはリングバッファに保持され､Pythonコンソールから参照したり
+    Chrome Trace形式のJSONとして書き出すことができる｡
+
+    >>> tracer.enabled = True
+    >>> tracer.records[-1]
+    >>> tracer.export_chrome_trace("/tmp/dd_import_trace.json")
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.enabled: bool = False
+        self.records: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(
+        self, name: str, track_datablocks: bool = False, **args
+    ) -> Span | NullSpan:
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, track_datablocks, args)
+
+    def record(self, span: Span, duration_ns: int):
+        self.records.append(
+            {
+                "name": span.name,
+                "start_ns": span.start_ns,
+                "duration_ns": duration_ns,
+                "thread_id": threading.get_ident(),
+                "args": span.args,
+            }
+        )
+        logger.debug(
+            "Trace %s : %.3f ms %s", span.name, duration_ns / 1_000_000, span.args
+        )
+
+    def set_buffer_size(self, buffer_size: int):
+        if self.records.maxlen != buffer_size:
+            self.records = deque(self.records, maxlen=buffer_size)
+
+    def clear(self):
+        self.records.clear()
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        events = [
+            {
+                "name": record["name"],
+                "cat": "dd_import",
+                "ph": "X",
+                "ts": (record["start_ns"] - self._origin_ns) / 1000,
+                "dur": record["duration_ns"] / 1000,
+                "pid": pid,
+                "tid": record["thread_id"],
+                "args": record["args"],
+            }
+            for record in self.records
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, filepath: str):
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        logger.info("Export %d trace events : %s", len(self.records), filepath)
+
+
+tracer = Tracer()
@@ -0,0 +1,49 @@
+"""
+バックグラウンドのBlenderで実行されるインポート用スクリプト｡
+アドオンからは読み込まれず､ワーカープロセスの起動時に --python で渡される｡
+
+blender --background --python worker_import_script.py -- <job.json>
+
+job.jsonにcollectionが指定されている場合はインポートされたオブジェクトを
+その名前のコレクションにまとめて書き出す (ライブラリからリンクするため)｡
+"""
+
+import bpy
+import addon_utils
+
+import json
+import sys
+
+
+def load_job_spec() -> dict:
+    job_path = sys.argv[sys.argv.index("--") + 1]
+    with open(job_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    job_spec = load_job_spec()
+
+    # ユーザー設定で有効になっていない場合に備えてインポーターのアドオンを有効化する
+    if job_spec["addon_module"]:
+        addon_utils.enable(job_spec["addon_module"], default_set=False)
+
+    # スタートアップファイルに含まれるデータを取り除いてからインポートする
+    bpy.data.batch_remove([*bpy.data.objects])
+    bpy.data.orphans_purge(do_recursive=True)
+
+    module_name, operator_name = job_spec["operator"].split(".")
+    import_operator = getattr(getattr(bpy.ops, module_name), operator_name)
+    import_operator(filepath=job_spec["filepath"], **job_spec["keywords"])
+
+    # インポートされたオブジェクトとアクションを依存データごと書き出す
+    datablocks = {*bpy.data.objects, *bpy.data.actions}
+    if job_spec.get("collection"):
+        collection = bpy.data.collections.new(job_spec["collection"])
+        for obj in bpy.data.objects:
+            collection.objects.link(obj)
+        datablocks = {collection, *bpy.data.actions}
+    bpy.data.libraries.write(job_spec["output"], datablocks, path_remap="ABSOLUTE")
+
+
+main()